@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tracker operation benchmarks
+Times loading, saving, topic updates, progress queries, study plans and the
+text dashboard against one generated student file.
+"""
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+from typing import Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jee_tracker import JEEProgressTracker
+from timing import measure
+
+def bench_tracker(data_file: str, syllabus: str = None, repeat: int = 20, seed: int = 0) -> Dict[str, Any]:
+    """Time each tracker operation on a scratch copy of data_file"""
+    rng = random.Random(seed)
+    work_dir = tempfile.mkdtemp(prefix="jee-bench-")
+    try:
+        # Updates persist, so never touch the generated file itself
+        path = os.path.join(work_dir, os.path.basename(data_file))
+        shutil.copyfile(data_file, path)
+        tracker = JEEProgressTracker(path, syllabus=syllabus)
+        topics = [(subject, chapter, topic) for subject, chapters in tracker.syllabus.items()
+                  for chapter, names in chapters.items() for topic in names]
+        subjects = list(tracker.syllabus)
+        results = {}
+
+        results["construct"] = measure(lambda: JEEProgressTracker(path, syllabus=syllabus), repeat)
+        results["load_data"] = measure(tracker.load_data, repeat)
+        results["save_data"] = measure(tracker.save_data, repeat)
+
+        def update():
+            subject, chapter, topic = rng.choice(topics)
+            tracker.update_topic_progress(subject, chapter, topic, status=rng.choice(["in_progress", "completed"]),
+                                          confidence=rng.randint(1, 10), time_spent=0.5)
+        results["update_topic_progress"] = measure(update, repeat * 5)
+
+        def progress_all():
+            for subject in subjects:
+                tracker.get_subject_progress(subject)
+        results["get_subject_progress"] = measure(progress_all, repeat)
+        # Without the running counters, as right after a reload
+        results["get_subject_progress_cold"] = measure(progress_all, repeat, setup=tracker.reload)
+
+        results["generate_study_plan"] = measure(lambda: tracker.generate_study_plan(90), repeat)
+
+        def dashboard():
+            with contextlib.redirect_stdout(io.StringIO()):
+                tracker.display_dashboard()
+        results["display_dashboard"] = measure(dashboard, repeat)
+
+        results["_dataset"] = {
+            "file_bytes": os.path.getsize(data_file),
+            "topics": len(topics),
+            "log_days": len(tracker.data["daily_logs"]),
+            "tests": len(tracker.data["test_scores"])
+        }
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
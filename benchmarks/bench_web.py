@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+HTTP benchmarks for the web interface
+Starts web_interface.py in a subprocess on a generated data directory and
+drives it from client threads, recording throughput and latency percentiles.
+"""
+
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Any
+
+from timing import summarize
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+def start_server(port: int, students_dir: str, syllabus: str = None, use_async: bool = False) -> subprocess.Popen:
+    """Run web_interface.py and wait until it accepts connections"""
+    command = [sys.executable, os.path.join(REPO_DIR, "web_interface.py"), str(port),
+               os.path.join(students_dir, "default.json"), "--data-dir", students_dir, "--max-students", "1000"]
+    if syllabus:
+        command += ["--syllabus", syllabus]
+    if use_async:
+        command.append("--async")
+    # BROWSER=true turns the automatic webbrowser.open into a no-op
+    env = dict(os.environ, BROWSER="true")
+    server = subprocess.Popen(command, cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"web_interface.py exited with status {server.returncode}")
+        try:
+            socket.create_connection(("localhost", port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("web_interface.py did not start listening within 30 s")
+
+def _request_factory(scenario: str, students: List[str], topics: List[tuple], rng: random.Random):
+    """Return a function producing (method, path, body) for one request of the scenario"""
+    def pick_student():
+        return f"/students/{rng.choice(students)}"
+
+    def progress():
+        return "GET", pick_student() + "/api/progress", None
+
+    def dashboard():
+        return "GET", pick_student() + "/", None
+
+    def update():
+        subject, chapter, topic = rng.choice(topics)
+        body = {"subject": subject, "chapter": chapter, "topic": topic,
+                "status": rng.choice(["in_progress", "completed"]), "confidence": rng.randint(1, 10)}
+        return "POST", pick_student() + "/api/update-topic", json.dumps(body)
+
+    def mixed():
+        # Mostly reads, as from dashboards polling, with one write in ten
+        return rng.choice([progress, progress, progress, dashboard, dashboard, dashboard,
+                           progress, dashboard, progress, update])()
+
+    return {"progress": progress, "dashboard": dashboard, "update_topic": update, "mixed": mixed}[scenario]
+
+def run_scenario(port: int, scenario: str, students: List[str], topics: List[tuple], seconds: float = 5.0,
+                 concurrency: int = 8, seed: int = 0) -> Dict[str, Any]:
+    """Drive one scenario from concurrency client threads for the given number of seconds"""
+    samples = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client(n):
+        rng = random.Random(seed * 1000 + n)
+        make_request = _request_factory(scenario, students, topics, rng)
+        conn = http.client.HTTPConnection("localhost", port, timeout=30)
+        local_samples, local_errors = [], 0
+        while time.perf_counter() < deadline:
+            method, path, body = make_request()
+            headers = {"Content-Type": "application/json"} if body else {}
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                continue
+            local_samples.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            samples.extend(local_samples)
+            errors.append(local_errors)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    result = summarize(samples)
+    result["requests_per_second"] = len(samples) / elapsed
+    result["errors"] = sum(errors)
+    result["concurrency"] = concurrency
+    return result
+
+def bench_web(students_dir: str, syllabus: str = None, seconds: float = 5.0, concurrency: int = 8,
+              use_async: bool = False, scenarios=("progress", "dashboard", "update_topic", "mixed"),
+              seed: int = 0) -> Dict[str, Any]:
+    """Throughput and latency of each scenario against a freshly started server"""
+    students = sorted(os.path.splitext(name)[0] for name in os.listdir(students_dir)
+                      if not name.startswith("default") and name.endswith((".json", ".jeeb", ".db")))
+    if syllabus:
+        with open(syllabus, encoding="utf-8") as f:
+            tree = json.load(f)
+    else:
+        sys.path.insert(0, REPO_DIR)
+        from jee_syllabus import JEE_SYLLABUS as tree
+    topics = [(subject, chapter, topic) for subject, chapters in tree.items()
+              for chapter, names in chapters.items() for topic in names]
+
+    port = free_port()
+    server = start_server(port, students_dir, syllabus, use_async)
+    try:
+        results = {}
+        for scenario in scenarios:
+            results[scenario] = run_scenario(port, scenario, students, topics, seconds, concurrency, seed)
+        return results
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Synthetic data for JEE Progress Tracker benchmarks
+Writes a syllabus of any size and a data file per student with years of daily
+logs, topic updates and test scores. Output is deterministic for a given seed.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jee_storage import new_data, new_topic_entry, open_storage
+
+STATUSES = ["in_progress", "completed", "revision"]
+
+def make_syllabus(subjects: int = 3, chapters: int = 20, topics: int = 15) -> Dict[str, Dict[str, List[str]]]:
+    """A {subject: {chapter: [topics]}} syllabus with subjects * chapters * topics topics"""
+    return {
+        f"Subject {s}": {f"Chapter {s}.{c}": [f"Topic {s}.{c}.{t}" for t in range(topics)] for c in range(chapters)}
+        for s in range(subjects)
+    }
+
+def make_student_data(syllabus: Dict[str, Dict[str, List[str]]], years: float = 1.0, studied: float = 0.6,
+                      seed: int = 0, end: date = None) -> Dict[str, Any]:
+    """Progress data for one student: topic progress, daily logs up to end and a test every few days"""
+    rng = random.Random(seed)
+    end = end or date.today()
+    days = max(1, int(years * 365))
+    start = end - timedelta(days=days - 1)
+    data = new_data()
+
+    topic_names = []
+    for subject, chapters in syllabus.items():
+        data["subjects"][subject] = {}
+        for chapter, topics in chapters.items():
+            entries = data["subjects"][subject][chapter] = {}
+            for topic in topics:
+                entry = entries[topic] = new_topic_entry()
+                topic_names.append((subject, topic))
+                if rng.random() < studied:
+                    studied_at = datetime.combine(start, datetime.min.time()) + timedelta(seconds=rng.randrange(days * 86400))
+                    entry.update(status=rng.choice(STATUSES), confidence=rng.randint(1, 10),
+                                 time_spent=round(rng.uniform(0.5, 20), 1), problems_solved=rng.randint(0, 200),
+                                 last_studied=studied_at.isoformat())
+
+    subjects = list(syllabus)
+    for day in range(days):
+        log_date = start + timedelta(days=day)
+        if rng.random() < 0.15:
+            continue  # days off
+        entries = data["daily_logs"][log_date.isoformat()] = []
+        for _ in range(rng.randint(1, 4)):
+            subject, topic = rng.choice(topic_names)
+            hours = round(rng.uniform(0.5, 3), 1)
+            entries.append({
+                "subject": subject,
+                "hours": hours,
+                "topics": [topic],
+                "notes": "",
+                "timestamp": datetime.combine(log_date, datetime.min.time()).replace(hour=20).isoformat()
+            })
+            data["study_hours"][subject] = data["study_hours"].get(subject, 0) + hours
+        if day % 7 == 0:
+            score = rng.randint(60, 300)
+            data["test_scores"].append({
+                "test_name": f"Mock {day // 7 + 1}",
+                "subject": rng.choice(subjects),
+                "score": score,
+                "max_score": 300,
+                "percentage": score / 3,
+                "date": log_date.isoformat()
+            })
+    return data
+
+def generate(out_dir: str, students: int = 10, years: float = 1.0, subjects: int = 3, chapters: int = 20,
+             topics: int = 15, extension: str = ".json", seed: int = 0) -> Dict[str, Any]:
+    """Write syllabus.json and students/<id><extension> under out_dir; returns their paths"""
+    syllabus = make_syllabus(subjects, chapters, topics)
+    students_dir = os.path.join(out_dir, "students")
+    os.makedirs(students_dir, exist_ok=True)
+    syllabus_file = os.path.join(out_dir, "syllabus.json")
+    with open(syllabus_file, "w", encoding="utf-8") as f:
+        json.dump(syllabus, f)
+
+    files = []
+    for i in range(students):
+        path = os.path.join(students_dir, f"s{i:04d}{extension}")
+        storage = open_storage(path)
+        storage.save(make_student_data(syllabus, years, seed=seed + i))
+        if hasattr(storage, "close"):
+            storage.close()
+        files.append(path)
+    return {"syllabus": syllabus_file, "students_dir": students_dir, "files": files}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic JEE Progress Tracker data")
+    parser.add_argument("out_dir", help="Directory to write syllabus.json and students/ into")
+    parser.add_argument("--students", type=int, default=10, help="Number of student data files")
+    parser.add_argument("--years", type=float, default=1.0, help="Years of daily logs per student")
+    parser.add_argument("--subjects", type=int, default=3, help="Subjects in the syllabus")
+    parser.add_argument("--chapters", type=int, default=20, help="Chapters per subject")
+    parser.add_argument("--topics", type=int, default=15, help="Topics per chapter")
+    parser.add_argument("--format", choices=["json", "jeeb", "db"], default="json", help="Storage format")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    result = generate(args.out_dir, args.students, args.years, args.subjects, args.chapters, args.topics,
+                      extension="." + args.format, seed=args.seed)
+    print(f"Wrote {len(result['files'])} student files and {result['syllabus']}")
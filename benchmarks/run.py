@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Run the JEE Progress Tracker benchmark suite
+Generates a synthetic dataset, times the tracker operations and the web
+endpoints, and writes the results as JSON. Pass --compare with an earlier
+results file to list regressions; the exit status is 1 if there are any.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Any
+
+from bench_tracker import bench_tracker
+from bench_web import REPO_DIR, bench_web
+from datagen import generate
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 1.2,
+            metric: str = "p50_ms") -> List[Dict[str, Any]]:
+    """Benchmarks whose metric grew by more than threshold times the baseline"""
+    regressions = []
+    for group in ("tracker", "web"):
+        for name, stats in results.get(group, {}).items():
+            old = baseline.get(group, {}).get(name)
+            if name.startswith("_") or not old or not old.get(metric):
+                continue
+            ratio = stats[metric] / old[metric]
+            if ratio > threshold:
+                regressions.append({"benchmark": f"{group}.{name}", "metric": metric,
+                                    "baseline": old[metric], "current": stats[metric], "ratio": ratio})
+    return regressions
+
+def print_results(results: Dict[str, Any]):
+    for group in ("tracker", "web"):
+        for name, stats in results.get(group, {}).items():
+            if name.startswith("_"):
+                continue
+            line = f"{group + '.' + name:<34} p50 {stats['p50_ms']:9.3f} ms  p99 {stats['p99_ms']:9.3f} ms"
+            if "requests_per_second" in stats:
+                line += f"  {stats['requests_per_second']:8.0f} req/s  errors {stats['errors']}"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="JEE Progress Tracker benchmarks")
+    parser.add_argument("--students", type=int, default=20, help="Number of generated students")
+    parser.add_argument("--years", type=float, default=2.0, help="Years of daily logs per student")
+    parser.add_argument("--subjects", type=int, default=3, help="Subjects in the generated syllabus")
+    parser.add_argument("--chapters", type=int, default=30, help="Chapters per subject")
+    parser.add_argument("--topics", type=int, default=20, help="Topics per chapter")
+    parser.add_argument("--format", choices=["json", "jeeb", "db"], default="json", help="Storage format")
+    parser.add_argument("--data", help="Existing datagen.py output to use instead of generating one")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per tracker operation")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each web scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent HTTP clients")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Benchmark the asyncio server")
+    parser.add_argument("--skip-web", action="store_true", help="Only run the tracker benchmarks")
+    parser.add_argument("--output", "-o", help="Write results JSON here (default: stdout summary only)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    work_dir = None
+    if args.data:
+        syllabus = os.path.join(args.data, "syllabus.json")
+        students_dir = os.path.join(args.data, "students")
+    else:
+        work_dir = tempfile.mkdtemp(prefix="jee-bench-data-")
+        started = time.perf_counter()
+        dataset = generate(work_dir, args.students, args.years, args.subjects, args.chapters, args.topics,
+                           extension="." + args.format)
+        syllabus, students_dir = dataset["syllabus"], dataset["students_dir"]
+        print(f"Generated {args.students} students in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+    try:
+        first_student = sorted(os.path.join(students_dir, name) for name in os.listdir(students_dir))[0]
+        results = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count()
+            },
+            "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+            "tracker": bench_tracker(first_student, syllabus, repeat=args.repeat)
+        }
+        if not args.skip_web:
+            results["web"] = bench_web(students_dir, syllabus, seconds=args.seconds, concurrency=args.concurrency,
+                                       use_async=args.use_async)
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']}: {regression['baseline']:.3f} -> "
+                  f"{regression['current']:.3f} ms ({regression['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {args.threshold:.2f}x against {args.compare}")
+
+if __name__ == "__main__":
+    main()
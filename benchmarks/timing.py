@@ -0,0 +1,42 @@
+"""
+Timing helpers shared by the benchmark scripts
+"""
+
+import time
+from typing import Callable, Dict, List
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency statistics in milliseconds for a list of durations in seconds"""
+    values = sorted(s * 1000 for s in samples)
+    return {
+        "runs": len(values),
+        "min_ms": values[0] if values else 0.0,
+        "mean_ms": sum(values) / len(values) if values else 0.0,
+        "p50_ms": percentile(values, 50),
+        "p90_ms": percentile(values, 90),
+        "p99_ms": percentile(values, 99),
+        "max_ms": values[-1] if values else 0.0
+    }
+
+def measure(fn: Callable[[], object], repeat: int = 20, setup: Callable[[], object] = None,
+            warmup: int = 1) -> Dict[str, float]:
+    """Time fn repeat times, running setup (untimed) before each call"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
@@ -85,12 +85,17 @@ def demo_study_plan():
     tracker = JEEProgressTracker("demo_progress.json")
     
     # Generate study plan
-    study_plan = tracker.generate_study_plan(days_until_exam=60)
+    study_plan = tracker.generate_study_plan(days_until_exam=60, top_k=10)
     
     print(f"\n🎯 Priority Topics (Top 10):")
-    for i, topic in enumerate(study_plan['priority_topics'][:10], 1):
+    for i, topic in enumerate(study_plan['priority_topics'], 1):
         print(f"{i:2d}. {topic['subject']} > {topic['chapter']} > {topic['topic']}")
         print(f"     Priority: {topic['priority']}/10, Current Confidence: {topic['confidence']}/10")
+    
+    print(f"\n🗓️  First 3 Days:")
+    for day in study_plan['daily_schedule'][:3]:
+        topics = ", ".join(f"{s['topic']} ({s['hours']}h)" for s in day['sessions'])
+        print(f"   Day {day['day']} ({day['date']}): {topics}")
 
 def create_sample_data():
     """Create sample data for demonstration"""
@@ -112,39 +117,41 @@ def create_sample_data():
         ("Mathematics", 3.0, ["Sequences & Series"], "2025-05-27"),
     ]
     
-    for subject, hours, topics, date in study_sessions:
-        tracker.log_daily_study(subject, hours, topics, f"Study session on {date}")
-    
-    # Update topic progress
-    topic_updates = [
-        ("Physics", "Mechanics", "Kinematics", "completed", 8),
-        ("Physics", "Mechanics", "Laws of Motion", "in_progress", 6),
-        ("Physics", "Mechanics", "Work Energy Power", "in_progress", 4),
-        ("Chemistry", "Physical Chemistry", "Atomic Structure", "completed", 9),
-        ("Chemistry", "Physical Chemistry", "Chemical Bonding", "in_progress", 7),
-        ("Chemistry", "Physical Chemistry", "Thermodynamics", "in_progress", 5),
-        ("Mathematics", "Algebra", "Quadratic Equations", "completed", 7),
-        ("Mathematics", "Algebra", "Complex Numbers", "in_progress", 6),
-        ("Mathematics", "Algebra", "Sequences & Series", "in_progress", 4),
-    ]
-    
-    for subject, chapter, topic, status, confidence in topic_updates:
-        tracker.update_topic_progress(subject, chapter, topic, 
-                                     status=status, confidence=confidence, 
-                                     problems_solved=15)
-    
-    # Add test scores
-    test_scores = [
-        ("Physics Mock Test 1", "Physics", 78, 100, "2025-05-28"),
-        ("Chemistry Unit Test", "Chemistry", 85, 100, "2025-05-29"),
-        ("Math Weekly Test", "Mathematics", 72, 100, "2025-05-30"),
-        ("Full JEE Mock Test", "Physics", 82, 100, "2025-05-31"),
-        ("Full JEE Mock Test", "Chemistry", 79, 100, "2025-05-31"),
-        ("Full JEE Mock Test", "Mathematics", 68, 100, "2025-05-31"),
-    ]
-    
-    for test_name, subject, score, max_score, date in test_scores:
-        tracker.add_test_score(test_name, subject, score, max_score, date)
+    # Everything below is written to disk once, when the batch ends
+    with tracker.batch():
+        for subject, hours, topics, date in study_sessions:
+            tracker.log_daily_study(subject, hours, topics, f"Study session on {date}", log_date=date)
+        
+        # Update topic progress
+        topic_updates = [
+            ("Physics", "Mechanics", "Kinematics", "completed", 8),
+            ("Physics", "Mechanics", "Laws of Motion", "in_progress", 6),
+            ("Physics", "Mechanics", "Work Energy Power", "in_progress", 4),
+            ("Chemistry", "Physical Chemistry", "Atomic Structure", "completed", 9),
+            ("Chemistry", "Physical Chemistry", "Chemical Bonding", "in_progress", 7),
+            ("Chemistry", "Physical Chemistry", "Thermodynamics", "in_progress", 5),
+            ("Mathematics", "Algebra", "Quadratic Equations", "completed", 7),
+            ("Mathematics", "Algebra", "Complex Numbers", "in_progress", 6),
+            ("Mathematics", "Algebra", "Sequences & Series", "in_progress", 4),
+        ]
+        
+        for subject, chapter, topic, status, confidence in topic_updates:
+            tracker.update_topic_progress(subject, chapter, topic, 
+                                         status=status, confidence=confidence, 
+                                         problems_solved=15)
+        
+        # Add test scores
+        test_scores = [
+            ("Physics Mock Test 1", "Physics", 78, 100, "2025-05-28"),
+            ("Chemistry Unit Test", "Chemistry", 85, 100, "2025-05-29"),
+            ("Math Weekly Test", "Mathematics", 72, 100, "2025-05-30"),
+            ("Full JEE Mock Test", "Physics", 82, 100, "2025-05-31"),
+            ("Full JEE Mock Test", "Chemistry", 79, 100, "2025-05-31"),
+            ("Full JEE Mock Test", "Mathematics", 68, 100, "2025-05-31"),
+        ]
+        
+        for test_name, subject, score, max_score, date in test_scores:
+            tracker.add_test_score(test_name, subject, score, max_score, date)
     
     print("✅ Sample data created in 'sample_progress.json'")
     print("\nRun the following to see the sample dashboard:")
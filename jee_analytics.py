@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Time-series analytics for JEE Progress Tracker
+Rolling study-hour statistics and test score trends, built in one pass over
+daily_logs and test_scores and then kept up to date per change record.
+"""
+
+from bisect import insort
+from datetime import date, timedelta
+from typing import Dict, List, Any, Tuple
+
+def _shift(day: str, days: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+def _date_range(start: str, end: str) -> List[str]:
+    """Every calendar day from start to end inclusive, as ISO strings"""
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+def week_key(day: str) -> str:
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+def month_key(day: str) -> str:
+    return day[:7]
+
+def _add_hours(bucket: Dict[str, float], subject: str, hours: float):
+    bucket[subject] = bucket.get(subject, 0) + hours
+    bucket["total"] = bucket.get("total", 0) + hours
+
+class StudyAnalytics:
+    """Memoized rolling statistics over a tracker's daily_logs and test_scores"""
+
+    WINDOWS = (7, 30)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._days = {}  # date -> {subject: hours, "total": hours}
+        self._dates = []  # sorted dates with at least one log
+        self._weeks = {}
+        self._months = {}
+        self._tests = {}  # subject -> [(date, percentage)] in date order
+        self._rolling = {}  # window -> {date: {subject: average}}
+        self._stale = {}  # window -> dates whose average must be recomputed
+        self._streaks = None
+        self._trends = {}
+
+        # One pass over the raw history fills every bucket
+        for log_date, entries in data["daily_logs"].items():
+            for entry in entries:
+                self._add_log(log_date, entry)
+        for test in data["test_scores"]:
+            insort(self._tests.setdefault(test["subject"], []), (test["date"], test["percentage"]))
+
+    def _add_log(self, log_date: str, entry: Dict[str, Any]):
+        if log_date not in self._days:
+            self._days[log_date] = {}
+            insort(self._dates, log_date)
+        _add_hours(self._days[log_date], entry["subject"], entry["hours"])
+        _add_hours(self._weeks.setdefault(week_key(log_date), {}), entry["subject"], entry["hours"])
+        _add_hours(self._months.setdefault(month_key(log_date), {}), entry["subject"], entry["hours"])
+
+    def record(self, record: Dict[str, Any]):
+        """Fold a committed change record in, invalidating only what it touches"""
+        if record["op"] == "log":
+            log_date = record["date"]
+            old_first, old_last = (self._dates[0], self._dates[-1]) if self._dates else (None, None)
+            if log_date not in self._days:
+                self._streaks = None
+            self._add_log(log_date, record["entry"])
+
+            first, last = self._dates[0], self._dates[-1]
+            for window, stale in self._stale.items():
+                if old_first is None:
+                    stale.update(_date_range(first, last))
+                    continue
+                # Averages in the log's trailing window, plus any days the range grew by
+                stale.update(_date_range(log_date, min(_shift(log_date, window - 1), last)))
+                if last > old_last:
+                    stale.update(_date_range(_shift(old_last, 1), last))
+                if first < old_first:
+                    stale.update(_date_range(first, _shift(old_first, -1)))
+        elif record["op"] == "test":
+            test = record["entry"]
+            insort(self._tests.setdefault(test["subject"], []), (test["date"], test["percentage"]))
+            self._trends.pop(test["subject"], None)
+
+    def daily_totals(self, last: int = None) -> List[Tuple[str, float]]:
+        """(date, total hours) for logged days, oldest first"""
+        dates = self._dates[-last:] if last else self._dates
+        return [(d, self._days[d]["total"]) for d in dates]
+
+    def window_average(self, end: str, window: int) -> Dict[str, float]:
+        """Average hours per day by subject over the window days ending at end"""
+        totals = {}
+        for day in _date_range(_shift(end, 1 - window), end):
+            for subject, hours in self._days.get(day, {}).items():
+                totals[subject] = totals.get(subject, 0) + hours
+        return {subject: hours / window for subject, hours in totals.items()}
+
+    def moving_average(self, window: int) -> Dict[str, Dict[str, float]]:
+        """Trailing moving average for every day from the first to the last log"""
+        if not self._dates:
+            return {}
+        if window not in self._rolling:
+            self._rolling[window] = self._compute_moving_average(window)
+            self._stale[window] = set()
+        elif self._stale[window]:
+            series = self._rolling[window]
+            grew = any(day not in series for day in self._stale[window])
+            for day in self._stale[window]:
+                series[day] = self.window_average(day, window)
+            self._stale[window] = set()
+            if grew:
+                # Keep the series in date order after the range was extended
+                self._rolling[window] = dict(sorted(series.items()))
+        return self._rolling[window]
+
+    def _compute_moving_average(self, window: int) -> Dict[str, Dict[str, float]]:
+        """Sliding-window pass over the whole date range"""
+        series = {}
+        running = {}
+        days = _date_range(self._dates[0], self._dates[-1])
+        for i, day in enumerate(days):
+            for subject, hours in self._days.get(day, {}).items():
+                running[subject] = running.get(subject, 0) + hours
+            if i >= window:
+                for subject, hours in self._days.get(days[i - window], {}).items():
+                    running[subject] -= hours
+            series[day] = {subject: hours / window for subject, hours in running.items() if abs(hours) > 1e-9}
+        return series
+
+    def streaks(self, today: str = None) -> Dict[str, Any]:
+        """Current and longest runs of consecutive study days"""
+        if self._streaks is None:
+            longest = (0, None, None)
+            run_start, run_length, previous = None, 0, None
+            for day in self._dates:
+                if previous is not None and _shift(previous, 1) == day:
+                    run_length += 1
+                else:
+                    run_start, run_length = day, 1
+                if run_length > longest[0]:
+                    longest = (run_length, run_start, day)
+                previous = day
+            self._streaks = {
+                "longest": longest[0],
+                "longest_start": longest[1],
+                "longest_end": longest[2],
+                "last_run": run_length,
+                "last_run_end": previous
+            }
+
+        # The latest run only counts as current if it reaches today or yesterday
+        today = today or date.today().isoformat()
+        last_end = self._streaks["last_run_end"]
+        current = self._streaks["last_run"] if last_end and last_end >= _shift(today, -1) else 0
+        return {
+            "current": current,
+            "longest": self._streaks["longest"],
+            "longest_start": self._streaks["longest_start"],
+            "longest_end": self._streaks["longest_end"]
+        }
+
+    def score_trend(self, subject: str) -> Dict[str, Any]:
+        """Average, latest score and least-squares slope per test for a subject"""
+        if subject not in self._trends:
+            scores = [percentage for _, percentage in self._tests.get(subject, [])]
+            n = len(scores)
+            trend = {"tests": n, "average": None, "latest": None, "slope_per_test": None, "moving_average_3": []}
+            if n:
+                mean = sum(scores) / n
+                trend["average"] = mean
+                trend["latest"] = scores[-1]
+                if n > 1:
+                    x_mean = (n - 1) / 2
+                    covariance = sum((i - x_mean) * (s - mean) for i, s in enumerate(scores))
+                    variance = sum((i - x_mean) ** 2 for i in range(n))
+                    trend["slope_per_test"] = covariance / variance
+                trend["moving_average_3"] = [sum(scores[max(0, i - 2):i + 1]) / len(scores[max(0, i - 2):i + 1])
+                                             for i in range(n)]
+            self._trends[subject] = trend
+        return self._trends[subject]
+
+    def summary(self, days: int = 90, today: str = None) -> Dict[str, Any]:
+        """Everything the dashboard and /api/analytics need, with series limited to the last N days
+
+        The result is a copy; changing it leaves the memoized statistics intact.
+        """
+        trends = {subject: self.score_trend(subject) for subject in sorted(self._tests)}
+        result = {
+            "weekly_totals": {week: dict(totals) for week, totals in self._weeks.items()},
+            "monthly_totals": {month: dict(totals) for month, totals in self._months.items()},
+            "streaks": self.streaks(today),
+            "score_trends": {subject: dict(trend, moving_average_3=list(trend["moving_average_3"]))
+                             for subject, trend in trends.items()}
+        }
+        for window in self.WINDOWS:
+            series = self.moving_average(window)
+            dates = list(series)[-days:] if days else list(series)
+            result[f"moving_average_{window}d"] = {d: dict(series[d]) for d in dates}
+        return result
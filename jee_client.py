@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for JEE Progress Tracker
+Forwards the command to a running `jee-tracker daemon` over its Unix socket
+and prints the result. Without a daemon the command runs in-process as
+before. Only built-in modules are imported on the forwarding path (marshal
+instead of json, _socket instead of socket), so it adds about a millisecond
+to interpreter startup; the tracker itself is imported only as a fallback.
+"""
+
+import _socket
+import marshal
+import os
+import stat
+import sys
+
+SOCKET_ENV = "JEE_TRACKER_SOCKET"
+NO_DAEMON_ENV = "JEE_TRACKER_NO_DAEMON"
+
+def default_socket_path() -> str:
+    """Per-user socket path, overridable with $JEE_TRACKER_SOCKET"""
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "jee-tracker.sock")
+    return os.path.join("/tmp", f"jee-tracker-{os.getuid()}.sock")
+
+def _trusted(socket_path: str) -> bool:
+    """Whether socket_path is a socket only we can use, so its replies may be unmarshalled"""
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        return False
+    # In a shared directory like /tmp another user could have created the path first
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+def send_request(request: dict, socket_path: str = None, timeout: float = None):
+    """Send one request dict to the daemon and return its reply, or None if no daemon is listening"""
+    if not hasattr(_socket, "AF_UNIX"):
+        return None
+    socket_path = socket_path or default_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    if not _trusted(socket_path):
+        sys.stderr.write(f"jee-tracker: ignoring {socket_path}, it is not a private socket owned by you\n")
+        return None
+    client = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        try:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+        except OSError:
+            return None  # a stale socket left by a daemon that died
+
+        # marshal is safe here: the socket was checked to be accessible to us only
+        client.sendall(marshal.dumps(request))
+        client.shutdown(_socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        client.close()
+    if not chunks:
+        # The command may already have been applied, so it must not be retried in-process
+        return {"stdout": "", "stderr": "jee-tracker daemon closed the connection without replying\n", "status": 1}
+    return marshal.loads(b"".join(chunks))
+
+def _forwardable(argv) -> bool:
+    # The daemon cannot read our stdin, and must not be asked to manage itself
+    return "daemon" not in argv and not ("import" in argv and "-" in argv)
+
+def run_local(argv):
+    from jee_tracker import main as tracker_main
+    tracker_main(argv)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if os.environ.get(NO_DAEMON_ENV) or not _forwardable(argv):
+        run_local(argv)
+        return
+
+    reply = send_request({"argv": argv, "cwd": os.getcwd()})
+    if reply is None:
+        run_local(argv)
+        return
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    sys.stdout.flush()
+    if reply["status"]:
+        sys.exit(reply["status"])
+
+if __name__ == "__main__":
+    main()
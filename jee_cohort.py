@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Cohort reports for JEE Progress Tracker
+Summarizes a directory of per-student data files on a process pool and merges
+the summaries into class-wide chapter completion distributions, a confidence
+heatmap and rankings. Summaries are cached by file signature, so a rerun only
+reloads students whose files changed.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+from typing import Dict, Iterable, List, Any, Optional
+
+from jee_storage import BINARY_EXTENSIONS, SQLITE_EXTENSIONS, atomic_write, disk_signature
+from jee_tracker import JEEProgressTracker
+
+DATA_EXTENSIONS = (".json",) + BINARY_EXTENSIONS + SQLITE_EXTENSIONS
+CACHE_FILE = ".cohort_cache.json"
+CACHE_VERSION = 1
+HISTOGRAM_BINS = 10  # completion in 10% steps, confidence in steps of 1
+INLINE_LIMIT = 16  # fewer changed files than this are summarized without starting a pool
+
+def student_files(directory: str) -> Dict[str, str]:
+    """student id -> data file for every data file in directory"""
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        student, extension = os.path.splitext(name)
+        if name.startswith(".") or extension.lower() not in DATA_EXTENSIONS:
+            continue
+        files.setdefault(student, os.path.join(directory, name))
+    return files
+
+def _data_paths(path: str) -> List[str]:
+    """The data file plus the journal or WAL file whose changes also count"""
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        return [path, path + "-wal"]
+    return [path, path + ".journal"]
+
+def file_signature(path: str) -> List[Any]:
+    """JSON-friendly (mtime, size) of a data file and its journal or WAL"""
+    # Inode numbers are left out so that a copied or restored directory stays cached
+    return [list(entry[1:]) if entry else None for entry in disk_signature(_data_paths(path))]
+
+def _content_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    for data_path in _data_paths(path):
+        try:
+            with open(data_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        except FileNotFoundError:
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+def summarize_student(path: str, syllabus: str = None) -> Dict[str, Any]:
+    """Per-subject and per-chapter progress for one data file, small enough to cache"""
+    tracker = JEEProgressTracker(path, syllabus=syllabus)
+    try:
+        subjects = {}
+        for subject in tracker.data["subjects"]:
+            progress = tracker.get_subject_progress(subject)
+            subjects[subject] = {
+                "total_topics": progress["total_topics"],
+                "completed_topics": progress["completed_topics"],
+                "confidence": progress["avg_confidence"] * progress["total_topics"],
+                "study_time": progress["total_study_time"],
+                # [completion rate, average confidence] per chapter
+                "chapters": {chapter: [values["completion_rate"], values["avg_confidence"]]
+                             for chapter, values in progress["chapter_progress"].items()}
+            }
+        tests = tracker.data["test_scores"]
+        return {
+            "subjects": subjects,
+            "study_hours": sum(tracker.data["study_hours"].values()),
+            "tests": len(tests),
+            "avg_test_percentage": sum(t["percentage"] for t in tests) / len(tests) if tests else None
+        }
+    finally:
+        if hasattr(tracker.storage, "close"):
+            tracker.storage.close()
+
+def _summarize_job(job):
+    """Process pool entry point: (student, path, syllabus, verify_hash) -> (student, signature, hash, summary, error)"""
+    student, path, syllabus, verify_hash = job
+    # Taken before loading, so a write during the load makes the next run reload the file
+    signature = file_signature(path)
+    content_hash = _content_hash(path) if verify_hash else None  # only read back by verify_hash runs
+    try:
+        return student, signature, content_hash, summarize_student(path, syllabus), None
+    except Exception as e:  # one bad file must not sink the whole report
+        return student, signature, content_hash, None, f"{type(e).__name__}: {e}"
+
+def _histogram(values: Iterable[float], top: float) -> List[int]:
+    counts = [0] * HISTOGRAM_BINS
+    for value in values:
+        counts[min(HISTOGRAM_BINS - 1, max(0, int(value / top * HISTOGRAM_BINS)))] += 1
+    return counts
+
+def merge_summaries(summaries: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Class-wide distributions, heatmap and rankings from per-student summaries"""
+    chapter_values = {}  # (subject, chapter) -> ([completion rates], [confidences])
+    overall = []
+    by_subject = {}
+    for student, summary in summaries.items():
+        topics = completed = confidence = 0
+        for subject, values in summary["subjects"].items():
+            topics += values["total_topics"]
+            completed += values["completed_topics"]
+            confidence += values["confidence"]
+            for chapter, (completion_rate, avg_confidence) in values["chapters"].items():
+                rates, confidences = chapter_values.setdefault((subject, chapter), ([], []))
+                rates.append(completion_rate)
+                confidences.append(avg_confidence)
+            if values["total_topics"]:
+                by_subject.setdefault(subject, []).append({
+                    "student": student,
+                    "completion_rate": values["completed_topics"] / values["total_topics"] * 100,
+                    "avg_confidence": values["confidence"] / values["total_topics"],
+                    "study_time": values["study_time"]
+                })
+        overall.append({
+            "student": student,
+            "completion_rate": completed / topics * 100 if topics else 0,
+            "avg_confidence": confidence / topics if topics else 0,
+            "study_hours": summary["study_hours"],
+            "avg_test_percentage": summary["avg_test_percentage"]
+        })
+
+    chapters = {}
+    heatmap = {}
+    for (subject, chapter), (rates, confidences) in chapter_values.items():
+        chapters.setdefault(subject, {})[chapter] = {
+            "students": len(rates),
+            "mean_completion": sum(rates) / len(rates),
+            "median_completion": median(rates),
+            "completion_histogram": _histogram(rates, 100),
+            "mean_confidence": sum(confidences) / len(confidences),
+            "confidence_histogram": _histogram(confidences, 10)
+        }
+        heatmap.setdefault(subject, {})[chapter] = chapters[subject][chapter]["mean_confidence"]
+
+    def ranked(rows):
+        rows.sort(key=lambda row: (-row["completion_rate"], -row["avg_confidence"], row["student"]))
+        for rank, row in enumerate(rows, 1):
+            row["rank"] = rank
+        return rows
+
+    return {
+        "students": len(summaries),
+        "chapters": chapters,
+        "confidence_heatmap": heatmap,
+        "rankings": {
+            "overall": ranked(overall),
+            "by_subject": {subject: ranked(rows) for subject, rows in by_subject.items()}
+        }
+    }
+
+def _load_cache(cache_file: Optional[str]) -> Dict[str, Any]:
+    if not cache_file or not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, "r") as f:
+            cache = json.load(f)
+    except ValueError:
+        return {}  # a damaged cache only costs a full rebuild
+    return cache.get("students", {}) if cache.get("version") == CACHE_VERSION else {}
+
+def cohort_report(directory: str, syllabus: str = None, workers: int = None,
+                  cache_file: Optional[str] = "", verify_hash: bool = False) -> Dict[str, Any]:
+    """Summarize every student file in directory and merge the results
+
+    cache_file defaults to .cohort_cache.json in the directory; pass None to
+    disable caching. With verify_hash, files whose mtime changed but whose
+    content did not (a touch, a copy) are also served from the cache.
+    """
+    started = time.perf_counter()
+    if cache_file == "":
+        cache_file = os.path.join(directory, CACHE_FILE)
+    cache = _load_cache(cache_file)
+    files = student_files(directory)
+
+    entries = {}
+    jobs = []
+    for student, path in files.items():
+        entry = cache.get(student)
+        if entry and entry["path"] == os.path.basename(path):
+            if entry["signature"] == file_signature(path):
+                entries[student] = entry
+                continue
+            if verify_hash and entry["hash"] is not None and entry["hash"] == _content_hash(path):
+                entries[student] = dict(entry, signature=file_signature(path))
+                continue
+        jobs.append((student, path, syllabus, verify_hash))
+
+    if len(jobs) < INLINE_LIMIT or workers == 1:
+        results = map(_summarize_job, jobs)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        results = executor.map(_summarize_job, jobs, chunksize=chunksize)
+    try:
+        for student, signature, content_hash, summary, error in results:
+            entries[student] = {"path": os.path.basename(files[student]), "signature": signature,
+                                "hash": content_hash, "summary": summary, "error": error}
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if cache_file and (jobs or set(cache) != set(entries)):
+        atomic_write(cache_file, json.dumps({"version": CACHE_VERSION, "students": entries},
+                                            separators=(",", ":")))
+
+    report = merge_summaries({student: entry["summary"] for student, entry in sorted(entries.items())
+                              if entry["summary"] is not None})
+    report["errors"] = {student: entry["error"] for student, entry in sorted(entries.items()) if entry["error"]}
+    report["cached"] = len(files) - len(jobs)
+    report["loaded"] = len(jobs)
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+def print_report(report: Dict[str, Any], top: int = 10):
+    """Text summary of a cohort report"""
+    print("=" * 60)
+    print(f"COHORT REPORT: {report['students']} students")
+    print("=" * 60)
+    print(f"   {report['loaded']} loaded, {report['cached']} from cache, {report['seconds']:.2f} s")
+
+    for subject, chapters in report["chapters"].items():
+        print(f"\n📚 {subject.upper()}")
+        for chapter, stats in chapters.items():
+            print(f"   • {chapter}: {stats['mean_completion']:.0f}% complete on average "
+                  f"(median {stats['median_completion']:.0f}%), confidence {stats['mean_confidence']:.1f}/10")
+
+    print(f"\n🏆 TOP {top} STUDENTS")
+    for row in report["rankings"]["overall"][:top]:
+        print(f"   {row['rank']:>3}. {row['student']}: {row['completion_rate']:.1f}% complete, "
+              f"confidence {row['avg_confidence']:.1f}/10, {row['study_hours']:.1f} hours")
+
+    if report["errors"]:
+        print(f"\n❌ {len(report['errors'])} files could not be read")
+        for student, error in list(report["errors"].items())[:10]:
+            print(f"   {student}: {error}")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Background daemon for JEE Progress Tracker
+Keeps trackers loaded between commands and runs the commands jee_client
+forwards over a Unix socket, so a scripted command skips interpreter-level
+imports, syllabus setup and the full data file parse.
+"""
+
+import io
+import marshal
+import os
+import signal
+import socketserver
+import sys
+import traceback
+from collections import OrderedDict
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Dict, List, Any
+
+from jee_client import default_socket_path, send_request
+from jee_tracker import JEEProgressTracker, build_parser, execute
+
+MAX_TRACKERS = 16
+
+def _close_storage(tracker: JEEProgressTracker):
+    if hasattr(tracker.storage, "close"):
+        tracker.storage.close()
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = marshal.loads(self.rfile.read())
+        except (EOFError, ValueError, TypeError):
+            return
+        if not isinstance(request, dict):
+            return
+        if request.get("stop"):
+            self.server.stopping = True
+            reply = {"stdout": "", "stderr": "", "status": 0}
+        elif request.get("ping"):
+            reply = {"stdout": "", "stderr": "", "status": 0, "pid": os.getpid()}
+        else:
+            reply = self.server.run(request.get("argv", []), request.get("cwd") or "/")
+        self.wfile.write(marshal.dumps(reply))
+
+class TrackerDaemon(socketserver.UnixStreamServer):
+    """Runs one forwarded command at a time against a small LRU of loaded trackers"""
+
+    def __init__(self, socket_path: str, idle_timeout: float = 0):
+        self.socket_path = socket_path
+        self.trackers = OrderedDict()  # (data file, journal, syllabus, syllabus mtime) -> tracker
+        self.stopping = False
+        self.timeout = idle_timeout or None  # handle_request() gives up after this many idle seconds
+        super().__init__(socket_path, DaemonHandler)
+        self.socket_inode = os.stat(socket_path).st_ino  # so we never remove a successor's socket
+
+    def open_tracker(self, args) -> JEEProgressTracker:
+        """The cached tracker for these arguments, reloaded if another process changed its files"""
+        syllabus = os.path.abspath(args.syllabus) if args.syllabus else None
+        key = (os.path.abspath(args.data_file), args.journal, syllabus,
+               os.stat(syllabus).st_mtime_ns if syllabus else None)
+        tracker = self.trackers.get(key)
+        if tracker is None:
+            tracker = JEEProgressTracker(key[0], journal=args.journal, syllabus=syllabus)
+            self.trackers[key] = tracker
+            while len(self.trackers) > MAX_TRACKERS:
+                _close_storage(self.trackers.popitem(last=False)[1])
+        else:
+            self.trackers.move_to_end(key)
+            if tracker.storage.changed():
+                tracker.reload()
+        return tracker
+
+    def run(self, argv: List[str], cwd: str) -> Dict[str, Any]:
+        """Run a jee-tracker command line as if in cwd, capturing its output and exit status"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        status = 0
+        previous = os.getcwd()
+        try:
+            os.chdir(cwd)
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    parser = build_parser()
+                    parser.prog = "jee-tracker"
+                    args = parser.parse_args(argv)
+                    if args.command == "daemon":
+                        parser.error("daemon commands are not forwarded")
+                    execute(args, self.open_tracker)
+                except SystemExit as e:
+                    if isinstance(e.code, int) or e.code is None:
+                        status = e.code or 0
+                    else:
+                        print(e.code, file=sys.stderr)
+                        status = 1
+                except Exception:
+                    traceback.print_exc()
+                    status = 1
+                    # Never keep a tracker that may be half-way through a change
+                    self.close_trackers()
+        except OSError as e:
+            stderr.write(f"jee-tracker daemon: {e}\n")
+            status = 1
+        finally:
+            os.chdir(previous)
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "status": status}
+
+    def close_trackers(self):
+        """Drop every loaded tracker, closing storage that holds a connection open"""
+        while self.trackers:
+            _close_storage(self.trackers.popitem()[1])
+
+    def server_close(self):
+        super().server_close()
+        self.close_trackers()
+
+    def handle_timeout(self):
+        self.stopping = True
+
+    def serve(self):
+        while not self.stopping:
+            self.handle_request()
+
+def _bind(socket_path: str, idle_timeout: float) -> TrackerDaemon:
+    if os.path.exists(socket_path):
+        if send_request({"ping": True}, socket_path, timeout=2) is not None:
+            raise SystemExit(f"A jee-tracker daemon is already listening on {socket_path}")
+        os.unlink(socket_path)  # left behind by a daemon that did not shut down cleanly
+    # Only the owner may connect
+    old_umask = os.umask(0o077)
+    try:
+        return TrackerDaemon(socket_path, idle_timeout * 60)
+    finally:
+        os.umask(old_umask)
+
+def _detach():
+    """Fork into the background; returns in the daemon process only"""
+    if os.fork():
+        return False
+    os.setsid()
+    if os.fork():
+        os._exit(0)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    return True
+
+def daemon_command(args):
+    """`jee-tracker daemon`: run, detach or stop the daemon"""
+    socket_path = args.socket or default_socket_path()
+    if args.stop:
+        if send_request({"stop": True}, socket_path, timeout=5) is None:
+            print(f"No jee-tracker daemon is listening on {socket_path}")
+        else:
+            print("🛑 Daemon stopped")
+        return
+
+    server = _bind(socket_path, args.idle_timeout)
+    if args.detach:
+        if not _detach():
+            server.server_close()  # the listening socket now belongs to the daemon process
+            print(f"🚀 jee-tracker daemon listening on {socket_path}")
+            return
+    else:
+        print(f"🚀 jee-tracker daemon listening on {socket_path} (Ctrl+C to stop)")
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            if os.stat(socket_path).st_ino == server.socket_inode:
+                os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
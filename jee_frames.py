@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Columnar analysis and export for JEE Progress Tracker
+Turns topics, daily logs and test scores into pandas DataFrames in one pass
+so statistics run as vectorized operations instead of nested dict loops.
+Requires the optional pandas and numpy dependencies (see requirements.txt).
+"""
+
+import os
+from typing import Dict, Iterable, List, Any
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # optional dependencies
+    np = None
+    pd = None
+
+from jee_storage import open_storage
+
+TOPIC_COLUMNS = ["student", "subject", "chapter", "topic", "status", "confidence",
+                 "time_spent", "problems_solved", "last_studied"]
+LOG_COLUMNS = ["student", "date", "subject", "hours", "topics_covered"]
+TEST_COLUMNS = ["student", "date", "subject", "test_name", "score", "max_score", "percentage"]
+# Columns that must be numeric even when a table has no rows (pandas would make them object)
+NUMERIC_COLUMNS = {
+    "topics": ["confidence", "time_spent", "problems_solved"],
+    "logs": ["hours", "topics_covered"],
+    "tests": ["score", "max_score", "percentage"],
+}
+
+def _require_pandas():
+    if pd is None:
+        raise ImportError("Columnar analysis needs pandas and numpy: pip install pandas numpy")
+
+def _append_rows(rows: Dict[str, List[tuple]], data: Dict[str, Any], student: str):
+    """Append one student's topics, logs and tests as plain row tuples"""
+    topics, logs, tests = rows["topics"], rows["logs"], rows["tests"]
+    for subject, chapters in data["subjects"].items():
+        for chapter, chapter_topics in chapters.items():
+            for topic, entry in chapter_topics.items():
+                topics.append((student, subject, chapter, topic, entry["status"], entry["confidence"],
+                               entry["time_spent"], entry["problems_solved"], entry["last_studied"]))
+
+    for log_date, entries in data["daily_logs"].items():
+        for entry in entries:
+            logs.append((student, log_date, entry["subject"], entry["hours"], len(entry["topics"])))
+
+    for test in data["test_scores"]:
+        tests.append((student, test["date"], test["subject"], test["test_name"],
+                      test["score"], test["max_score"], test["percentage"]))
+
+def _build_frames(rows: Dict[str, List[tuple]]) -> Dict[str, "pd.DataFrame"]:
+    """Convert the row lists to typed DataFrames in one step each"""
+    topics = pd.DataFrame.from_records(rows["topics"], columns=TOPIC_COLUMNS)
+    topics["status"] = topics["status"].astype("category")
+    topics["last_studied"] = pd.to_datetime(topics["last_studied"], errors="coerce")
+
+    logs = pd.DataFrame.from_records(rows["logs"], columns=LOG_COLUMNS)
+    logs["date"] = pd.to_datetime(logs["date"], errors="coerce")
+
+    tests = pd.DataFrame.from_records(rows["tests"], columns=TEST_COLUMNS)
+    tests["date"] = pd.to_datetime(tests["date"], errors="coerce")
+
+    frames = {"topics": topics, "logs": logs, "tests": tests}
+    for name, columns in NUMERIC_COLUMNS.items():
+        for column in columns:
+            frames[name][column] = pd.to_numeric(frames[name][column])
+    return frames
+
+def to_frames(data: Dict[str, Any], student: str = "") -> Dict[str, "pd.DataFrame"]:
+    """Topics, logs and tests DataFrames for one tracker's data dict"""
+    _require_pandas()
+    rows = {"topics": [], "logs": [], "tests": []}
+    _append_rows(rows, data, student)
+    return _build_frames(rows)
+
+def load_frames(paths: Iterable[str]) -> Dict[str, "pd.DataFrame"]:
+    """Load many student data files into one set of DataFrames with a student column"""
+    _require_pandas()
+    rows = {"topics": [], "logs": [], "tests": []}
+    for path in paths:
+        # Only the storage layer is needed; no tracker or syllabus is built
+        storage = open_storage(path)
+        student = os.path.splitext(os.path.basename(path))[0]
+        _append_rows(rows, storage.load(), student)
+        if hasattr(storage, "close"):
+            storage.close()
+    return _build_frames(rows)
+
+def subject_stats(topics: "pd.DataFrame", by: List[str] = None) -> "pd.DataFrame":
+    """Completion, confidence and time per subject (or any other grouping)"""
+    by = by or ["subject"]
+    grouped = topics.assign(
+        completed=(topics["status"] == "completed").astype(int),
+        in_progress=(topics["status"] == "in_progress").astype(int)
+    ).groupby(by, observed=True)
+    stats = grouped.agg(
+        total_topics=("topic", "size"),
+        completed_topics=("completed", "sum"),
+        in_progress_topics=("in_progress", "sum"),
+        avg_confidence=("confidence", "mean"),
+        total_study_time=("time_spent", "sum")
+    )
+    stats["completion_rate"] = stats["completed_topics"] / stats["total_topics"] * 100
+    return stats
+
+def chapter_stats(topics: "pd.DataFrame") -> "pd.DataFrame":
+    """Completion, confidence and time per subject and chapter"""
+    return subject_stats(topics, by=["subject", "chapter"])
+
+def time_confidence_correlation(topics: "pd.DataFrame") -> "pd.Series":
+    """Pearson correlation between time spent and confidence, overall and per subject"""
+    if topics.empty:
+        return pd.Series({"overall": np.nan}, dtype=float)
+    # Constant columns (e.g. a subject nobody has studied) correlate to NaN; numpy would also warn
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_subject = (topics.groupby("subject")[["time_spent", "confidence"]].corr()
+                       .xs("confidence", level=1)["time_spent"])
+        overall = pd.Series({"overall": topics["time_spent"].corr(topics["confidence"])})
+    return pd.concat([overall, per_subject])
+
+def score_percentiles(tests: "pd.DataFrame", percentiles: Iterable[float] = (25, 50, 75, 90)) -> "pd.DataFrame":
+    """Test percentage percentiles per subject"""
+    quantiles = np.asarray(list(percentiles), dtype=float) / 100
+    columns = [f"p{round(q * 100):g}" for q in quantiles]
+    if tests.empty:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="subject"), dtype=float)
+    table = tests.groupby("subject")["percentage"].quantile(quantiles).unstack()
+    table.columns = columns
+    return table
+
+def export_frames(frames: Dict[str, "pd.DataFrame"], out_dir: str, fmt: str = "csv") -> List[str]:
+    """Write each frame to out_dir as CSV or Parquet (Parquet needs pyarrow or fastparquet)"""
+    _require_pandas()
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name, frame in frames.items():
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        if fmt == "parquet":
+            frame.to_parquet(path, index=False)
+        elif fmt == "csv":
+            frame.to_csv(path, index=False)
+        else:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        written.append(path)
+    return written
+
+def batch_report(paths: Iterable[str]) -> Dict[str, "pd.DataFrame"]:
+    """Per-student subject statistics and score percentiles across many data files"""
+    frames = load_frames(paths)
+    return summary_frames(frames, by=["student", "subject"])
+
+def summary_frames(frames: Dict[str, "pd.DataFrame"], by: List[str] = None) -> Dict[str, "pd.DataFrame"]:
+    """Statistics tables for a set of frames, flattened so they export cleanly"""
+    return {
+        "subject_stats": subject_stats(frames["topics"], by=by).reset_index(),
+        "chapter_stats": chapter_stats(frames["topics"]).reset_index(),
+        "time_confidence_correlation": time_confidence_correlation(frames["topics"]).rename_axis("scope")
+                                       .to_frame("correlation").reset_index(),
+        "score_percentiles": score_percentiles(frames["tests"]).reset_index()
+    }
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Progress history for JEE Progress Tracker
+Every topic change is stored as a small delta in data["history"] (see
+jee_storage.topic_delta). This module indexes those deltas by time with a
+checkpoint of per-chapter counters every CHECKPOINT_INTERVAL deltas, so
+subject progress as of any moment costs a bisect plus a bounded replay.
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime, time
+from typing import Any, Dict, List
+
+CHECKPOINT_INTERVAL = 256  # deltas replayed at most per point-in-time query
+# Per-chapter counters: completed topics, topics in progress, confidence sum, time spent
+COMPLETED, IN_PROGRESS, CONFIDENCE, TIME_SPENT = range(4)
+
+def history_key(moment) -> str:
+    """ISO string comparable with stored last_studied times; a bare date means the end of that day"""
+    if isinstance(moment, datetime):
+        return moment.isoformat()
+    if isinstance(moment, date):
+        return datetime.combine(moment, time.max).isoformat()
+    text = str(moment).strip()
+    if len(text) == 10:
+        return datetime.combine(date.fromisoformat(text), time.max).isoformat()
+    return datetime.fromisoformat(text).isoformat()
+
+def _apply(state: Dict[str, List[float]], delta: tuple):
+    _, chapter, _, old_status, new_status, d_confidence, d_time_spent = delta
+    counters = state.get(chapter)
+    if counters is None:
+        counters = state[chapter] = [0, 0, 0, 0]
+    counters[COMPLETED] += (new_status == "completed") - (old_status == "completed")
+    counters[IN_PROGRESS] += (new_status == "in_progress") - (old_status == "in_progress")
+    counters[CONFIDENCE] += d_confidence
+    counters[TIME_SPENT] += d_time_spent
+
+class _SubjectHistory:
+    __slots__ = ("times", "deltas", "checkpoints")
+
+    def __init__(self):
+        self.times = []  # sorted delta times
+        self.deltas = []  # (at, chapter, topic, old status, new status, d_confidence, d_time_spent)
+        self.checkpoints = [{}]  # [i]: counters after the first i * CHECKPOINT_INTERVAL deltas
+
+    def add(self, delta: tuple):
+        at = delta[0]
+        if not self.times or at >= self.times[-1]:
+            self.times.append(at)
+            self.deltas.append(delta)
+            return
+        # Back-dated change (e.g. an import with studied_at); later checkpoints no longer hold
+        position = bisect_right(self.times, at)
+        self.times.insert(position, at)
+        self.deltas.insert(position, delta)
+        del self.checkpoints[position // CHECKPOINT_INTERVAL + 1:]
+
+    def state(self, count: int) -> Dict[str, List[float]]:
+        """Per-chapter counters after the first count deltas"""
+        block = count // CHECKPOINT_INTERVAL
+        while len(self.checkpoints) <= block:
+            start = (len(self.checkpoints) - 1) * CHECKPOINT_INTERVAL
+            state = {chapter: list(counters) for chapter, counters in self.checkpoints[-1].items()}
+            for delta in self.deltas[start:start + CHECKPOINT_INTERVAL]:
+                _apply(state, delta)
+            self.checkpoints.append(state)
+
+        state = {chapter: list(counters) for chapter, counters in self.checkpoints[block].items()}
+        for delta in self.deltas[block * CHECKPOINT_INTERVAL:count]:
+            _apply(state, delta)
+        return state
+
+class ProgressHistory:
+    """Time index over a tracker's progress deltas, kept current per change record"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+        self._subjects = {}
+        history = data.get("history", [])
+        self._seen = len(history)
+
+        # Progress made before history was kept (or by older versions) is whatever
+        # the recorded deltas do not explain; it becomes one synthetic delta per topic
+        recorded = {}  # (subject, chapter, topic) -> [first old status, confidence change, time change]
+        for delta in history:
+            net = recorded.get(tuple(delta[1:4]))
+            if net is None:
+                recorded[tuple(delta[1:4])] = [delta[4], delta[6], delta[7]]
+            else:
+                net[1] += delta[6]
+                net[2] += delta[7]
+        for subject, chapters in data["subjects"].items():
+            for chapter, topics in chapters.items():
+                for topic, entry in topics.items():
+                    net = recorded.get((subject, chapter, topic))
+                    if net is None:
+                        at, status = entry["last_studied"] or "", entry["status"]
+                        confidence, time_spent = entry["confidence"], entry["time_spent"]
+                    else:
+                        at, status = "", net[0]
+                        confidence, time_spent = entry["confidence"] - net[1], entry["time_spent"] - net[2]
+                    if status != "not_started" or abs(confidence) > 1e-9 or abs(time_spent) > 1e-9:
+                        self._add([at, subject, chapter, topic, "not_started", status, confidence, time_spent])
+
+        for delta in history:
+            self._add(delta)
+
+    def _add(self, delta: List[Any]):
+        subject = self._subjects.get(delta[1])
+        if subject is None:
+            subject = self._subjects[delta[1]] = _SubjectHistory()
+        subject.add((delta[0],) + tuple(delta[2:]))
+
+    def __len__(self) -> int:
+        return sum(len(subject.deltas) for subject in self._subjects.values())
+
+    def record(self, record: Dict[str, Any]):
+        """Index the deltas apply_record added for a committed change record"""
+        history = self._data.get("history", ())
+        for delta in history[self._seen:]:
+            self._add(delta)
+        self._seen = len(history)
+
+    def subject_progress(self, subject: str, moment) -> Dict[str, Any]:
+        """get_subject_progress output as it stood at moment
+
+        Topic counts are today's: topics added to the syllabus later count as
+        not started at earlier times.
+        """
+        as_of = history_key(moment)
+        history = self._subjects.get(subject)
+        state = history.state(bisect_right(history.times, as_of)) if history else {}
+
+        chapter_progress = {}
+        total_topics = 0
+        totals = [0, 0, 0, 0]
+        for chapter, topics in self._data["subjects"][subject].items():
+            counters = state.get(chapter) or [0, 0, 0, 0]
+            chapter_total = len(topics)
+            chapter_progress[chapter] = {
+                "completion_rate": (counters[COMPLETED] / chapter_total) * 100 if chapter_total > 0 else 0,
+                "avg_confidence": counters[CONFIDENCE] / chapter_total if chapter_total > 0 else 0
+            }
+            total_topics += chapter_total
+            for i, value in enumerate(counters):
+                totals[i] += value
+
+        return {
+            "as_of": as_of,
+            "total_topics": total_topics,
+            "completed_topics": totals[COMPLETED],
+            "in_progress_topics": totals[IN_PROGRESS],
+            "completion_rate": (totals[COMPLETED] / total_topics) * 100 if total_topics > 0 else 0,
+            "avg_confidence": totals[CONFIDENCE] / total_topics if total_topics > 0 else 0,
+            "total_study_time": totals[TIME_SPENT],
+            "chapter_progress": chapter_progress
+        }
+
+    def topic_timeline(self, subject: str, chapter: str, topic: str) -> List[Dict[str, Any]]:
+        """Status, confidence and time spent after each recorded change to one topic, oldest first"""
+        history = self._subjects.get(subject)
+        timeline = []
+        status, confidence, time_spent = "not_started", 0, 0
+        for at, delta_chapter, delta_topic, _, new_status, d_confidence, d_time_spent in history.deltas if history else ():
+            if delta_chapter != chapter or delta_topic != topic:
+                continue
+            status = new_status
+            confidence += d_confidence
+            time_spent += d_time_spent
+            timeline.append({"at": at or None, "status": status, "confidence": confidence, "time_spent": time_spent})
+        return timeline
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Opt-in instrumentation for JEE Progress Tracker
+Call counts, latency histograms and byte counters for the tracker's hot
+paths, storage I/O and web routes, rendered in the Prometheus text format.
+Nothing is recorded until enable() is called.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+# Upper bounds in seconds, as in the Prometheus client defaults plus sub-millisecond buckets
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "jee_tracker_call_seconds": "Time spent in tracker methods",
+    "jee_storage_bytes_read_total": "Bytes read from data files and journals",
+    "jee_storage_bytes_written_total": "Bytes written to data files and journals",
+    "jee_http_request_seconds": "Time to handle a web request, by route",
+    "jee_http_request_bytes_total": "Request body bytes received, by route",
+    "jee_http_response_bytes_total": "Response body bytes sent, by route",
+}
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class Metrics:
+    """Thread-safe counters and histograms keyed by metric name and labels"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.enabled = False
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}  # name -> {label key: value}
+        self._histograms = {}  # name -> {label key: [count per bucket..., +Inf count, sum]}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            counts = series.get(key)
+            if counts is None:
+                counts = series[key] = [0] * (len(self.buckets) + 2)
+            counts[bisect_left(self.buckets, seconds)] += 1
+            counts[-1] += seconds
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, counts in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + ("+Inf",), counts):
+                        cumulative += count
+                        le = 'le="%s"' % (bound if bound == "+Inf" else f"{bound:g}")
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {counts[-1]:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+METRICS = Metrics()
+
+def enable():
+    """Start recording; the tracker, storage and web interface all report to METRICS"""
+    METRICS.enabled = True
+
+def timed(name: str, **labels):
+    """Decorator recording the call's duration in histogram name when metrics are enabled"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                METRICS.observe(name, time.perf_counter() - start, **labels)
+        return wrapper
+    return decorator
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Charts and reports for JEE Progress Tracker
+Renders per-subject completion bars, a study-hour timeline and test score
+trends to SVG or PNG, plus a standalone HTML report. Every output is stored
+under a hash of the numbers it shows, so a report whose data has not changed
+is never drawn twice; a directory of students is rendered on a process pool.
+matplotlib is optional: without it SVG charts come from a small built-in
+writer and PNG output is unavailable (see requirements.txt).
+"""
+
+import hashlib
+import io
+import itertools
+import json
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from html import escape
+from typing import Dict, Iterable, List, Any, Tuple
+
+from jee_cohort import INLINE_LIMIT, file_signature, student_files
+from jee_storage import FileLock, atomic_write
+from jee_tracker import JEEProgressTracker
+
+REPORT_DIR = ".jee_reports"  # default output directory, next to the data files
+REPORT_HTML = "report.html"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+LATEST_FILE = "latest.json"  # data file -> hash of its newest single-file report, kept when pruning
+REPORT_GRACE = 600  # seconds a superseded report directory survives, for readers still using it
+RENDER_VERSION = 1  # bump when charts are drawn differently, so cached outputs are redrawn
+CHARTS = ("completion", "study_hours", "tests")
+FORMATS = ("svg", "png")
+CONTENT_TYPES = {"svg": "image/svg+xml", "png": "image/png", "html": "text/html; charset=utf-8"}
+TIMELINE_DAYS = 90  # days of study hours shown, ending at the latest log
+
+SUBJECT_COLORS = {"Physics": "#4299e1", "Chemistry": "#38b2ac", "Mathematics": "#ed8936"}
+DEFAULT_SUBJECT_COLOR = "#667eea"
+# Subjects from custom syllabi take these in order
+EXTRA_COLORS = (DEFAULT_SUBJECT_COLOR, "#9f7aea", "#ed64a6", "#48bb78", "#ecc94b", "#f56565")
+
+WIDTH, HEIGHT = 720, 320
+LEFT, TOP, RIGHT, BOTTOM = 56, 48, 700, 280  # plot area of the built-in SVG charts
+
+_matplotlib = None
+
+def _figure_class():
+    """matplotlib's Figure, or None if matplotlib is not installed
+
+    Imported on first use, because importing matplotlib takes longer than
+    starting the web server. Figures are drawn without pyplot, so rendering
+    is safe from several request threads.
+    """
+    global _matplotlib
+    if _matplotlib is None:
+        try:
+            from matplotlib.figure import Figure
+            _matplotlib = Figure
+        except ImportError:  # optional dependency
+            _matplotlib = False
+    return _matplotlib or None
+
+def subject_colors(data: Dict[str, Any]) -> Dict[str, str]:
+    """One color per subject in chart data, the same in every chart"""
+    extra = itertools.cycle(EXTRA_COLORS)
+    colors = {}
+    for subjects in (data["completion"], data["study_hours"]["hours"], data["tests"]):
+        for subject in subjects:
+            if subject not in colors:
+                colors[subject] = SUBJECT_COLORS.get(subject) or next(extra)
+    return colors
+
+def chart_data(tracker: JEEProgressTracker, days: int = TIMELINE_DAYS) -> Dict[str, Any]:
+    """The numbers every chart and report shows, rounded so that the hash only changes with them"""
+    subjects = [subject for subject in tracker.syllabus if subject in tracker.data["subjects"]]
+    completion = {}
+    chapters = {}
+    for subject in subjects:
+        progress = tracker.get_subject_progress(subject)
+        completion[subject] = [round(progress["completion_rate"], 2), round(progress["avg_confidence"], 2),
+                               round(progress["total_study_time"], 2)]
+        chapters[subject] = {chapter: round(values["completion_rate"], 2)
+                             for chapter, values in progress["chapter_progress"].items()}
+
+    # The timeline ends at the latest log rather than today, so an idle student's report stays cached
+    study_hours = {"start": None, "hours": {}}
+    if tracker.data["daily_logs"]:
+        last = date.fromisoformat(max(tracker.data["daily_logs"]))
+        first = last - timedelta(days=days - 1)
+        study_hours["start"] = first.isoformat()
+        for log in tracker.get_logs_between(first.isoformat(), last.isoformat()):
+            series = study_hours["hours"].setdefault(log["subject"], [0] * days)
+            series[(date.fromisoformat(log["date"]) - first).days] += log["hours"]
+        for series in study_hours["hours"].values():
+            series[:] = [round(hours, 2) for hours in series]
+
+    tests = {}
+    for test in tracker.get_test_scores():
+        tests.setdefault(test["subject"], []).append([test["date"], round(test["percentage"], 2)])
+
+    return {"completion": completion, "chapters": chapters, "study_hours": study_hours, "tests": tests}
+
+def data_hash(data: Dict[str, Any]) -> str:
+    """Content hash naming a report's output directory"""
+    blob = json.dumps([RENDER_VERSION, data], sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha1(blob).hexdigest()[:20]
+
+def report_dir(data_file: str) -> str:
+    """Default output directory for the reports of a data file's students"""
+    return os.path.join(os.path.dirname(os.path.abspath(data_file)), REPORT_DIR)
+
+# Built-in SVG writer
+
+def _nice_ceiling(value: float) -> float:
+    """Smallest of 1, 2, 2.5, 5 times a power of ten that is at least value"""
+    scale = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 2.5, 5):
+        if step * scale >= value:
+            return step * scale
+    return 10 * scale
+
+def _svg(title: str, parts: List[str], height: int = HEIGHT) -> bytes:
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{height}" '
+            f'viewBox="0 0 {WIDTH} {height}" font-family="sans-serif" font-size="12" fill="#2d3748">'
+            f'<rect width="{WIDTH}" height="{height}" fill="white"/>'
+            f'<text x="{LEFT}" y="24" font-size="15" font-weight="bold">{escape(title)}</text>'
+            + "".join(parts) + "</svg>").encode()
+
+def _svg_empty(title: str, message: str) -> bytes:
+    return _svg(title, [f'<text x="{WIDTH // 2}" y="{HEIGHT // 2}" text-anchor="middle" '
+                        f'fill="#718096">{escape(message)}</text>'])
+
+def _svg_y_axis(parts: List[str], top: float, suffix: str = ""):
+    for i in range(5):
+        value = top * i / 4
+        y = BOTTOM - (BOTTOM - TOP) * i / 4
+        parts.append(f'<line x1="{LEFT}" y1="{y:.1f}" x2="{RIGHT}" y2="{y:.1f}" stroke="#e2e8f0"/>')
+        parts.append(f'<text x="{LEFT - 6}" y="{y + 4:.1f}" text-anchor="end">{value:g}{suffix}</text>')
+
+def _svg_legend(parts: List[str], colors: Dict[str, str]):
+    x = RIGHT
+    for subject, color in reversed(list(colors.items())):
+        x -= 14 + 7 * len(subject)
+        parts.append(f'<rect x="{x}" y="14" width="10" height="10" fill="{color}"/>'
+                     f'<text x="{x + 14}" y="23">{escape(subject)}</text>')
+        x -= 12
+
+def _svg_x_labels(parts: List[str], labels: List[Tuple[float, str]]):
+    for x, label in labels:
+        parts.append(f'<text x="{x:.1f}" y="{BOTTOM + 18}" text-anchor="middle">{escape(label)}</text>')
+
+def _svg_completion(data: Dict[str, Any]) -> bytes:
+    title = "Completion by subject"
+    if not data["completion"]:
+        return _svg_empty(title, "No subjects started yet")
+    colors = subject_colors(data)
+    left, width = 130, RIGHT - 170
+    parts = []
+    for i, (subject, (rate, _, _)) in enumerate(data["completion"].items()):
+        y = TOP + i * 40
+        parts.append(f'<text x="{left - 8}" y="{y + 18}" text-anchor="end">{escape(subject)}</text>'
+                     f'<rect x="{left}" y="{y}" width="{width}" height="26" fill="#e2e8f0" rx="4"/>'
+                     f'<rect x="{left}" y="{y}" width="{width * rate / 100:.1f}" height="26" '
+                     f'fill="{colors[subject]}" rx="4"/>'
+                     f'<text x="{left + width + 8}" y="{y + 18}">{rate:.1f}%</text>')
+    return _svg(title, parts, height=TOP + 40 * len(data["completion"]) + 10)
+
+def _svg_study_hours(data: Dict[str, Any]) -> bytes:
+    title = "Daily study hours"
+    timeline = data["study_hours"]
+    if not timeline["hours"]:
+        return _svg_empty(title, "No study sessions logged yet")
+    colors = subject_colors(data)
+    days = len(next(iter(timeline["hours"].values())))
+    totals = [sum(series[i] for series in timeline["hours"].values()) for i in range(days)]
+    top = _nice_ceiling(max(max(totals), 1))
+    parts = []
+    _svg_y_axis(parts, top, "h")
+    _svg_legend(parts, {subject: colors[subject] for subject in timeline["hours"]})
+    step = (RIGHT - LEFT) / days
+    for i in range(days):
+        bottom = BOTTOM
+        for subject, series in timeline["hours"].items():
+            if series[i]:
+                height = (BOTTOM - TOP) * series[i] / top
+                bottom -= height
+                parts.append(f'<rect x="{LEFT + i * step + step * 0.1:.1f}" y="{bottom:.1f}" '
+                             f'width="{step * 0.8:.1f}" height="{height:.1f}" fill="{colors[subject]}"/>')
+    start = date.fromisoformat(timeline["start"])
+    _svg_x_labels(parts, [(LEFT + (i + 0.5) * step, (start + timedelta(days=i)).isoformat())
+                          for i in sorted({0, days // 2, days - 1})])
+    return _svg(title, parts)
+
+def _svg_tests(data: Dict[str, Any]) -> bytes:
+    title = "Test scores"
+    if not data["tests"]:
+        return _svg_empty(title, "No test scores yet")
+    colors = subject_colors(data)
+    days = [date.fromisoformat(day).toordinal() for scores in data["tests"].values() for day, _ in scores]
+    first, span = min(days), max(max(days) - min(days), 1)
+    x = lambda day: LEFT + 10 + (RIGHT - LEFT - 20) * (date.fromisoformat(day).toordinal() - first) / span
+    y = lambda percentage: BOTTOM - (BOTTOM - TOP) * max(0, min(100, percentage)) / 100
+    parts = []
+    _svg_y_axis(parts, 100, "%")
+    _svg_legend(parts, {subject: colors[subject] for subject in data["tests"]})
+    for subject, scores in data["tests"].items():
+        points = " ".join(f"{x(day):.1f},{y(percentage):.1f}" for day, percentage in scores)
+        parts.append(f'<polyline points="{points}" fill="none" stroke="{colors[subject]}" stroke-width="2"/>')
+        parts.extend(f'<circle cx="{x(day):.1f}" cy="{y(percentage):.1f}" r="3" fill="{colors[subject]}"/>'
+                     for day, percentage in scores)
+    dates = sorted({day for scores in data["tests"].values() for day, _ in scores})
+    _svg_x_labels(parts, [(x(day), day) for day in sorted({dates[0], dates[len(dates) // 2], dates[-1]})])
+    return _svg(title, parts)
+
+# matplotlib charts
+
+def _plot_completion(ax, data: Dict[str, Any]):
+    ax.set_title("Completion by subject", loc="left", fontweight="bold")
+    colors = subject_colors(data)
+    subjects = list(data["completion"])[::-1]
+    rates = [data["completion"][subject][0] for subject in subjects]
+    ax.barh(subjects, [100] * len(subjects), color="#e2e8f0")
+    ax.barh(subjects, rates, color=[colors[subject] for subject in subjects])
+    for i, rate in enumerate(rates):
+        ax.text(101, i, f"{rate:.1f}%", va="center")
+    ax.set_xlim(0, 112)
+    ax.set_xticks([0, 25, 50, 75, 100])
+
+def _plot_study_hours(ax, data: Dict[str, Any]):
+    ax.set_title("Daily study hours", loc="left", fontweight="bold")
+    timeline = data["study_hours"]
+    colors = subject_colors(data)
+    start = date.fromisoformat(timeline["start"])
+    days = len(next(iter(timeline["hours"].values())))
+    dates = [start + timedelta(days=i) for i in range(days)]
+    bottom = [0] * days
+    for subject, series in timeline["hours"].items():
+        ax.bar(dates, series, bottom=bottom, color=colors[subject], label=subject, width=0.8)
+        bottom = [b + h for b, h in zip(bottom, series)]
+    ax.set_ylabel("hours")
+    ax.legend(loc="upper left", frameon=False, ncol=len(timeline["hours"]))
+
+def _plot_tests(ax, data: Dict[str, Any]):
+    ax.set_title("Test scores", loc="left", fontweight="bold")
+    colors = subject_colors(data)
+    for subject, scores in data["tests"].items():
+        ax.plot([date.fromisoformat(day) for day, _ in scores], [percentage for _, percentage in scores],
+                marker="o", color=colors[subject], label=subject)
+    ax.set_ylim(0, 100)
+    ax.set_ylabel("%")
+    ax.legend(loc="lower left", frameon=False, ncol=len(data["tests"]))
+
+_PLOTTERS = {"completion": _plot_completion, "study_hours": _plot_study_hours, "tests": _plot_tests}
+_SVG_WRITERS = {"completion": _svg_completion, "study_hours": _svg_study_hours, "tests": _svg_tests}
+
+def _has_data(data: Dict[str, Any], chart: str) -> bool:
+    return bool(data["study_hours"]["hours"] if chart == "study_hours" else data[chart])
+
+def render_chart(data: Dict[str, Any], chart: str, fmt: str = "svg") -> bytes:
+    """One chart as SVG or PNG bytes"""
+    if chart not in CHARTS or fmt not in FORMATS:
+        raise ValueError(f"Unknown chart {chart}.{fmt}")
+    Figure = _figure_class()
+    if Figure is None:
+        if fmt == "png":
+            raise ImportError("PNG charts need matplotlib: pip install matplotlib")
+        return _SVG_WRITERS[chart](data)
+
+    figure = Figure(figsize=(WIDTH / 100, HEIGHT / 100), dpi=100)
+    ax = figure.subplots()
+    for side in ("top", "right"):
+        ax.spines[side].set_visible(False)
+    if not _has_data(data, chart):
+        ax.set_axis_off()
+        ax.text(0.5, 0.5, "No data yet", ha="center", va="center", color="#718096")
+    else:
+        _PLOTTERS[chart](ax, data)
+        if chart != "completion":
+            figure.autofmt_xdate()
+    buffer = io.BytesIO()
+    # A fixed date keeps SVG output identical between renders of the same data
+    figure.savefig(buffer, format=fmt, metadata={"Date": None} if fmt == "svg" else None)
+    return buffer.getvalue()
+
+def render_html(data: Dict[str, Any], svgs: Dict[str, bytes] = None) -> str:
+    """Standalone HTML report with the charts inlined as SVG"""
+    svgs = dict(svgs or {})
+    charts = []
+    for chart in CHARTS:
+        if chart not in svgs:
+            svgs[chart] = render_chart(data, chart, "svg")
+        svg = svgs[chart].decode()
+        charts.append(f'<div class="chart">{svg[svg.find("<svg"):]}</div>')
+
+    rows = []
+    for subject, (rate, confidence, study_time) in data["completion"].items():
+        rows.append(f"<tr><th>{escape(subject)}</th><td>{rate:.1f}%</td><td>{confidence:.1f}/10</td>"
+                    f"<td>{study_time:.1f}h</td></tr>")
+        rows.extend(f'<tr class="chapter"><td>{escape(chapter)}</td><td>{chapter_rate:.0f}%</td><td></td><td></td></tr>'
+                    for chapter, chapter_rate in data["chapters"][subject].items())
+    return REPORT_TEMPLATE.replace("<!-- charts -->", "\n".join(charts)).replace("<!-- rows -->", "\n".join(rows))
+
+REPORT_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>JEE Progress Report</title>
+<style>
+    body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 760px; margin: 30px auto; color: #2d3748; }
+    h1 { color: #4a5568; }
+    .chart svg { max-width: 100%; height: auto; margin: 10px 0; }
+    table { border-collapse: collapse; width: 100%; margin-top: 20px; }
+    th, td { text-align: left; padding: 6px 10px; border-bottom: 1px solid #e2e8f0; }
+    tr.chapter td { color: #718096; font-size: 0.9em; }
+    tr.chapter td:first-child { padding-left: 30px; }
+</style>
+</head>
+<body>
+<h1>🎯 JEE Progress Report</h1>
+<!-- charts -->
+<table>
+<tr><th>Subject</th><th>Completed</th><th>Confidence</th><th>Study time</th></tr>
+<!-- rows -->
+</table>
+</body>
+</html>
+'''
+
+def render_report(data: Dict[str, Any], out_dir: str, formats: Iterable[str] = ("svg",)) -> Tuple[str, bool]:
+    """Write the charts in formats plus report.html under out_dir/<hash>/
+
+    Returns (hash, rendered); rendered is False when every file already
+    existed from an earlier run with the same data.
+    """
+    digest = data_hash(data)
+    directory = os.path.join(out_dir, digest)
+    names = [f"{chart}.{fmt}" for fmt in formats for chart in CHARTS] + [REPORT_HTML]
+    missing = [name for name in names if not os.path.exists(os.path.join(directory, name))]
+    if not missing:
+        return digest, False
+
+    os.makedirs(directory, exist_ok=True)
+    svgs = {}  # reused by the HTML report
+    for name in missing:
+        if name == REPORT_HTML:
+            content = render_html(data, svgs).encode()
+        else:
+            chart, fmt = name.split(".")
+            content = render_chart(data, chart, fmt)
+            if fmt == "svg":
+                svgs[chart] = content
+        # Written last, report.html marks the directory as complete
+        atomic_write(os.path.join(directory, name), content)
+    return digest, True
+
+def _render_job(job):
+    """Process pool entry point: (student, path, ...) -> (student, signature, hash, rendered, error)"""
+    student, path, syllabus, out_dir, formats, days = job
+    # Taken before loading, so a write during the load makes the next run reload the file
+    signature = file_signature(path)
+    try:
+        tracker = JEEProgressTracker(path, syllabus=syllabus)
+        try:
+            data = chart_data(tracker, days)
+        finally:
+            if hasattr(tracker.storage, "close"):
+                tracker.storage.close()
+        digest, rendered = render_report(data, out_dir, formats)
+        return student, signature, digest, rendered, None
+    except Exception as e:  # one bad file must not sink the other reports
+        return student, signature, None, False, f"{type(e).__name__}: {e}"
+
+def _load_manifest(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except ValueError:
+        return {}
+    return manifest.get("students", {}) if manifest.get("version") == MANIFEST_VERSION else {}
+
+def _load_latest(out_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(out_dir, LATEST_FILE), "r") as f:
+            latest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return latest if isinstance(latest, dict) else {}
+
+def prune_reports(out_dir: str, keep: Iterable[str] = (), grace: float = REPORT_GRACE) -> int:
+    """Delete report directories nothing refers to any more, returning how many went
+
+    Kept are the hashes in keep, in manifest.json and the latest report of
+    each data file; others only go once unmodified for grace seconds, so a
+    report being rendered or read right now is left alone.
+    """
+    keep = set(keep) | set(_load_latest(out_dir).values())
+    keep.update(entry["hash"] for entry in _load_manifest(os.path.join(out_dir, MANIFEST_FILE)).values())
+    cutoff = time.time() - grace
+    removed = 0
+    for entry in os.scandir(out_dir):
+        # Only directories named like a data_hash are ours to delete
+        if entry.name in keep or len(entry.name) != 20 or entry.name.strip("0123456789abcdef"):
+            continue
+        try:
+            if not entry.is_dir(follow_symlinks=False) or entry.stat().st_mtime > cutoff:
+                continue
+            shutil.rmtree(entry.path)
+            removed += 1
+        except FileNotFoundError:
+            pass  # pruned by another process first
+    return removed
+
+def record_latest(out_dir: str, data_file: str, digest: str) -> int:
+    """Note digest as the newest report of data_file, then prune what that superseded"""
+    key = os.path.abspath(data_file)
+    with FileLock(os.path.join(out_dir, LATEST_FILE + ".lock")).hold():
+        latest = _load_latest(out_dir)
+        if latest.get(key) == digest:
+            return 0
+        latest[key] = digest
+        atomic_write(os.path.join(out_dir, LATEST_FILE), json.dumps(latest, indent=1, sort_keys=True))
+    return prune_reports(out_dir)
+
+def report_file(data: Dict[str, Any], out_dir: str, name: str, formats: Iterable[str], data_file: str) -> bytes:
+    """One output of data's report, rendered if needed and kept as data_file's latest"""
+    digest = data_hash(data)
+    path = os.path.join(out_dir, digest, name)
+    for attempt in range(2):
+        if not os.path.exists(path):
+            render_report(data, out_dir, formats)
+        record_latest(out_dir, data_file, digest)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            if attempt:
+                raise
+            # Another process pruned it as unreferenced just before we claimed it
+
+def render_reports(directory: str, out_dir: str = None, formats: Iterable[str] = ("svg",), syllabus: str = None,
+                   workers: int = None, days: int = TIMELINE_DAYS) -> Dict[str, Any]:
+    """Render a report for every student file in directory, skipping unchanged ones
+
+    Students whose files have the same signature as in the last run are not
+    even loaded; the others are loaded on a process pool and only redrawn if
+    the numbers they show changed. Writes manifest.json and an index.html
+    linking every report.
+    """
+    started = time.perf_counter()
+    out_dir = out_dir or os.path.join(directory, REPORT_DIR)
+    formats = sorted(set(formats))
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_file = os.path.join(out_dir, MANIFEST_FILE)
+    manifest = _load_manifest(manifest_file)
+    files = student_files(directory)
+
+    entries = {}
+    jobs = []
+    for student, path in files.items():
+        entry = manifest.get(student)
+        if (entry and entry["hash"] and entry["path"] == os.path.basename(path) and entry["days"] == days
+                and set(formats) <= set(entry["formats"]) and entry["signature"] == file_signature(path)
+                and os.path.exists(os.path.join(out_dir, entry["hash"], REPORT_HTML))):
+            entries[student] = entry
+            continue
+        jobs.append((student, path, syllabus, out_dir, formats, days))
+
+    if len(jobs) < INLINE_LIMIT or workers == 1:
+        results = map(_render_job, jobs)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        results = executor.map(_render_job, jobs, chunksize=chunksize)
+    rendered = failed = 0
+    try:
+        for student, signature, digest, was_rendered, error in results:
+            rendered += was_rendered
+            failed += error is not None
+            entries[student] = {"path": os.path.basename(files[student]), "signature": signature, "hash": digest,
+                                "formats": formats, "days": days, "error": error}
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if jobs or set(manifest) != set(entries):
+        atomic_write(manifest_file, json.dumps({"version": MANIFEST_VERSION, "students": entries},
+                                               separators=(",", ":")))
+        links = "\n".join(f'<li><a href="{entry["hash"]}/{REPORT_HTML}">{escape(student)}</a></li>' if entry["hash"]
+                          else f'<li>{escape(student)}: {escape(entry["error"])}</li>'
+                          for student, entry in sorted(entries.items()))
+        atomic_write(os.path.join(out_dir, "index.html"),
+                     f'<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="UTF-8"><title>JEE Progress Reports</title></head>\n'
+                     f'<body>\n<h1>JEE Progress Reports</h1>\n<ul>\n{links}\n</ul>\n</body>\n</html>\n')
+        prune_reports(out_dir)
+
+    return {
+        "students": len(files),
+        "rendered": rendered,
+        "unchanged": len(jobs) - rendered - failed,
+        "cached": len(files) - len(jobs),
+        "errors": {student: entry["error"] for student, entry in sorted(entries.items()) if entry["error"]},
+        "reports": {student: entry["hash"] for student, entry in sorted(entries.items()) if entry["hash"]},
+        "out_dir": out_dir,
+        "seconds": time.perf_counter() - started
+    }
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Spaced revision scheduling for JEE Progress Tracker
+Every studied topic gets a next-due time from its confidence, its run of
+successful reviews and when it was last studied. Due times live in a heap,
+so an update costs O(log n) and listing the next k reviews O(k log n).
+"""
+
+import heapq
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+RECALL_CONFIDENCE = 4  # reviews at a lower confidence start the run of reviews over
+FIRST_INTERVALS = (1, 6)  # days until the first and second review, as in SM-2
+MIN_EASE = 1.3  # interval growth per review at confidence 0 ...
+MAX_EASE = 2.8  # ... and at confidence 10
+MAX_INTERVAL = 180  # days
+
+def review_interval(confidence: float, reviews: int) -> float:
+    """Days between the latest review and the next one"""
+    if reviews <= 1 or confidence < RECALL_CONFIDENCE:
+        return FIRST_INTERVALS[0]
+    ease = MIN_EASE + (MAX_EASE - MIN_EASE) * max(0, min(10, confidence)) / 10
+    return min(MAX_INTERVAL, FIRST_INTERVALS[1] * ease ** (reviews - 2))
+
+def next_reviews(previous: int, confidence: float) -> int:
+    """Review count after a study session at the given confidence"""
+    return previous + 1 if confidence >= RECALL_CONFIDENCE else 1
+
+def next_due(entry) -> Optional[datetime]:
+    """When a topic should next be revised, or None if it has never been studied"""
+    if not entry["last_studied"]:
+        return None
+    try:
+        studied = datetime.fromisoformat(entry["last_studied"])
+    except (TypeError, ValueError):
+        return None  # e.g. a malformed date from an import; nothing to schedule from
+    if studied.tzinfo is not None:
+        studied = studied.astimezone().replace(tzinfo=None)
+    # Topics studied before review counts were kept have had at least one review
+    reviews = max(1, entry["reviews"])
+    return studied + timedelta(days=review_interval(entry["confidence"], reviews))
+
+class RevisionQueue:
+    """Min-heap of (due time, topic) over a tracker's data, kept current per change record"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+        self._due = {}  # (subject, chapter, topic) -> (due datetime, counter) of its live heap entry
+        self._heap = []
+        self._counter = 0  # breaks ties in heap order without comparing names
+        for subject, chapters in data["subjects"].items():
+            for chapter, topics in chapters.items():
+                for topic, entry in topics.items():
+                    due = next_due(entry)
+                    if due is not None:
+                        self._due[subject, chapter, topic] = (due, self._counter)
+                        self._heap.append((due, self._counter, subject, chapter, topic))
+                        self._counter += 1
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def record(self, record: Dict[str, Any]):
+        """Reschedule the topic a committed change record touches"""
+        if record["op"] != "topic":
+            return
+        key = (record["subject"], record["chapter"], record["topic"])
+        due = next_due(record["data"])
+        if due is None:
+            self._due.pop(key, None)
+            return
+        # The old heap entry stays behind and is skipped once it surfaces, even with the same due time
+        self._due[key] = (due, self._counter)
+        heapq.heappush(self._heap, (due, self._counter) + key)
+        self._counter += 1
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(due, i) + key for i, (key, (due, _)) in enumerate(self._due.items())]
+        self._due = {item[2:]: item[:2] for item in self._heap}
+        self._counter = len(self._heap)
+        heapq.heapify(self._heap)
+
+    def _take(self, count: int = None, until: datetime = None) -> List[Tuple]:
+        """Pop up to count live entries due no later than until, then push them back"""
+        taken = []
+        heap = self._heap
+        while heap and (count is None or len(taken) < count):
+            item = heap[0]
+            due, counter, subject, chapter, topic = item
+            if self._due.get((subject, chapter, topic)) != (due, counter):
+                heapq.heappop(heap)  # superseded by a later update
+                continue
+            if until is not None and due > until:
+                break
+            taken.append(heapq.heappop(heap))
+        for item in taken:
+            heapq.heappush(heap, item)
+        return taken
+
+    def _describe(self, item: Tuple) -> Dict[str, Any]:
+        due, _, subject, chapter, topic = item
+        entry = self._data["subjects"][subject][chapter][topic]
+        return {
+            "subject": subject,
+            "chapter": chapter,
+            "topic": topic,
+            "due": due.isoformat(timespec="seconds"),
+            "last_studied": entry["last_studied"],
+            "confidence": entry["confidence"],
+            "reviews": entry["reviews"],
+            "status": entry["status"]
+        }
+
+    def due(self, until: datetime = None, limit: int = None) -> List[Dict[str, Any]]:
+        """Topics due by until (default: the end of today), most overdue first"""
+        until = until or datetime.combine(datetime.now().date(), time.max)
+        return [self._describe(item) for item in self._take(limit, until)]
+
+    def upcoming(self, count: int = 10) -> List[Dict[str, Any]]:
+        """The next count reviews, whether or not they are due yet"""
+        return [self._describe(item) for item in self._take(count)]
@@ -0,0 +1,676 @@
+#!/usr/bin/env python3
+"""
+Storage backends for JEE Progress Tracker
+The tracker keeps its data as one nested dict in memory; a storage backend
+loads that dict, persists change records as they are committed and writes
+full snapshots when asked.
+"""
+
+import json
+import marshal
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+from jee_metrics import METRICS
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; locking becomes a no-op
+    fcntl = None
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+BINARY_EXTENSIONS = (".jeeb",)
+
+def new_topic_entry() -> Dict[str, Any]:
+    """Return the default progress entry for a topic"""
+    return {
+        "status": "not_started",  # not_started, in_progress, completed, revision
+        "confidence": 0,  # 1-10 scale
+        "last_studied": None,
+        "time_spent": 0,  # in hours
+        "notes": "",
+        "practice_problems": 0,
+        "problems_solved": 0,
+        "reviews": 0  # successful reviews in a row, for spaced revision
+    }
+
+TOPIC_FIELDS = ("status", "confidence", "last_studied", "time_spent", "notes",
+                "practice_problems", "problems_solved", "reviews")
+_TOPIC_FIELD_SET = frozenset(TOPIC_FIELDS)
+# One shared string per status instead of one per loaded topic
+_STATUSES = {status: status for status in ("not_started", "in_progress", "completed", "revision")}
+
+class Topic(Mapping):
+    """Read-only, slotted topic progress entry that behaves like the dict it replaces
+
+    A slotted record is a fraction of the size of an 8-key dict, and every
+    untouched topic shares the single UNTOUCHED_TOPIC instance. Updates build
+    a new entry from dict(topic) instead of mutating it.
+    """
+
+    __slots__ = TOPIC_FIELDS + ("_extra",)
+
+    def __init__(self, status="not_started", confidence=0, last_studied=None, time_spent=0,
+                 notes="", practice_problems=0, problems_solved=0, reviews=0, extra=None):
+        self.status = _STATUSES.get(status, status)
+        self.confidence = confidence
+        self.last_studied = last_studied
+        self.time_spent = time_spent
+        self.notes = notes
+        self.practice_problems = practice_problems
+        self.problems_solved = problems_solved
+        self.reviews = reviews
+        self._extra = extra or None  # fields added by newer versions, kept for round-tripping
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "Topic":
+        if isinstance(entry, Topic):
+            return entry
+        if entry == _UNTOUCHED_ENTRY or entry == _LEGACY_UNTOUCHED_ENTRY:
+            return UNTOUCHED_TOPIC
+        try:
+            return cls(**entry)
+        except TypeError:
+            # Unknown keys from a newer version are carried along
+            extra = {key: value for key, value in entry.items() if key not in _TOPIC_FIELD_SET}
+            return cls(**{key: value for key, value in entry.items() if key in _TOPIC_FIELD_SET}, extra=extra)
+
+    def __getitem__(self, key: str):
+        if key in _TOPIC_FIELD_SET:
+            return getattr(self, key)
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from TOPIC_FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(TOPIC_FIELDS) + len(self._extra or ())
+
+    def __repr__(self) -> str:
+        return f"Topic({dict(self)!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+UNTOUCHED_TOPIC = Topic()
+_UNTOUCHED_ENTRY = new_topic_entry()
+# Files written before topics had a review count
+_LEGACY_UNTOUCHED_ENTRY = {key: value for key, value in _UNTOUCHED_ENTRY.items() if key != "reviews"}
+
+def json_default(value):
+    """json.dump fallback: topics as plain dicts, anything else as a string"""
+    if isinstance(value, Topic):
+        return value.to_dict()
+    return str(value)
+
+def compact_topics(data: Dict[str, Any]):
+    """Replace the topic dicts of freshly parsed data with Topic records, in place"""
+    for chapters in data["subjects"].values():
+        for topics in chapters.values():
+            for topic, entry in topics.items():
+                topics[topic] = Topic.from_dict(entry)
+
+def new_data() -> Dict[str, Any]:
+    """Return an empty progress data structure"""
+    return {
+        "subjects": {},
+        "daily_logs": {},
+        "target_dates": {},
+        "study_hours": {},
+        "test_scores": [],
+        "history": [],  # progress deltas, see topic_delta
+        "revision": 0
+    }
+
+def topic_delta(subject: str, chapter: str, topic: str, old, new) -> Optional[List[Any]]:
+    """Compact history entry for a topic change, or None if its progress did not change
+
+    [at, subject, chapter, topic, old status, new status, confidence change,
+    time_spent change]. Differences rather than values, so a run of entries
+    can be summed onto any earlier state without looking up the topic.
+    """
+    d_confidence = new["confidence"] - old["confidence"]
+    d_time_spent = new["time_spent"] - old["time_spent"]
+    if old["status"] == new["status"] and not d_confidence and not d_time_spent:
+        return None
+    return [new["last_studied"] or "", subject, chapter, topic, old["status"], new["status"],
+            d_confidence, d_time_spent]
+
+def apply_record(data: Dict[str, Any], record: Dict[str, Any]):
+    """Apply a single change record to a data dict"""
+    op = record["op"]
+    if op == "init":
+        subject_data = data["subjects"].setdefault(record["subject"], {})
+        for chapter, topics in record["chapters"].items():
+            chapter_data = subject_data.setdefault(chapter, {})
+            for topic in topics:
+                if topic not in chapter_data:
+                    chapter_data[topic] = UNTOUCHED_TOPIC
+    elif op == "topic":
+        subject_data = data["subjects"].setdefault(record["subject"], {})
+        chapter_data = subject_data.setdefault(record["chapter"], {})
+        entry = Topic.from_dict(record["data"])
+        delta = topic_delta(record["subject"], record["chapter"], record["topic"],
+                            chapter_data.get(record["topic"], UNTOUCHED_TOPIC), entry)
+        if delta is not None:
+            data.setdefault("history", []).append(delta)
+        chapter_data[record["topic"]] = entry
+    elif op == "log":
+        entry = record["entry"]
+        data["daily_logs"].setdefault(record["date"], []).append(entry)
+        data["study_hours"][entry["subject"]] = data["study_hours"].get(entry["subject"], 0) + entry["hours"]
+    elif op == "test":
+        data["test_scores"].append(record["entry"])
+    else:
+        raise ValueError(f"Unknown journal operation: {op}")
+
+def disk_signature(paths: List[str]) -> tuple:
+    """(inode, mtime, size) per path; changes whenever any of the files is rewritten or appended to"""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+class FileLock:
+    """Advisory lock on a side file, shared by every process using the same data file
+
+    Re-entrant within a process, so a writer holding the exclusive lock can
+    reload the data it protects.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+
+    @contextmanager
+    def hold(self, shared: bool = False):
+        with self._thread_lock:
+            if self._depth or fcntl is None:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+
+            with open(self.path, 'a') as f:
+                fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+def current_umask() -> int:
+    """The process umask; reading it means setting it, so it is restored straight away"""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+def atomic_write(path: str, content):
+    """Write text or bytes to path via a temp file and rename, so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(content, bytes) else 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the old file's mode, or what open() would have used
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~current_umask()
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def open_storage(data_file: str, journal: bool = False, compact_threshold: int = 500):
+    """Pick a storage backend from the data file extension"""
+    if data_file.lower().endswith(SQLITE_EXTENSIONS):
+        return SQLiteStorage(data_file)
+    if data_file.lower().endswith(BINARY_EXTENSIONS):
+        return BinaryStorage(data_file, journal=journal, compact_threshold=compact_threshold)
+    return JSONStorage(data_file, journal=journal, compact_threshold=compact_threshold)
+
+class JSONStorage:
+    """Pretty-printed JSON snapshot with an optional append-only journal"""
+
+    FORMAT = "json"  # label for the byte counters in jee_metrics
+
+    def __init__(self, data_file: str, journal: bool = False, compact_threshold: int = 500):
+        self.data_file = data_file
+        self.journal_file = data_file + ".journal"
+        self.journal = journal  # append change records instead of rewriting the whole file
+        self.compact_threshold = compact_threshold
+        self._journal_entries = 0
+        self._journal_end = None  # offset of a torn final journal line, cut off before the next append
+        self._file_lock = FileLock(data_file + ".lock")
+        self._signature = None  # disk state as of our last load or write
+
+    def paths(self) -> List[str]:
+        """Files whose modification means the data changed on disk"""
+        return [self.data_file, self.journal_file]
+
+    def lock(self):
+        """Exclusive lock around a check-and-write by this process"""
+        return self._file_lock.hold()
+
+    def changed(self) -> bool:
+        """Whether another writer has touched the files since our last load or write"""
+        return disk_signature(self.paths()) != self._signature
+
+    def load(self) -> Dict[str, Any]:
+        """Load progress data from JSON file and replay any journaled changes"""
+        # A shared lock keeps the snapshot and journal consistent with each other
+        with self._file_lock.hold(shared=True):
+            data = None
+            if os.path.exists(self.data_file):
+                try:
+                    data = self._read_snapshot()
+                except ValueError as e:
+                    # Never start over silently; the next save would destroy the file
+                    raise ValueError(f"Data file {self.data_file} is corrupt: {e}") from e
+
+            if data is None:
+                data = new_data()
+            else:
+                compact_topics(data)
+
+            self._replay_journal(data)
+            self._signature = disk_signature(self.paths())
+        if METRICS.enabled:
+            METRICS.inc("jee_storage_bytes_read_total", sum(st[2] for st in self._signature if st),
+                        format=self.FORMAT)
+        return data
+
+    def save(self, data: Dict[str, Any]):
+        """Save progress data to JSON file, folding in the journal"""
+        with self._file_lock.hold():
+            atomic_write(self.data_file, self._dump_snapshot(data))
+
+            # The snapshot now contains every journaled change
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._journal_entries = 0
+            self._journal_end = None
+            self._signature = disk_signature(self.paths())
+        if METRICS.enabled:
+            METRICS.inc("jee_storage_bytes_written_total", self._signature[0][2], format=self.FORMAT)
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        with open(self.data_file, 'r') as f:
+            return json.load(f)
+
+    def _dump_snapshot(self, data: Dict[str, Any]):
+        return json.dumps(data, indent=2, default=json_default)
+
+    def compact(self, data: Dict[str, Any]):
+        """Fold the journal back into the JSON snapshot"""
+        self.save(data)
+
+    def commit(self, data: Dict[str, Any], records: List[Dict[str, Any]]):
+        """Persist change records that have already been applied to data"""
+        if not self.journal or self._journal_entries + len(records) >= self.compact_threshold:
+            # Large batches go straight into a fresh snapshot
+            self.save(data)
+            return
+
+        # Write cost grows with the size of the change, not the history
+        lines = "".join(json.dumps(r, separators=(",", ":"), default=json_default) + "\n" for r in records)
+        with self._file_lock.hold():
+            if self._journal_end is not None:
+                # Records appended after a torn line would never be replayed
+                with open(self.journal_file, 'r+b') as f:
+                    f.truncate(self._journal_end)
+                self._journal_end = None
+            with open(self.journal_file, 'a') as f:
+                f.write(lines)
+            self._journal_entries += len(records)
+            self._signature = disk_signature(self.paths())
+        METRICS.inc("jee_storage_bytes_written_total", len(lines), format=self.FORMAT)
+
+    def _replay_journal(self, data: Dict[str, Any]):
+        """Apply journal records newer than the snapshot revision to data"""
+        self._journal_entries = 0
+        self._journal_end = None
+        if not os.path.exists(self.journal_file):
+            return
+
+        revision = data.get("revision", 0)
+        offset = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write at the end of the journal, dropped by the next commit
+                    self._journal_end = offset
+                    break
+                offset += len(line)
+                self._journal_entries += 1
+
+                # Records already folded into the snapshot are skipped
+                if record["rev"] <= revision:
+                    continue
+                apply_record(data, record)
+                revision = record["rev"]
+        data["revision"] = revision
+
+    def query_logs(self, data: Dict[str, Any], start: str, end: str = None,
+                   subject: str = None) -> List[Dict[str, Any]]:
+        """Return study log entries dated start..end (inclusive), oldest first"""
+        logs = []
+        for log_date in sorted(data["daily_logs"]):
+            if log_date < start or (end is not None and log_date > end):
+                continue
+            for entry in data["daily_logs"][log_date]:
+                if subject is None or entry["subject"] == subject:
+                    logs.append(dict(entry, date=log_date))
+        return logs
+
+    def query_tests(self, data: Dict[str, Any], subject: str = None) -> List[Dict[str, Any]]:
+        """Return test scores, optionally for one subject, sorted by date"""
+        tests = [t for t in data["test_scores"] if subject is None or t["subject"] == subject]
+        return sorted(tests, key=lambda x: x["date"])
+
+def _share_strings(obj, memo: Dict[str, str]):
+    """JSON-typed copy of a value where equal strings are one object, so marshal stores them once
+
+    Converts what the JSON backend would on the way: topics become dicts,
+    tuples lists, non-string keys their JSON text, other values (dates)
+    strings as in json_default.
+    """
+    if isinstance(obj, str):
+        return memo.setdefault(obj, obj)
+    if isinstance(obj, Mapping):
+        return {_share_strings(key if isinstance(key, str) else json.dumps(key), memo): _share_strings(value, memo)
+                for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_share_strings(value, memo) for value in obj]
+    if obj is None or isinstance(obj, (bool, int, float)):
+        return obj
+    return _share_strings(str(obj), memo)
+
+class BinaryStorage(JSONStorage):
+    """Compact marshal snapshot with the same journal, locking and atomic writes as JSONStorage
+
+    Every distinct string (keys, statuses, subject names, dates) is written
+    once and referenced afterwards, so repeated keys and statuses cost a few
+    bytes each and loading needs no decoding step after marshal.loads.
+    """
+
+    MAGIC = b"JEEB\x01"
+    FORMAT = "jeeb"
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        with open(self.data_file, 'rb') as f:
+            blob = f.read()
+        if not blob.startswith(self.MAGIC):
+            raise ValueError("not a JEE binary snapshot")
+        try:
+            data = marshal.loads(blob[len(self.MAGIC):])
+        except (EOFError, TypeError) as e:
+            raise ValueError(str(e)) from e
+        if not isinstance(data, dict):
+            raise ValueError("not a JEE binary snapshot")
+        return data
+
+    def _dump_snapshot(self, data: Dict[str, Any]) -> bytes:
+        return self.MAGIC + marshal.dumps(_share_strings(data, {}))
+
+class SQLiteStorage:
+    """SQLite database with one row per topic, study log and test score"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS topics (
+            subject TEXT NOT NULL,
+            chapter TEXT NOT NULL,
+            topic TEXT NOT NULL,
+            status TEXT NOT NULL,
+            confidence INTEGER NOT NULL,
+            last_studied TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (subject, chapter, topic)
+        );
+        CREATE INDEX IF NOT EXISTS idx_topics_status ON topics (subject, status);
+        CREATE TABLE IF NOT EXISTS daily_logs (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            hours REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_daily_logs_date ON daily_logs (date);
+        CREATE INDEX IF NOT EXISTS idx_daily_logs_subject ON daily_logs (subject, date);
+        CREATE TABLE IF NOT EXISTS test_scores (
+            id INTEGER PRIMARY KEY,
+            subject TEXT NOT NULL,
+            date TEXT NOT NULL,
+            percentage REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_test_scores_date ON test_scores (date);
+        CREATE INDEX IF NOT EXISTS idx_test_scores_subject ON test_scores (subject, date);
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY,
+            at TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            chapter TEXT NOT NULL,
+            topic TEXT NOT NULL,
+            old_status TEXT NOT NULL,
+            new_status TEXT NOT NULL,
+            confidence NUMERIC NOT NULL,
+            time_spent NUMERIC NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    META_KEYS = ("target_dates", "study_hours", "revision")
+
+    def __init__(self, db_file: str):
+        self.data_file = db_file
+        # The web server shares one tracker across threads behind its own lock
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        # WAL lets readers (the web interface) proceed while the CLI writes
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._file_lock = FileLock(db_file + ".lock")
+        self._revision = None  # revision as of our last load or write
+        self._history_rows = 0  # entries of data["history"] already in the history table
+
+    def paths(self) -> List[str]:
+        """Files whose modification means the data changed on disk"""
+        return [self.data_file, self.data_file + "-wal"]
+
+    def lock(self):
+        """Exclusive lock around a check-and-write by this process"""
+        return self._file_lock.hold()
+
+    def changed(self) -> bool:
+        """Whether another writer has committed since our last load or write"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return (json.loads(row[0]) if row else 0) != self._revision
+
+    def close(self):
+        self.conn.close()
+
+    def load(self) -> Dict[str, Any]:
+        """Build the in-memory data dict from the database tables"""
+        data = new_data()
+        # One read transaction, so every table is read from the same snapshot
+        with self.conn:
+            self.conn.execute("BEGIN")
+            for key, value in self.conn.execute("SELECT key, value FROM meta"):
+                data[key] = json.loads(value)
+
+            for subject, chapter, topic, entry in self.conn.execute(
+                    "SELECT subject, chapter, topic, data FROM topics ORDER BY rowid"):
+                data["subjects"].setdefault(subject, {}).setdefault(chapter, {})[topic] = Topic.from_dict(json.loads(entry))
+
+            for log_date, entry in self.conn.execute("SELECT date, data FROM daily_logs ORDER BY id"):
+                data["daily_logs"].setdefault(log_date, []).append(json.loads(entry))
+
+            data["test_scores"] = [json.loads(entry) for (entry,) in
+                                   self.conn.execute("SELECT data FROM test_scores ORDER BY id")]
+            data["history"] = [list(row) for row in self.conn.execute(
+                "SELECT at, subject, chapter, topic, old_status, new_status, confidence, time_spent "
+                "FROM history ORDER BY id")]
+        self._revision = data.get("revision", 0)
+        self._history_rows = len(data["history"])
+        return data
+
+    def save(self, data: Dict[str, Any]):
+        """Replace the database contents with a full snapshot of data"""
+        with self.conn:
+            self.conn.execute("DELETE FROM topics")
+            self.conn.execute("DELETE FROM daily_logs")
+            self.conn.execute("DELETE FROM test_scores")
+            self.conn.execute("DELETE FROM history")
+            self.conn.execute("DELETE FROM meta")
+            for subject, chapters in data["subjects"].items():
+                for chapter, topics in chapters.items():
+                    for topic, entry in topics.items():
+                        self._upsert_topic(subject, chapter, topic, entry)
+            for log_date, entries in data["daily_logs"].items():
+                for entry in entries:
+                    self._insert_log(log_date, entry)
+            for entry in data["test_scores"]:
+                self._insert_test(entry)
+            self._history_rows = 0
+            self._insert_history(data)
+            self._write_meta(data)
+
+    def compact(self, data: Dict[str, Any]):
+        """Checkpoint the write-ahead log into the main database file"""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def commit(self, data: Dict[str, Any], records: List[Dict[str, Any]]):
+        """Write the rows touched by change records in one transaction"""
+        with self.conn:
+            for record in records:
+                op = record["op"]
+                if op == "init":
+                    subject = record["subject"]
+                    for chapter, topics in record["chapters"].items():
+                        for topic in topics:
+                            entry = data["subjects"][subject][chapter][topic]
+                            self._upsert_topic(subject, chapter, topic, entry, replace=False)
+                elif op == "topic":
+                    self._upsert_topic(record["subject"], record["chapter"], record["topic"], record["data"])
+                elif op == "log":
+                    self._insert_log(record["date"], record["entry"])
+                elif op == "test":
+                    self._insert_test(record["entry"])
+            # apply_record appended a history entry for every topic change in records
+            self._insert_history(data)
+            self._write_meta(data)
+
+    def _upsert_topic(self, subject: str, chapter: str, topic: str, entry: Dict[str, Any],
+                      replace: bool = True):
+        # ON CONFLICT keeps the rowid, so topics reload in their original order
+        conflict = ("DO UPDATE SET status = excluded.status, confidence = excluded.confidence, "
+                    "last_studied = excluded.last_studied, data = excluded.data") if replace else "DO NOTHING"
+        self.conn.execute(
+            "INSERT INTO topics (subject, chapter, topic, status, confidence, last_studied, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (subject, chapter, topic) " + conflict,
+            (subject, chapter, topic, entry["status"], entry["confidence"], entry["last_studied"],
+             json.dumps(entry, default=json_default))
+        )
+
+    def _insert_log(self, log_date: str, entry: Dict[str, Any]):
+        self.conn.execute(
+            "INSERT INTO daily_logs (date, subject, hours, data) VALUES (?, ?, ?, ?)",
+            (log_date, entry["subject"], entry["hours"], json.dumps(entry, default=str))
+        )
+
+    def _insert_test(self, entry: Dict[str, Any]):
+        self.conn.execute(
+            "INSERT INTO test_scores (subject, date, percentage, data) VALUES (?, ?, ?, ?)",
+            (entry["subject"], entry["date"], entry["percentage"], json.dumps(entry, default=str))
+        )
+
+    def _insert_history(self, data: Dict[str, Any]):
+        history = data.get("history", [])
+        self.conn.executemany(
+            "INSERT INTO history (at, subject, chapter, topic, old_status, new_status, confidence, time_spent) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", history[self._history_rows:]
+        )
+        self._history_rows = len(history)
+
+    def _write_meta(self, data: Dict[str, Any]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, json.dumps(data.get(key), default=str)) for key in self.META_KEYS]
+        )
+        self._revision = data.get("revision", 0)
+
+    def query_logs(self, data: Dict[str, Any], start: str, end: str = None,
+                   subject: str = None) -> List[Dict[str, Any]]:
+        """Return study log entries dated start..end (inclusive), oldest first"""
+        sql = "SELECT date, data FROM daily_logs WHERE date >= ?"
+        params = [start]
+        if end is not None:
+            sql += " AND date <= ?"
+            params.append(end)
+        if subject is not None:
+            sql += " AND subject = ?"
+            params.append(subject)
+        sql += " ORDER BY date, id"
+        return [dict(json.loads(entry), date=log_date) for log_date, entry in self.conn.execute(sql, params)]
+
+    def query_tests(self, data: Dict[str, Any], subject: str = None) -> List[Dict[str, Any]]:
+        """Return test scores, optionally for one subject, sorted by date"""
+        if subject is None:
+            rows = self.conn.execute("SELECT data FROM test_scores ORDER BY date, id")
+        else:
+            rows = self.conn.execute("SELECT data FROM test_scores WHERE subject = ? ORDER BY date, id", (subject,))
+        return [json.loads(entry) for (entry,) in rows]
+
+def migrate_json_to_sqlite(json_file: str, db_file: str) -> Dict[str, int]:
+    """One-shot copy of a JSON data file (and its journal) into a SQLite database"""
+    return convert_storage(json_file, db_file)
+
+def convert_storage(source_file: str, target_file: str) -> Dict[str, int]:
+    """Copy data between any two backends, chosen by file extension (.json, .jeeb, .db)"""
+    source = open_storage(source_file)
+    data = source.load()
+    if hasattr(source, "close"):
+        source.close()
+
+    target = open_storage(target_file)
+    try:
+        target.save(data)
+    finally:
+        if hasattr(target, "close"):
+            target.close()
+
+    return {
+        "topics": sum(len(topics) for chapters in data["subjects"].values() for topics in chapters.values()),
+        "daily_logs": sum(len(entries) for entries in data["daily_logs"].values()),
+        "test_scores": len(data["test_scores"])
+    }
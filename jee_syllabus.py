@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Syllabus definitions and lookup tables for JEE Progress Tracker
+A syllabus (built in, or loaded from a JSON file of subject -> chapter ->
+topics) is compiled once per process into an immutable index with O(1)
+maps from topic names to their subject and chapter, node ids with parent
+links, and a word-prefix trie for autocomplete.
+"""
+
+import json
+import os
+import re
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Any
+
+# JEE syllabus structure, shared by every tracker
+JEE_SYLLABUS = {
+    "Physics": {
+        "Mechanics": ["Kinematics", "Laws of Motion", "Work Energy Power", "Rotational Motion", "Gravitation"],
+        "Thermodynamics": ["Heat Transfer", "Laws of Thermodynamics", "Kinetic Theory"],
+        "Waves & Oscillations": ["SHM", "Wave Motion", "Sound Waves"],
+        "Electromagnetism": ["Electrostatics", "Current Electricity", "Magnetic Effects", "Electromagnetic Induction", "AC Circuits"],
+        "Optics": ["Ray Optics", "Wave Optics"],
+        "Modern Physics": ["Atomic Structure", "Nuclear Physics", "Dual Nature of Matter"]
+    },
+    "Chemistry": {
+        "Physical Chemistry": ["Atomic Structure", "Chemical Bonding", "Thermodynamics", "Chemical Equilibrium", "Ionic Equilibrium", "Electrochemistry", "Chemical Kinetics"],
+        "Inorganic Chemistry": ["Periodic Table", "s-Block", "p-Block", "d-Block", "f-Block", "Coordination Compounds"],
+        "Organic Chemistry": ["Hydrocarbons", "Functional Groups", "Biomolecules", "Polymers", "Organic Reactions"]
+    },
+    "Mathematics": {
+        "Algebra": ["Quadratic Equations", "Complex Numbers", "Sequences & Series", "Permutations & Combinations", "Binomial Theorem", "Matrices & Determinants"],
+        "Coordinate Geometry": ["Straight Lines", "Circles", "Parabola", "Ellipse", "Hyperbola"],
+        "Calculus": ["Limits", "Derivatives", "Applications of Derivatives", "Integrals", "Applications of Integrals", "Differential Equations"],
+        "Trigonometry": ["Ratios & Functions", "Identities", "Equations", "Inverse Functions"],
+        "Vectors & 3D": ["Vector Algebra", "3D Geometry"],
+        "Statistics & Probability": ["Statistics", "Probability"]
+    }
+}
+
+def normalize(name: str) -> str:
+    """Lower-case words only, so "s-Block" and "S Block" compare equal"""
+    return " ".join(re.findall(r"[a-z0-9]+", name.lower()))
+
+class NameTrie:
+    """Prefix tree over words; each trie node keeps the ids of names with a word starting there"""
+
+    __slots__ = ("_root",)
+    MAX_POSTINGS = 1000  # per prefix, so one-letter prefixes stay cheap on huge syllabi
+
+    def __init__(self, words: Dict[str, List[int]], rank: List[int]):
+        """Build from word -> ids; postings end up ordered by rank[id]"""
+        self._root = {}
+        for word, ids in words.items():
+            node = self._root
+            for char in word:
+                node = node.setdefault(char, {})
+                # Postings live under the empty key, which can never be a character
+                node.setdefault("", []).extend(ids)
+        self._finish(self._root, rank.__getitem__)
+
+    def _finish(self, node: Dict[str, Any], rank):
+        for char, child in node.items():
+            if char == "":
+                node[""] = tuple(sorted(set(child), key=rank)[:self.MAX_POSTINGS])
+            else:
+                self._finish(child, rank)
+
+    def prefix(self, prefix: str) -> Tuple[int, ...]:
+        """Ids of names with a word starting with prefix, best-ranked first"""
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return ()
+        return node.get("", ())
+
+class SyllabusIndex:
+    """Read-only lookup tables for one syllabus, built once and shared by every tracker"""
+
+    __slots__ = ("tree", "nodes", "topics", "topic_ids", "chapter_topics", "subject_topics",
+                 "_by_name", "_by_word", "_node_words", "_rank", "_first_word_trie", "_word_trie")
+
+    def __init__(self, syllabus: Dict[str, Dict[str, List[str]]]):
+        nodes = []  # node id -> (kind, name, parent node id)
+        topics = []  # topic id -> (subject, chapter, topic)
+        topic_ids = {}  # (subject, chapter, topic) -> topic id
+        chapter_topics = {}  # (subject, chapter) -> topic ids
+        subject_topics = {}  # subject -> topic ids
+        by_name = {}  # normalized topic name -> topic ids
+        by_word = {}  # word of a topic name -> topic ids
+
+        def add_node(kind, name, parent):
+            nodes.append((kind, name, parent))
+            return len(nodes) - 1
+
+        for subject, chapters in syllabus.items():
+            subject_node = add_node("subject", subject, None)
+            for chapter, names in chapters.items():
+                chapter_node = add_node("chapter", chapter, subject_node)
+                ids = []
+                for topic in names:
+                    add_node("topic", topic, chapter_node)
+                    topic_id = len(topics)
+                    topics.append((subject, chapter, topic))
+                    topic_ids[(subject, chapter, topic)] = topic_id
+                    ids.append(topic_id)
+                    key = normalize(topic)
+                    by_name.setdefault(key, []).append(topic_id)
+                    for word in set(key.split()):
+                        by_word.setdefault(word, []).append(topic_id)
+                chapter_topics[(subject, chapter)] = tuple(ids)
+                subject_topics.setdefault(subject, []).extend(ids)
+
+        # Read-only view shared by every tracker; a caller mutating it would corrupt the lookup tables
+        self.tree = MappingProxyType({
+            subject: MappingProxyType({chapter: tuple(names) for chapter, names in chapters.items()})
+            for subject, chapters in syllabus.items()})
+        self.nodes = tuple(nodes)
+        self._node_words = tuple(tuple(normalize(name).split()) for _, name, _ in nodes)
+
+        # Subjects rank before chapters before topics, then syllabus order
+        depth = {"subject": 0, "chapter": 1, "topic": 2}
+        order = sorted(range(len(nodes)), key=lambda node_id: (depth[nodes[node_id][0]], node_id))
+        self._rank = [0] * len(nodes)
+        for position, node_id in enumerate(order):
+            self._rank[node_id] = position
+
+        first_words, all_words = {}, {}
+        for node_id, words in enumerate(self._node_words):
+            if words:
+                first_words.setdefault(words[0], []).append(node_id)
+            for word in set(words):
+                all_words.setdefault(word, []).append(node_id)
+        self._first_word_trie = NameTrie(first_words, self._rank)
+        self._word_trie = NameTrie(all_words, self._rank)
+        self.topics = tuple(topics)
+        self.topic_ids = topic_ids
+        self.chapter_topics = chapter_topics
+        self.subject_topics = {subject: tuple(ids) for subject, ids in subject_topics.items()}
+        self._by_name = {key: tuple(ids) for key, ids in by_name.items()}
+        self._by_word = {word: frozenset(ids) for word, ids in by_word.items()}
+
+    def __contains__(self, key: Tuple[str, str, str]) -> bool:
+        return key in self.topic_ids
+
+    def path(self, node_id: int) -> List[str]:
+        """Names from the subject down to the node, following parent links"""
+        names = []
+        while node_id is not None:
+            _, name, node_id = self.nodes[node_id]
+            names.append(name)
+        return names[::-1]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Subjects, chapters and topics with a word starting with each query word
+
+        Names whose first word matches the first query word come first; within
+        each group subjects precede chapters, which precede topics.
+        """
+        words = normalize(query).split()
+        if not words:
+            return []
+
+        postings = [self._word_trie.prefix(word) for word in words]
+        if len(words) == 1:
+            allowed = None
+            rest = postings[0]
+        else:
+            # Set intersection runs in C, so long postings lists stay cheap
+            allowed = set(min(postings, key=len))
+            for ids in postings:
+                allowed.intersection_update(ids)
+            rest = sorted(allowed, key=self._rank.__getitem__)
+
+        matches, found = [], set()
+        for source in (self._first_word_trie.prefix(words[0]), rest):
+            for node_id in source:
+                if node_id in found or (allowed is not None and node_id not in allowed):
+                    continue
+                found.add(node_id)
+                matches.append(node_id)
+                if len(matches) == limit:
+                    break
+            if len(matches) == limit:
+                break
+
+        return [{"id": node_id, "type": self.nodes[node_id][0], "name": self.nodes[node_id][1],
+                 "parent": self.nodes[node_id][2], "path": self.path(node_id)}
+                for node_id in matches]
+
+    def locate(self, topic: str, subject: str = None) -> List[Tuple[str, str, str]]:
+        """(subject, chapter, topic) for every topic whose name matches, ignoring case and punctuation"""
+        ids = self._by_name.get(normalize(topic), ())
+        return [self.topics[i] for i in ids if subject is None or self.topics[i][0] == subject]
+
+    def resolve(self, name: str, subject: str = None, chapter: str = None) -> Optional[Tuple[str, str, str]]:
+        """The one topic a free-text name refers to, or None if there is no unique match
+
+        Tries the whole name first, then topics containing every word of it.
+        A chapter, if given, must match too (ignoring case and punctuation).
+        """
+        chapter_key = normalize(chapter) if chapter else None
+
+        def wanted(topic_id):
+            found_subject, found_chapter, _ = self.topics[topic_id]
+            return ((subject is None or found_subject == subject)
+                    and (chapter_key is None or normalize(found_chapter) == chapter_key))
+
+        matches = [i for i in self._by_name.get(normalize(name), ()) if wanted(i)]
+        if not matches:
+            words = normalize(name).split()
+            if not words:
+                return None
+            ids = set(self._by_word.get(words[0], ()))
+            for word in words[1:]:
+                ids &= self._by_word.get(word, frozenset())
+            matches = [i for i in sorted(ids) if wanted(i)]
+        return self.topics[matches[0]] if len(matches) == 1 else None
+
+JEE_INDEX = SyllabusIndex(JEE_SYLLABUS)
+
+_loaded = {}  # absolute path -> (mtime_ns, SyllabusIndex)
+_loaded_lock = threading.Lock()
+
+def load_syllabus(path: str) -> SyllabusIndex:
+    """Compile a JSON syllabus file ({subject: {chapter: [topics]}}), once per file version"""
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    with _loaded_lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'r') as f:
+            syllabus = json.load(f)
+        if not isinstance(syllabus, dict) or not all(
+                isinstance(chapters, dict) and all(isinstance(topics, list) and all(isinstance(t, str) for t in topics)
+                                                   for topics in chapters.values())
+                for chapters in syllabus.values()):
+            raise ValueError(f"{path} is not a syllabus: expected {{subject: {{chapter: [topics]}}}}")
+
+        index = SyllabusIndex(syllabus)
+        _loaded[path] = (mtime, index)
+        return index
@@ -20,7 +20,8 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/jee-progress-tracker",
-    py_modules=["jee_tracker"],
+    py_modules=["jee_tracker", "jee_storage", "jee_analytics", "jee_frames", "jee_syllabus", "jee_metrics", "jee_cohort", "jee_revision",
+                "jee_client", "jee_daemon", "jee_history", "jee_reports"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Education",
@@ -34,9 +35,14 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "analysis": ["pandas>=1.3.0", "numpy>=1.20.0"],
+        "parquet": ["pandas>=1.3.0", "numpy>=1.20.0", "pyarrow>=8.0.0"],
+        "charts": ["matplotlib>=3.5.0"],
+    },
     entry_points={
         "console_scripts": [
-            "jee-tracker=jee_tracker:main",
+            "jee-tracker=jee_client:main",
         ],
     },
     keywords="jee, education, progress-tracking, exam-preparation, study-planner",
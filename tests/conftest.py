@@ -0,0 +1,16 @@
+"""Make the tracker modules importable; the main module lives in the 'Main app' script"""
+
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+if "jee_tracker" not in sys.modules:
+    _loader = importlib.machinery.SourceFileLoader("jee_tracker", os.path.join(ROOT, "Main app"))
+    _module = importlib.util.module_from_spec(importlib.util.spec_from_loader("jee_tracker", _loader))
+    sys.modules["jee_tracker"] = _module
+    _loader.exec_module(_module)
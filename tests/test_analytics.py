@@ -0,0 +1,41 @@
+import pytest
+
+from jee_analytics import StudyAnalytics
+from jee_tracker import JEEProgressTracker
+
+TODAY = "2024-03-01"
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    tracker.log_daily_study("Physics", 2, [], log_date="2024-02-10")
+    tracker.log_daily_study("Chemistry", 1.5, [], log_date="2024-02-12")
+    tracker.add_test_score("Mock 1", "Physics", 60, 120, "2024-02-11")
+    tracker.analytics().summary(0, TODAY)  # memoize everything before the updates below
+    return tracker
+
+
+def test_incremental_analytics_match_a_rebuild_after_back_dated_logs(tracker):
+    for log_date, subject, hours in [("2024-02-20", "Physics", 1.25),   # extends the range forward
+                                     ("2024-01-15", "Mathematics", 3),  # back-dated before the first log
+                                     ("2024-02-11", "Physics", 0.5),    # fills a gap
+                                     ("2024-02-10", "Chemistry", 0.75)]:  # adds to an existing day
+        tracker.log_daily_study(subject, hours, [], log_date=log_date)
+        assert tracker.analytics().summary(0, TODAY) == StudyAnalytics(tracker.data).summary(0, TODAY)
+
+    tracker.add_test_score("Mock 0", "Physics", 30, 120, "2024-01-20")  # back-dated test
+    assert tracker.analytics().summary(0, TODAY) == StudyAnalytics(tracker.data).summary(0, TODAY)
+    assert tracker.analytics().summary(0, TODAY)["score_trends"]["Physics"]["latest"] == 50
+
+
+def test_summary_is_a_copy(tracker):
+    summary = tracker.analytics().summary(0, TODAY)
+    expected = StudyAnalytics(tracker.data).summary(0, TODAY)
+    for totals in summary["weekly_totals"].values():
+        totals["total"] = -1
+    summary["monthly_totals"].clear()
+    summary["score_trends"]["Physics"]["moving_average_3"].append(0)
+    for averages in summary["moving_average_7d"].values():
+        averages.clear()
+    assert tracker.analytics().summary(0, TODAY) == expected
@@ -0,0 +1,53 @@
+import marshal
+import os
+import socket
+import threading
+
+import pytest
+
+import jee_client
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+def _serve_once(server, reply):
+    connection, _ = server.accept()
+    with connection:
+        while connection.recv(65536):
+            pass
+        connection.sendall(marshal.dumps(reply))
+
+
+def _listen(path, mode):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    os.chmod(path, mode)
+    server.listen(1)
+    return server
+
+
+def test_private_socket_is_used(tmp_path):
+    path = str(tmp_path / "daemon.sock")
+    with _listen(path, 0o600) as server:
+        thread = threading.Thread(target=_serve_once, args=(server, {"stdout": "ok", "stderr": "", "status": 0}))
+        thread.start()
+        assert jee_client.send_request({"ping": True}, path, timeout=5)["stdout"] == "ok"
+        thread.join()
+
+
+def test_socket_others_can_use_is_ignored(tmp_path, capsys):
+    path = str(tmp_path / "daemon.sock")
+    with _listen(path, 0o666):
+        assert jee_client.send_request({"ping": True}, path, timeout=5) is None
+    assert "not a private socket" in capsys.readouterr().err
+
+
+def test_regular_file_is_ignored(tmp_path):
+    path = tmp_path / "daemon.sock"
+    path.write_bytes(marshal.dumps({"stdout": "", "stderr": "", "status": 0}))
+    os.chmod(path, 0o600)
+    assert jee_client.send_request({"ping": True}, str(path)) is None
+
+
+def test_missing_socket(tmp_path):
+    assert jee_client.send_request({"ping": True}, str(tmp_path / "none.sock")) is None
@@ -0,0 +1,53 @@
+import json
+import os
+
+import jee_cohort
+from jee_cohort import CACHE_FILE, cohort_report
+from jee_tracker import JEEProgressTracker
+
+
+def _students(directory, count):
+    for i in range(count):
+        tracker = JEEProgressTracker(str(directory / f"s{i}.json"))
+        tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", "completed", confidence=i + 1)
+
+
+def _touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_cohort_cache_reloads_only_changed_files(tmp_path):
+    _students(tmp_path, 3)
+    first = cohort_report(str(tmp_path))
+    assert (first["loaded"], first["cached"]) == (3, 0)
+
+    again = cohort_report(str(tmp_path))
+    assert (again["loaded"], again["cached"]) == (0, 3)
+    assert again["rankings"] == first["rankings"]
+
+    JEEProgressTracker(str(tmp_path / "s0.json")).update_topic_progress(
+        "Physics", "Mechanics", "Kinematics", "completed", confidence=10)
+    changed = cohort_report(str(tmp_path))
+    assert (changed["loaded"], changed["cached"]) == (1, 2)
+    assert changed["rankings"]["overall"][0]["student"] == "s0"
+
+
+def test_content_is_hashed_only_with_verify_hash(tmp_path, monkeypatch):
+    _students(tmp_path, 2)
+    hashed = []
+    content_hash = jee_cohort._content_hash
+    monkeypatch.setattr(jee_cohort, "_content_hash", lambda path: hashed.append(path) or content_hash(path))
+
+    cohort_report(str(tmp_path))
+    assert hashed == []
+    with open(tmp_path / CACHE_FILE) as f:
+        assert all(entry["hash"] is None for entry in json.load(f)["students"].values())
+
+    # Entries cached without a hash are reloaded once; after that a touch alone is served from the cache
+    _touch(tmp_path / "s0.json")
+    report = cohort_report(str(tmp_path), verify_hash=True)
+    assert (report["loaded"], report["cached"]) == (1, 1)
+    _touch(tmp_path / "s0.json")
+    report = cohort_report(str(tmp_path), verify_hash=True)
+    assert (report["loaded"], report["cached"]) == (0, 2)
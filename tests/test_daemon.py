@@ -0,0 +1,60 @@
+import socket
+import sqlite3
+import threading
+
+import pytest
+
+import jee_daemon
+from jee_client import send_request
+from jee_tracker import JEEProgressTracker
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """A daemon serving on a socket in tmp_path; yields (socket path, server)"""
+    path = str(tmp_path / "daemon.sock")
+    server = jee_daemon._bind(path, 0)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield path, server
+    send_request({"stop": True}, path, timeout=5)
+    thread.join(5)
+    server.server_close()
+
+
+def test_daemon_runs_forwarded_commands(daemon, tmp_path):
+    path, server = daemon
+    assert send_request({"ping": True}, path, timeout=5)["status"] == 0
+
+    argv = ["--data-file", "progress.json", "--subject", "Physics", "--chapter", "Mechanics",
+            "--topic", "Kinematics", "--status", "completed"]
+    reply = send_request({"argv": argv, "cwd": str(tmp_path)}, path, timeout=10)
+    assert reply["status"] == 0 and "Updated progress" in reply["stdout"]
+    assert len(server.trackers) == 1
+
+    # A write by another process is picked up by the cached tracker
+    JEEProgressTracker(str(tmp_path / "progress.json")).log_daily_study("Physics", 2, [], log_date="2024-01-05")
+    reply = send_request({"argv": ["--data-file", "progress.json", "revisions", "--next", "5"],
+                          "cwd": str(tmp_path)}, path, timeout=10)
+    assert reply["status"] == 0 and "Kinematics" in reply["stdout"]
+    assert "2024-01-05" in next(iter(server.trackers.values())).data["daily_logs"]
+
+    reply = send_request({"argv": ["--no-such-option"], "cwd": str(tmp_path)}, path, timeout=10)
+    assert reply["status"] == 2 and "--no-such-option" in reply["stderr"]
+
+
+def test_failed_command_closes_cached_storage(daemon, tmp_path):
+    path, server = daemon
+    reply = send_request({"argv": ["--data-file", "progress.db", "--dashboard"], "cwd": str(tmp_path)},
+                         path, timeout=10)
+    assert reply["status"] == 0
+    tracker = next(iter(server.trackers.values()))
+
+    reply = send_request({"argv": ["--data-file", "progress.db", "import", "missing.csv"], "cwd": str(tmp_path)},
+                         path, timeout=10)
+    assert reply["status"] == 1 and "missing.csv" in reply["stderr"]
+    assert not server.trackers
+    with pytest.raises(sqlite3.ProgrammingError):
+        tracker.storage.conn.execute("SELECT 1")
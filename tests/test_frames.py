@@ -0,0 +1,34 @@
+import warnings
+
+import pytest
+
+pytest.importorskip("pandas")
+
+import jee_frames
+from jee_storage import new_data
+from jee_tracker import JEEProgressTracker, main
+
+
+def test_summary_frames_without_tests_or_topics():
+    frames = jee_frames.to_frames(new_data())
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        summary = jee_frames.summary_frames(frames)
+    assert summary["score_percentiles"].empty
+    assert list(summary["score_percentiles"].columns) == ["subject", "p25", "p50", "p75", "p90"]
+
+
+def test_score_percentiles_per_subject(tmp_path):
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    for score in (60, 80, 100):
+        tracker.add_test_score("Mock", "Physics", score, 100, "2024-01-05")
+    table = jee_frames.score_percentiles(jee_frames.to_frames(tracker.data)["tests"])
+    assert table.loc["Physics", "p50"] == 80
+
+
+@pytest.mark.filterwarnings("error")
+def test_export_without_tests(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    JEEProgressTracker(data_file).update_topic_progress("Physics", "Mechanics", "Kinematics", confidence=5)
+    main(["--data-file", data_file, "export", str(tmp_path / "out")])
+    assert (tmp_path / "out" / "score_percentiles.csv").exists()
@@ -0,0 +1,76 @@
+from jee_tracker import JEEProgressTracker, main
+
+CSV = """type,subject,chapter,topic,status,confidence,time_spent,hours,topics,date,test_name,score,max_score
+log,Physics,,,,,,2,Kinematics;Laws of Motion,2024-01-05,,,
+topic,Physics,Mechanics,Kinematics,completed,8,1.5,,,,,,
+topic,Physics,Mechanics,No Such Topic,completed,,,,,,,,
+test,Physics,,,,,,,,2024-01-06,Mock 1,90,120
+test,Physics,,,,,,,,2024-01-07,Mock 2,90,0
+"""
+
+
+def test_apply_batch_reports_each_operation(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    tracker = JEEProgressTracker(data_file, journal=True)
+    results = tracker.apply_batch([
+        {"type": "log", "subject": "Physics", "hours": "1.5", "topics": "Kinematics", "date": "2024-01-05"},
+        {"type": "topic", "subject": "Physics", "chapter": "Mechanics", "topic": "Kinematics", "confidence": "6"},
+        {"type": "quiz"},
+        {"type": "test", "subject": "Physics", "test_name": "Mock 1"},
+    ])
+    assert [r["status"] for r in results] == ["success", "success", "error", "error"]
+
+    reloaded = JEEProgressTracker(data_file, journal=True)
+    assert reloaded.data == tracker.data
+    assert reloaded.data["subjects"]["Physics"]["Mechanics"]["Kinematics"]["confidence"] == 6
+    assert reloaded.data["test_scores"] == []
+
+
+def test_import_command(tmp_path, capsys):
+    data_file = str(tmp_path / "progress.json")
+    operations = tmp_path / "operations.csv"
+    operations.write_text(CSV)
+
+    main(["--data-file", data_file, "import", str(operations)])
+    output = capsys.readouterr().out
+    assert "Imported 3 of 5 records" in output
+    assert "Record 3" in output and "Record 5" in output
+
+    tracker = JEEProgressTracker(data_file)
+    assert tracker.data["daily_logs"]["2024-01-05"][0]["topics"] == ["Kinematics", "Laws of Motion"]
+    assert tracker.data["subjects"]["Physics"]["Mechanics"]["Kinematics"]["status"] == "completed"
+    assert [t["test_name"] for t in tracker.data["test_scores"]] == ["Mock 1"]
+
+
+def test_malformed_dates_are_rejected_before_saving(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    tracker = JEEProgressTracker(data_file)
+    results = tracker.apply_batch([
+        {"type": "log", "subject": "Physics", "hours": 2, "date": "2024/01/05"},
+        {"type": "topic", "subject": "Physics", "chapter": "Mechanics", "topic": "Kinematics",
+         "status": "completed", "studied_at": "yesterday"},
+        {"type": "test", "subject": "Physics", "test_name": "Mock 1", "score": 90, "max_score": 120,
+         "date": "05-01-2024"},
+    ])
+    assert [r["status"] for r in results] == ["error", "error", "error"]
+
+    reloaded = JEEProgressTracker(data_file)
+    assert reloaded.data["daily_logs"] == {}
+    assert reloaded.data["test_scores"] == []
+    assert "Physics" not in reloaded.data["subjects"]
+    reloaded.display_dashboard()
+
+
+def test_wrongly_typed_fields_fail_only_their_operation(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    tracker = JEEProgressTracker(data_file)
+    results = tracker.apply_batch([
+        {"type": "log", "subject": "Physics", "hours": 1, "date": "2024-01-05"},
+        {"type": "log", "subject": "Physics", "hours": 1, "topics": [1]},
+        {"type": "topic", "subject": "Physics", "chapter": "Mechanics", "topic": 7},
+        {"type": "test", "subject": ["Physics"], "test_name": "Mock", "score": 1, "max_score": 2},
+        {"type": "log", "subject": "Physics", "hours": 2, "date": "2024-01-06"},
+    ])
+    assert [r["status"] for r in results] == ["success", "error", "error", "error", "success"]
+    assert "topics must be a list of strings" in results[1]["message"]
+    assert sorted(JEEProgressTracker(data_file).data["daily_logs"]) == ["2024-01-05", "2024-01-06"]
@@ -0,0 +1,68 @@
+import pytest
+
+from jee_metrics import METRICS, Metrics, timed
+from jee_tracker import JEEProgressTracker
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """METRICS switched on and empty for one test"""
+    METRICS.reset()
+    monkeypatch.setattr(METRICS, "enabled", True)
+    yield METRICS
+    METRICS.reset()
+
+
+def _count(name, **labels):
+    """Observations in a histogram series of METRICS, from its rendered _count line"""
+    label_text = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    prefix = f"{name}_count{{{label_text}}} "
+    for line in METRICS.render().splitlines():
+        if line.startswith(prefix):
+            return int(line[len(prefix):])
+    return 0
+
+
+def test_render_prometheus_text():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.enabled = True
+    metrics.inc("jee_storage_bytes_written_total", 512)
+    metrics.inc("jee_http_response_bytes_total", 10, route='/say "hi"')
+    metrics.observe("jee_http_request_seconds", 0.05, route="/", method="GET")
+    metrics.observe("jee_http_request_seconds", 2, route="/", method="GET")
+    assert metrics.render().splitlines() == [
+        "# HELP jee_http_response_bytes_total Response body bytes sent, by route",
+        "# TYPE jee_http_response_bytes_total counter",
+        'jee_http_response_bytes_total{route="/say \\"hi\\""} 10',
+        "# HELP jee_storage_bytes_written_total Bytes written to data files and journals",
+        "# TYPE jee_storage_bytes_written_total counter",
+        "jee_storage_bytes_written_total 512",
+        "# HELP jee_http_request_seconds Time to handle a web request, by route",
+        "# TYPE jee_http_request_seconds histogram",
+        'jee_http_request_seconds_bucket{method="GET",route="/",le="0.1"} 1',
+        'jee_http_request_seconds_bucket{method="GET",route="/",le="1"} 1',
+        'jee_http_request_seconds_bucket{method="GET",route="/",le="+Inf"} 2',
+        'jee_http_request_seconds_sum{method="GET",route="/"} 2.050000',
+        'jee_http_request_seconds_count{method="GET",route="/"} 2',
+    ]
+
+
+def test_nothing_is_recorded_by_default(tmp_path):
+    assert not METRICS.enabled
+    METRICS.reset()
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", "completed", confidence=7)
+    tracker.get_subject_progress("Physics")
+    assert METRICS.render() == "\n"
+
+
+def test_timed_calls_are_counted_when_enabled(metrics, tmp_path):
+    calls = []
+    double = timed("jee_tracker_call_seconds", method="double")(lambda x: calls.append(x) or x * 2)
+    assert double(4) == 8 and calls == [4]
+    assert _count("jee_tracker_call_seconds", method="double") == 1
+
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    for _ in range(3):
+        tracker.get_subject_progress("Physics")
+    assert _count("jee_tracker_call_seconds", method="get_subject_progress") == 3
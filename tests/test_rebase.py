@@ -0,0 +1,57 @@
+import multiprocessing
+
+import pytest
+
+from jee_tracker import JEEProgressTracker
+
+WORKERS = 4
+UPDATES = 8
+
+
+def _update_many(data_file, journal, start):
+    start.wait()
+    tracker = JEEProgressTracker(data_file, journal=journal)
+    for _ in range(UPDATES):
+        tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", status="in_progress",
+                                      time_spent=1, problems_solved=2)
+
+
+@pytest.mark.parametrize("name, journal", [
+    ("progress.json", False),
+    ("progress.json", True),
+    ("progress.jeeb", True),
+    ("progress.db", False),
+])
+def test_concurrent_increments_add_up(tmp_path, name, journal):
+    data_file = str(tmp_path / name)
+    JEEProgressTracker(data_file, journal=journal).log_daily_study("Physics", 1, [], log_date="2024-01-05")
+
+    context = multiprocessing.get_context("fork")
+    start = context.Event()
+    workers = [context.Process(target=_update_many, args=(data_file, journal, start)) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    start.set()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    entry = JEEProgressTracker(data_file, journal=journal).data["subjects"]["Physics"]["Mechanics"]["Kinematics"]
+    assert entry["time_spent"] == WORKERS * UPDATES
+    assert entry["problems_solved"] == 2 * WORKERS * UPDATES
+
+
+def test_rebase_keeps_both_writers_changes(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    first = JEEProgressTracker(data_file, journal=True)
+    second = JEEProgressTracker(data_file, journal=True)
+
+    first.update_topic_progress("Physics", "Mechanics", "Kinematics", status="completed", confidence=8, time_spent=2)
+    second.update_topic_progress("Physics", "Mechanics", "Kinematics", time_spent=3, notes="revised")
+    second.log_daily_study("Physics", 2, ["Kinematics"], log_date="2024-01-05")
+
+    entry = JEEProgressTracker(data_file, journal=True).data["subjects"]["Physics"]["Mechanics"]["Kinematics"]
+    assert entry["status"] == "completed"
+    assert entry["confidence"] == 8
+    assert entry["time_spent"] == 5
+    assert entry["notes"] == "revised"
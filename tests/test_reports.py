@@ -0,0 +1,55 @@
+import os
+import time
+
+import jee_reports
+from jee_tracker import JEEProgressTracker, main
+
+
+def _age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_superseded_reports_are_pruned(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    out_dir = jee_reports.report_dir(data_file)
+    main(["--data-file", data_file, "report"])
+    first = os.listdir(out_dir)
+
+    tracker = JEEProgressTracker(data_file)
+    tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", status="completed")
+    old = [name for name in first if len(name) == 20]
+    _age(os.path.join(out_dir, old[0]), 2 * jee_reports.REPORT_GRACE)
+    main(["--data-file", data_file, "report"])
+
+    reports = [name for name in os.listdir(out_dir) if len(name) == 20]
+    assert len(reports) == 1 and reports != old
+
+
+def test_recent_and_manifest_reports_are_kept(tmp_path):
+    students = tmp_path / "students"
+    students.mkdir()
+    JEEProgressTracker(str(students / "alice.json")).log_daily_study("Physics", 2, [], log_date="2024-01-05")
+    result = jee_reports.render_reports(str(students), workers=1)
+    out_dir = result["out_dir"]
+    kept = result["reports"]["alice"]
+    _age(os.path.join(out_dir, kept), 2 * jee_reports.REPORT_GRACE)
+
+    fresh = os.path.join(out_dir, "0" * 20)
+    os.makedirs(fresh)
+    stale = os.path.join(out_dir, "1" * 20)
+    os.makedirs(stale)
+    _age(stale, 2 * jee_reports.REPORT_GRACE)
+
+    assert jee_reports.prune_reports(out_dir) == 1
+    assert sorted(name for name in os.listdir(out_dir) if len(name) == 20) == sorted([kept, "0" * 20])
+
+
+def test_report_file_renders_and_records_latest(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    tracker = JEEProgressTracker(data_file)
+    data = jee_reports.chart_data(tracker)
+    out_dir = jee_reports.report_dir(data_file)
+    body = jee_reports.report_file(data, out_dir, "completion.svg", ["svg"], data_file)
+    assert b"<svg" in body
+    assert jee_reports._load_latest(out_dir) == {os.path.abspath(data_file): jee_reports.data_hash(data)}
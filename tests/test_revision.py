@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from jee_tracker import JEEProgressTracker
+
+
+def test_same_due_time_is_listed_once(tmp_path):
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    tracker.get_due_revisions()  # builds the queue, which then follows each update
+    for notes in ("first pass", "second pass"):
+        # A low confidence restarts the reviews, so both updates give the same due time
+        tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", confidence=2, notes=notes,
+                                      studied_at="2024-01-05T09:00:00")
+
+    assert [item["topic"] for item in tracker.get_next_revisions(10)] == ["Kinematics"]
+
+
+def test_queue_follows_rebuilds(tmp_path):
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    tracker.get_due_revisions()
+    with tracker.batch():
+        for hour in range(200):
+            tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", confidence=5,
+                                          studied_at=datetime(2024, 1, 5, hour % 24).isoformat())
+    assert [item["topic"] for item in tracker.get_next_revisions(10)] == ["Kinematics"]
+
+
+def test_only_rating_updates_count_as_reviews(tmp_path):
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"), journal=True)
+    tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", "completed", confidence=8)
+    tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", confidence=9)
+    tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", notes="recheck projectile range")
+    tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", problems_solved=12)
+    assert tracker.data["subjects"]["Physics"]["Mechanics"]["Kinematics"]["reviews"] == 2
+
+    # Replaying the journal gives the same count
+    reloaded = JEEProgressTracker(str(tmp_path / "progress.json"), journal=True)
+    assert reloaded.data["subjects"]["Physics"]["Mechanics"]["Kinematics"]["reviews"] == 2
@@ -0,0 +1,43 @@
+from jee_storage import convert_storage, open_storage
+from jee_tracker import JEEProgressTracker
+
+
+def _fill(tracker):
+    tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", status="completed", confidence=7,
+                                  time_spent=2.5, problems_solved=12, studied_at="2024-01-05T09:00:00")
+    tracker.update_topic_progress("Mathematics", "Calculus", "Limits", status="in_progress", confidence=4,
+                                  studied_at="2024-01-06T18:30:00")
+    tracker.log_daily_study("Physics", 2.5, ["Kinematics"], "morning", log_date="2024-01-05")
+    tracker.add_test_score("Mock 1", "Physics", 72, 120, "2024-01-07")
+
+
+def test_sqlite_round_trip(tmp_path):
+    db_file = str(tmp_path / "progress.db")
+    tracker = JEEProgressTracker(db_file)
+    _fill(tracker)
+    expected = tracker.data
+    progress = tracker.get_subject_progress("Physics")
+    tracker.storage.close()
+
+    reloaded = JEEProgressTracker(db_file)
+    assert reloaded.data == expected
+    assert reloaded.get_subject_progress("Physics") == progress
+    assert [t["test_name"] for t in reloaded.get_test_scores()] == ["Mock 1"]
+    reloaded.storage.close()
+
+
+def test_convert_between_backends(tmp_path):
+    json_file = str(tmp_path / "progress.json")
+    tracker = JEEProgressTracker(json_file, journal=True)
+    _fill(tracker)
+
+    counts = convert_storage(json_file, str(tmp_path / "progress.db"))
+    assert counts["daily_logs"] == 1
+    assert counts["test_scores"] == 1
+    convert_storage(str(tmp_path / "progress.db"), str(tmp_path / "progress.jeeb"))
+
+    for name in ("progress.db", "progress.jeeb"):
+        storage = open_storage(str(tmp_path / name))
+        assert storage.load() == tracker.data
+        if hasattr(storage, "close"):
+            storage.close()
@@ -0,0 +1,88 @@
+import json
+import marshal
+import os
+import stat
+from datetime import datetime
+
+from jee_storage import BinaryStorage, JSONStorage, Topic, atomic_write, json_default, new_data
+from jee_tracker import JEEProgressTracker
+
+
+def _log_records(data, count, start=0):
+    records = []
+    for i in range(start, start + count):
+        data["revision"] = data.get("revision", 0) + 1
+        records.append({"op": "log", "rev": data["revision"], "date": "2024-01-05",
+                        "entry": {"subject": "Physics", "hours": 1.0, "topics_covered": [],
+                                  "notes": str(i), "timestamp": "2024-01-05T10:00:00"}})
+    return records
+
+
+def test_journal_replay_and_compaction(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    tracker = JEEProgressTracker(data_file, journal=True, compact_threshold=1000)
+    for _ in range(3):
+        tracker.log_daily_study("Physics", 1.5, ["Kinematics"], log_date="2024-01-05")
+    assert os.path.exists(data_file + ".journal")
+
+    reloaded = JEEProgressTracker(data_file, journal=True)
+    assert len(reloaded.data["daily_logs"]["2024-01-05"]) == 3
+    assert reloaded.data["revision"] == tracker.data["revision"]
+
+    reloaded.compact()
+    assert not os.path.exists(data_file + ".journal")
+    with open(data_file) as f:
+        assert len(json.load(f)["daily_logs"]["2024-01-05"]) == 3
+    assert JEEProgressTracker(data_file, journal=True).data == reloaded.data
+
+
+def test_journal_compacts_at_threshold(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    tracker = JEEProgressTracker(data_file, journal=True, compact_threshold=4)
+    for _ in range(5):
+        tracker.log_daily_study("Physics", 1, [], log_date="2024-01-05")
+    assert len(JEEProgressTracker(data_file, journal=True).data["daily_logs"]["2024-01-05"]) == 5
+
+
+def test_torn_journal_line_is_dropped_before_appending(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    storage = JSONStorage(data_file, journal=True, compact_threshold=1000)
+    data = storage.load()
+    storage.commit(data, _log_records(data, 1))
+    with open(data_file + ".journal", "a") as f:
+        f.write('{"op": "log", "rev": 2, "da')  # crash in the middle of a write
+
+    storage = JSONStorage(data_file, journal=True, compact_threshold=1000)
+    data = storage.load()
+    assert len(data["daily_logs"]["2024-01-05"]) == 1
+    storage.commit(data, _log_records(data, 5, start=1))
+
+    reloaded = JSONStorage(data_file, journal=True).load()
+    assert len(reloaded["daily_logs"]["2024-01-05"]) == 6
+    assert reloaded["revision"] == 6
+
+
+def test_empty_storage_loads_new_data(tmp_path):
+    assert JSONStorage(str(tmp_path / "missing.json")).load() == new_data()
+
+
+def test_atomic_write_keeps_file_mode(tmp_path):
+    path = str(tmp_path / "progress.json")
+    old_umask = os.umask(0o022)
+    try:
+        atomic_write(path, "{}")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+        os.chmod(path, 0o640)
+        atomic_write(path, b"{}")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    finally:
+        os.umask(old_umask)
+
+
+def test_binary_snapshot_stores_what_json_would(tmp_path):
+    data = new_data()
+    data["subjects"]["Physics"] = {"Mechanics": {"Kinematics": Topic(status="completed", confidence=8,
+                                                                     last_studied=datetime(2024, 1, 5, 10))}}
+    data["test_scores"].append({"subject": "Physics", "date": datetime(2024, 1, 6), "ranks": (1, 2), 3: None})
+    blob = BinaryStorage(str(tmp_path / "progress.jeeb"))._dump_snapshot(data)
+    assert marshal.loads(blob[len(BinaryStorage.MAGIC):]) == json.loads(json.dumps(data, default=json_default))
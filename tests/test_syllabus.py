@@ -0,0 +1,59 @@
+import json
+import os
+
+import pytest
+
+from jee_syllabus import SyllabusIndex, load_syllabus
+
+# Syllabus order: Physics, Sound Waves, Standing Waves, Wave Speed, Waves, Doppler Effect,
+# Wave Optics Basics, Wave Mechanics, Basics, Wavefunctions
+SYLLABUS = {
+    "Physics": {"Sound Waves": ["Standing Waves", "Wave Speed"], "Waves": ["Doppler Effect", "Wave Optics Basics"]},
+    "Wave Mechanics": {"Basics": ["Wavefunctions"]},
+}
+
+
+def _write(path, syllabus):
+    path.write_text(json.dumps(syllabus))
+    return str(path)
+
+
+@pytest.mark.parametrize("syllabus", [
+    ["Physics"],
+    {"Physics": ["Mechanics"]},
+    {"Physics": {"Mechanics": "Kinematics"}},
+    {"Physics": {"Mechanics": ["Kinematics", 3]}},
+])
+def test_load_syllabus_rejects_other_shapes(tmp_path, syllabus):
+    with pytest.raises(ValueError, match="not a syllabus"):
+        load_syllabus(_write(tmp_path / "syllabus.json", syllabus))
+
+
+def test_load_syllabus_is_cached_per_file_version(tmp_path):
+    path = _write(tmp_path / "syllabus.json", SYLLABUS)
+    index = load_syllabus(path)
+    assert load_syllabus(path) is index
+    assert load_syllabus(os.path.relpath(path)) is index
+
+    _write(tmp_path / "syllabus.json", {"Physics": {"Waves": ["Wave Speed"]}})
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))  # in case the rewrite kept the mtime
+    reloaded = load_syllabus(path)
+    assert reloaded is not index
+    assert list(reloaded.tree) == ["Physics"]
+
+
+def test_search_ranks_first_word_matches_then_depth_then_syllabus_order():
+    index = SyllabusIndex(SYLLABUS)
+    assert [(r["type"], r["name"]) for r in index.search("wave")] == [
+        # The first word matches
+        ("subject", "Wave Mechanics"), ("chapter", "Waves"),
+        ("topic", "Wave Speed"), ("topic", "Wave Optics Basics"), ("topic", "Wavefunctions"),
+        # A later word matches
+        ("chapter", "Sound Waves"), ("topic", "Standing Waves"),
+    ]
+    # Every query word must match; a first-word topic still ranks before a chapter
+    assert [r["name"] for r in index.search("wave s")] == ["Wave Speed", "Sound Waves", "Standing Waves"]
+    assert [r["name"] for r in index.search("WAVE", limit=2)] == ["Wave Mechanics", "Waves"]
+    assert index.search("wave speed")[0]["path"] == ["Physics", "Sound Waves", "Wave Speed"]
+    assert index.search("  ") == []
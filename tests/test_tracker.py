@@ -0,0 +1,78 @@
+import pytest
+
+from jee_tracker import JEEProgressTracker
+
+
+def test_unknown_topic_leaves_subject_uninitialized(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    tracker = JEEProgressTracker(data_file, journal=True)
+    with pytest.raises(KeyError):
+        tracker.update_topic_progress("Chemistry", "Physical Chemistry", "No Such Topic", status="completed")
+    assert "Chemistry" not in tracker.data["subjects"]
+
+    tracker.update_topic_progress("Chemistry", "Physical Chemistry", "Atomic Structure", status="completed")
+    expected = tracker.get_subject_progress("Chemistry")
+
+    reloaded = JEEProgressTracker(data_file, journal=True)
+    assert reloaded.get_subject_progress("Chemistry") == expected
+    assert expected["total_topics"] > 1
+
+
+def test_unknown_subject_raises_without_changes(tmp_path):
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    with pytest.raises(KeyError):
+        tracker.update_topic_progress("Biology", "Cells", "Mitosis", status="completed")
+    assert "Biology" not in tracker.data["subjects"]
+
+
+def test_study_plan_tolerates_odd_last_studied_values(tmp_path):
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    tracker.update_topic_progress("Physics", "Mechanics", "Kinematics", confidence=3,
+                                  studied_at="2024-01-05T09:00:00+05:30")
+    tracker.update_topic_progress("Physics", "Mechanics", "Gravitation", confidence=5)
+    topics = tracker.data["subjects"]["Physics"]["Mechanics"]
+    topics["Gravitation"] = dict(topics["Gravitation"], last_studied="last tuesday")
+
+    plan = tracker.generate_study_plan(30)
+    assert plan["priority_topics"]
+    assert JEEProgressTracker.topic_priority(topics["Gravitation"]) == JEEProgressTracker.topic_priority(
+        dict(topics["Gravitation"], last_studied=None))
+
+
+def test_syllabus_is_read_only(tmp_path):
+    tracker = JEEProgressTracker(str(tmp_path / "progress.json"))
+    with pytest.raises(TypeError):
+        tracker.syllabus["Biology"] = {}
+    with pytest.raises(TypeError):
+        tracker.syllabus["Physics"]["Mechanics"] = []
+    with pytest.raises(AttributeError):
+        tracker.syllabus["Physics"]["Mechanics"].append("Fluids")
+
+
+@pytest.mark.parametrize("name", ["progress.json", "progress.jeeb", "progress.db"])
+def test_init_records_persist_with_read_only_syllabus(tmp_path, name):
+    data_file = str(tmp_path / name)
+    tracker = JEEProgressTracker(data_file, journal=True)
+    tracker.update_topic_progress("Chemistry", "Physical Chemistry", "Atomic Structure", status="completed")
+    if hasattr(tracker.storage, "close"):
+        tracker.storage.close()
+
+    reloaded = JEEProgressTracker(data_file, journal=True)
+    assert reloaded.get_subject_progress("Chemistry")["total_topics"] == sum(
+        len(topics) for topics in reloaded.syllabus["Chemistry"].values())
+
+
+@pytest.mark.parametrize("name", ["progress.json", "progress.db"])
+def test_bad_value_leaves_subject_uninitialized(tmp_path, name):
+    data_file = str(tmp_path / name)
+    tracker = JEEProgressTracker(data_file, journal=True)
+    with pytest.raises(TypeError):
+        tracker.update_topic_progress("Chemistry", "Physical Chemistry", "Atomic Structure", confidence="7")
+    assert "Chemistry" not in tracker.data["subjects"]
+
+    tracker.update_topic_progress("Chemistry", "Physical Chemistry", "Atomic Structure", confidence=7)
+    if hasattr(tracker.storage, "close"):
+        tracker.storage.close()
+    reloaded = JEEProgressTracker(data_file, journal=True)
+    assert reloaded.get_subject_progress("Chemistry")["total_topics"] == sum(
+        len(topics) for topics in reloaded.syllabus["Chemistry"].values())
@@ -0,0 +1,337 @@
+import gzip
+import json
+from contextlib import contextmanager
+from datetime import date
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import web_interface
+from jee_metrics import METRICS
+from jee_syllabus import JEE_INDEX
+from jee_tracker import JEEProgressTracker
+from web_interface import (GZIP_MIN_BYTES, MAX_CACHED_BODIES, AsyncJEEWebServer, JEEWebHandler, JEEWebServer,
+                           SharedTracker, TrackerPool, syllabus_body)
+
+
+@contextmanager
+def serving(trackers):
+    """Base url of a threaded server for trackers on an ephemeral port"""
+    server = JEEWebServer(("localhost", 0), JEEWebHandler, trackers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://localhost:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def web_server(tmp_path):
+    """A threaded server over tmp_path; yields (base url, tracker pool)"""
+    trackers = TrackerPool(str(tmp_path / "progress.json"), data_dir=str(tmp_path), capacity=2)
+    with serving(trackers) as url:
+        yield url, trackers
+
+
+@pytest.fixture
+def async_web_server(tmp_path):
+    """The --async server over tmp_path on a free port; yields (base url, tracker pool)"""
+    with socket.socket() as probe:  # asyncio.start_server does not report the port it bound
+        probe.bind(("localhost", 0))
+        port = probe.getsockname()[1]
+    trackers = TrackerPool(str(tmp_path / "progress.json"), data_dir=str(tmp_path), capacity=2)
+    server = AsyncJEEWebServer(("localhost", port), trackers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            socket.create_connection(("localhost", port), timeout=1).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+    yield f"http://localhost:{port}", trackers
+    server.shutdown()
+    thread.join(5)
+
+
+def request(url, body=None, headers=None):
+    """(status, headers, body) of one HTTP request, without raising for error statuses"""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers=headers or {}, method="POST" if data else "GET")
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_shared_tracker_reloads_after_another_writer(tmp_path):
+    data_file = str(tmp_path / "progress.json")
+    shared = SharedTracker(data_file, journal=True)
+    with shared.use() as tracker:
+        tracker.log_daily_study("Physics", 1, [], log_date="2024-01-05")
+    version = shared.version
+
+    JEEProgressTracker(data_file, journal=True).log_daily_study("Physics", 2, [], log_date="2024-01-06")
+    with shared.use() as tracker:
+        assert "2024-01-06" in tracker.data["daily_logs"]
+    assert shared.version > version
+
+
+def test_versions_are_not_reused_after_eviction(tmp_path):
+    pool = TrackerPool(data_dir=str(tmp_path), capacity=1)
+    with pool.get("alice").use():
+        pass
+    seen = pool.get("alice").version
+
+    pool.get("bob")  # evicts alice
+    JEEProgressTracker(str(tmp_path / "alice.json")).log_daily_study("Physics", 1, [], log_date="2024-01-05")
+    with pool.get("alice").use():
+        pass
+    assert pool.get("alice").version != seen
+
+
+def test_evicted_channels_are_dropped_unless_streamed(tmp_path):
+    pool = TrackerPool(data_dir=str(tmp_path), capacity=1)
+    with pool.get("alice").channel.attach():
+        pool.get("bob")
+        assert "alice" in pool._channels  # a dashboard is still listening
+    pool.get("carol")
+    assert set(pool._channels) == {"carol"}
+
+
+def test_event_ids_keep_growing_across_channels(tmp_path):
+    pool = TrackerPool(data_dir=str(tmp_path), capacity=1)
+    channel = pool.get("alice").channel
+    channel.publish({"n": 1})
+    last_id = channel.last_id
+
+    pool.get("bob")
+    recreated = pool.get("alice").channel
+    assert recreated is not channel
+    recreated.publish({"n": 2})
+    frames, _ = recreated.since(last_id)  # a client resuming with the old Last-Event-ID
+    assert len(frames) == 1
+
+
+def test_syllabus_body_is_plain_json():
+    body = json.loads(syllabus_body(JEE_INDEX.tree))
+    assert body["Physics"]["Mechanics"][0] == "Kinematics"
+
+
+def test_batch_endpoint_reports_each_operation(web_server):
+    url, trackers = web_server
+    status, _, body = request(url + "/api/batch", {"operations": [
+        {"type": "log-study", "subject": "Physics", "hours": 1, "date": "2024-01-05"},
+        {"type": "log-study", "subject": "Physics", "hours": 1, "topics": [1]},
+        {"type": ["topic"]},
+        {"type": "update-topic", "subject": "Physics", "chapter": "Mechanics", "topic": "Kinematics",
+         "confidence": "x"},
+        {"type": "add-test", "subject": "Physics", "test_name": "Mock", "score": 60, "max_score": 120},
+    ]})
+    reply = json.loads(body)
+    assert status == 200
+    assert [r["status"] for r in reply["results"]] == ["success", "error", "error", "error", "success"]
+    assert (reply["applied"], reply["failed"]) == (2, 3)
+    tracker = JEEProgressTracker(trackers.default.data_file)
+    assert len(tracker.data["test_scores"]) == 1 and "2024-01-05" in tracker.data["daily_logs"]
+
+
+def test_response_cache_is_bounded(web_server):
+    url, trackers = web_server
+    for days in range(MAX_CACHED_BODIES + 20):
+        status, _, _ = request(f"{url}/api/analytics?days={days + 1}")
+        assert status == 200
+    assert len(trackers.default.cache) <= MAX_CACHED_BODIES
+    # The most recent bodies are still served from the cache
+    assert ("analytics", MAX_CACHED_BODIES + 20, date.today().isoformat()) in trackers.default.cache
+
+
+def test_history_is_revalidated_but_not_cached(web_server):
+    url, trackers = web_server
+    for day in range(1, 6):
+        status, headers, body = request(f"{url}/api/history?as_of=2024-01-0{day}")
+        assert status == 200 and "progress" in json.loads(body)
+    assert not [key for key in trackers.default.cache if key[0] == "history"]
+
+    status, _, _ = request(f"{url}/api/history?as_of=2024-01-05", headers={"If-None-Match": headers["ETag"]})
+    assert status == 304
+
+
+def test_pool_evicts_least_recently_used_student(tmp_path):
+    pool = TrackerPool(data_dir=str(tmp_path), capacity=2)
+    alice, bob = pool.get("alice"), pool.get("bob")
+    assert pool.get("alice") is alice  # now the most recently used
+    pool.get("carol")
+    assert len(pool) == 2
+    assert pool.get("alice") is alice
+    assert pool.get("bob") is not bob
+
+
+def test_pool_loads_student_files_lazily(tmp_path):
+    JEEProgressTracker(str(tmp_path / "alice.json")).log_daily_study("Physics", 2, [], log_date="2024-01-05")
+    pool = TrackerPool(data_dir=str(tmp_path))
+    shared = pool.get("alice")
+    assert shared.tracker is None
+    assert shared.data_file == str(tmp_path / "alice.json")
+    with shared.use() as tracker:
+        assert "2024-01-05" in tracker.data["daily_logs"]
+    assert not (tmp_path / "bob.json").exists()
+    pool.get("bob")
+    assert not (tmp_path / "bob.json").exists()
+
+
+@pytest.mark.parametrize("student", ["..", "../alice", ".hidden", "a" * 65, "al ice"])
+def test_pool_rejects_bad_student_ids(tmp_path, student):
+    with pytest.raises(KeyError):
+        TrackerPool(data_dir=str(tmp_path)).get(student)
+
+
+def test_pool_without_data_dir_rejects_students(tmp_path):
+    with pytest.raises(KeyError):
+        TrackerPool(str(tmp_path / "progress.json")).get("alice")
+
+
+@pytest.mark.parametrize("path", ["/students/..%2f/api/progress", "/students/../api/progress",
+                                  "/students/.x/api/progress"])
+def test_bad_student_paths_get_400(web_server, path):
+    url, trackers = web_server
+    status, _, _ = request(url + path)
+    assert status == 400
+    assert len(trackers) == 0
+
+
+def test_student_routes_use_their_own_file(web_server, tmp_path):
+    url, trackers = web_server
+    request(url + "/students/alice/api/log-study", {"subject": "Physics", "hours": 3})
+    status, _, _ = request(url + "/students/alice/api/progress")
+    assert status == 200
+    assert (tmp_path / "alice.json").exists() and not (tmp_path / "progress.json").exists()
+
+
+def _open_stream(url, path):
+    """A raw socket reading an event stream, once the server has attached it to its channel"""
+    host, port = url[len("http://"):].split(":")
+    stream = socket.create_connection((host, int(port)), timeout=10)
+    stream.sendall(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    head = b""
+    while b"retry: " not in head:  # written after the stream is attached
+        head += stream.recv(4096)
+    assert head.startswith(b"HTTP/1.") and b" 200 " in head.split(b"\r\n")[0]
+    assert b"text/event-stream" in head
+    return stream, head.partition(b"\r\n\r\n")[2]
+
+
+def _read_event(stream, buffered=b""):
+    while b"event: progress" not in buffered or not buffered.endswith(b"\n\n"):
+        buffered += stream.recv(65536)
+    frame = buffered[buffered.index(b"event: progress"):]
+    return json.loads(frame.split(b"data: ", 1)[1].split(b"\n", 1)[0])
+
+
+def test_event_stream_pushes_progress(web_server):
+    url, _ = web_server
+    stream, buffered = _open_stream(url, "/students/alice/api/events")
+    with stream:
+        request(url + "/students/alice/api/update-topic",
+                {"subject": "Physics", "chapter": "Mechanics", "topic": "Kinematics", "status": "completed"})
+        event = _read_event(stream, buffered)
+    assert event["changes"][0]["topic"] == "Kinematics"
+    assert event["progress"]["Physics"]["completed_topics"] == 1
+
+
+def test_dashboard_has_a_card_for_every_subject(web_server):
+    url, _ = web_server
+    status, _, body = request(url + "/")
+    assert status == 200
+    for subject in JEE_INDEX.tree:
+        assert f'data-subject="{subject}"'.encode() in body
+    assert b"location.reload" not in body
+
+
+def test_closed_streams_release_evicted_channels(web_server, monkeypatch):
+    monkeypatch.setattr(web_interface, "EVENT_HEARTBEAT", 0.1)
+    url, trackers = web_server
+    stream, _ = _open_stream(url, "/students/alice/api/events")
+    channel = trackers.get("alice").channel
+    trackers.get("bob")
+    trackers.get("carol")  # evicts alice, whose dashboard is still listening
+    assert trackers._channels["alice"] is channel
+
+    stream.close()
+    deadline = time.monotonic() + 5
+    while channel.streams and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert channel.streams == 0
+    trackers.get("dave")
+    assert "alice" not in trackers._channels
+
+
+def test_async_server_serves_the_same_routes(async_web_server):
+    url, _ = async_web_server
+    status, headers, body = request(url + "/api/progress")
+    assert status == 200 and "Physics" in json.loads(body)
+    etag = headers["ETag"]
+
+    status, _, body = request(url + "/api/progress", headers={"If-None-Match": etag})
+    assert status == 304 and body == b""
+
+    status, _, body = request(url + "/api/update-topic",
+                              {"subject": "Physics", "chapter": "Mechanics", "topic": "Kinematics", "status": "completed"})
+    assert status == 200 and json.loads(body)["status"] == "success"
+    status, headers, body = request(url + "/api/progress", headers={"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+    assert json.loads(body)["Physics"]["completed_topics"] == 1
+
+    status, headers, body = request(url + "/", headers={"Accept-Encoding": "gzip"})
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+    page = gzip.decompress(body)
+    assert len(page) >= GZIP_MIN_BYTES and b'data-subject="Physics"' in page
+
+
+def test_syllabus_search_over_http(tmp_path):
+    syllabus = tmp_path / "syllabus.json"
+    syllabus.write_text(json.dumps({"Physics": {"Sound Waves": ["Standing Waves", "Wave Speed"], "Waves": ["Doppler"]},
+                                    "Wave Mechanics": {"Basics": ["Wavefunctions"]}}))
+    with serving(TrackerPool(str(tmp_path / "progress.json"), syllabus=str(syllabus))) as url:
+        status, _, body = request(url + "/api/syllabus/search?q=wave&limit=5")
+        assert status == 200
+        assert [(r["type"], r["name"]) for r in json.loads(body)["results"]] == [
+            ("subject", "Wave Mechanics"), ("chapter", "Waves"), ("topic", "Wave Speed"),
+            ("topic", "Wavefunctions"), ("chapter", "Sound Waves")]
+        assert request(url + "/api/syllabus/search?q=wave&limit=x")[0] == 400
+
+
+def test_metrics_endpoint(web_server, monkeypatch):
+    url, _ = web_server
+    assert request(url + "/metrics")[0] == 404  # off unless the server was started with --metrics
+
+    METRICS.reset()
+    monkeypatch.setattr(METRICS, "enabled", True)
+    count = 'jee_http_request_seconds_count{method="GET",route="/api/progress",status="200"} 2'
+    try:
+        request(url + "/api/progress")
+        request(url + "/api/progress")
+        # A request is timed after its response is sent, so the second one may land a moment later
+        deadline = time.monotonic() + 5
+        while True:
+            status, headers, body = request(url + "/metrics")
+            lines = body.decode().splitlines()
+            if count in lines or time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+    finally:
+        METRICS.reset()
+    assert status == 200 and headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE jee_http_request_seconds histogram" in lines
+    assert count in lines
+    assert any(line.startswith('jee_http_response_bytes_total{route="/api/progress"} ') for line in lines)
@@ -4,24 +4,348 @@ Simple web interface for JEE Progress Tracker
 Run this script to start a local web server for easier interaction
 """
 
+import asyncio
+import gzip
+import http.client
+import io
+import itertools
 import json
 import os
+import re
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from datetime import datetime, date
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from email.utils import formatdate, parsedate_to_datetime
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 import webbrowser
 import threading
 import time
+import traceback
 
+from jee_history import history_key
+from jee_metrics import METRICS, enable as enable_metrics
+from jee_reports import (CHARTS, CONTENT_TYPES, DEFAULT_SUBJECT_COLOR, FORMATS, REPORT_HTML, SUBJECT_COLORS,
+                         chart_data, data_hash, report_dir, report_file)
+from jee_storage import disk_signature
 from jee_tracker import JEEProgressTracker
 
+# Event ids are unique across channels, so a client resuming with the Last-Event-ID
+# of a channel that has since been dropped and recreated misses nothing
+_event_ids = itertools.count(1)
+
+class EventChannel:
+    """Recent server-sent events, each encoded once, that any number of clients can wait on"""
+
+    def __init__(self, history=64):
+        self._frames = deque(maxlen=history)  # (event id, encoded SSE frame)
+        self._last_id = 0
+        self._condition = threading.Condition()
+        self._listeners = []  # called after each publish, e.g. to wake the asyncio server
+        self.streams = 0  # event streams currently attached
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def publish(self, event, name="progress"):
+        data = json.dumps(event, separators=(",", ":"))
+        with self._condition:
+            self._last_id = next(_event_ids)
+            self._frames.append((self._last_id, f"id: {self._last_id}\nevent: {name}\ndata: {data}\n\n".encode()))
+            self._condition.notify_all()
+        for listener in self._listeners:
+            listener()
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    @contextmanager
+    def attach(self):
+        """Count an event stream as attached for the duration of the block"""
+        with self._condition:
+            self.streams += 1
+        try:
+            yield self
+        finally:
+            with self._condition:
+                self.streams -= 1
+
+    def since(self, last_id):
+        """Frames newer than last_id without waiting; returns (frames, new last id)"""
+        with self._condition:
+            # A client further behind than the history just gets what is left
+            frames = [frame for event_id, frame in self._frames if event_id > last_id]
+            return frames, self._last_id
+
+    def wait(self, last_id, timeout):
+        """Frames newer than last_id, waiting up to timeout for one; returns (frames, new last id)"""
+        with self._condition:
+            if self._last_id <= last_id:
+                self._condition.wait(timeout)
+            return self.since(last_id)
+
+def summarize_record(record):
+    """The part of a change record a dashboard needs to show it"""
+    op = record["op"]
+    if op == "log":
+        return {"op": op, "date": record["date"], "subject": record["entry"]["subject"],
+                "hours": record["entry"]["hours"]}
+    if op == "topic":
+        return {"op": op, "subject": record["subject"], "chapter": record["chapter"], "topic": record["topic"],
+                "status": record["data"]["status"], "confidence": record["data"]["confidence"]}
+    if op == "test":
+        entry = record["entry"]
+        return {"op": op, "subject": entry["subject"], "test_name": entry["test_name"],
+                "percentage": entry["percentage"], "date": entry["date"]}
+    return None
+
+MAX_EVENT_CHANGES = 100
+MAX_CACHED_BODIES = 64  # per tracker; query parameters would otherwise grow the cache without bound
+
+class BodyCache(OrderedDict):
+    """Response bodies for one data version, dropping the least recently used beyond MAX_CACHED_BODIES"""
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > MAX_CACHED_BODIES:
+            self.popitem(last=False)
+
+# Versions come from one process-wide sequence, so a tracker recreated after
+# eviction never reuses a version (and ETag) issued for older data
+_versions = itertools.count(1)
+
+class SharedTracker:
+    """A long-lived tracker shared by all request threads for one data file"""
+
+    def __init__(self, data_file="jee_progress.json", journal=False, syllabus=None,
+                 student=None, channel=None, class_channel=None):
+        self.data_file = data_file
+        self.journal = journal
+        self.syllabus = syllabus  # syllabus file, compiled once per process and shared
+        self.tracker = None  # loaded on first use
+        self.lock = threading.RLock()
+        self._signature = None
+        self.version = 0  # bumped whenever the data changes, used for ETags
+        self.modified = time.time()
+        self.cache = BodyCache()  # rendered response bodies for the current version
+        self.student = student
+        self.channel = channel or EventChannel()  # progress deltas for this student's dashboards
+        self.class_channel = class_channel  # the same deltas for teachers following every student
+        self._pending = []  # records committed during the current use()
+        self._reloaded = False
+
+    def _on_commit(self, records):
+        if records is None:
+            self._reloaded = True
+        else:
+            self._pending.extend(records)
+
+    def _publish(self):
+        """Send one event describing everything committed or reloaded during this use()"""
+        records, self._pending = self._pending, []
+        reloaded, self._reloaded = self._reloaded, False
+        
+        if reloaded:
+            subjects = list(self.tracker.syllabus)
+        else:
+            subjects = {record.get("subject") or record["entry"]["subject"] for record in records}
+        changes = [change for change in map(summarize_record, records) if change]
+        event = {
+            "student": self.student,
+            "version": self.version,
+            "revision": self.tracker.data.get("revision"),
+            "reload": reloaded,
+            "changes": changes[-MAX_EVENT_CHANGES:],
+            "change_count": len(changes),
+            "progress": {subject: self.tracker.get_subject_progress(subject)
+                         for subject in self.tracker.syllabus if subject in subjects}
+        }
+        self.channel.publish(event)
+        if self.class_channel is not None:
+            self.class_channel.publish(event)
+
+    def _changed(self):
+        self.version = next(_versions)
+        self.modified = time.time()
+        self.cache = BodyCache()
+
+    @contextmanager
+    def use(self):
+        """Lock the tracker, reloading it first if another process changed the file"""
+        with self.lock:
+            if self.tracker is None:
+                self.tracker = JEEProgressTracker(self.data_file, journal=self.journal, syllabus=self.syllabus)
+                self.tracker.subscribe(self._on_commit)
+                self._changed()
+            elif disk_signature(self.tracker.storage.paths()) != self._signature:
+                self.tracker.reload()
+                self._changed()
+
+            revision = self.tracker.data.get("revision")
+            try:
+                yield self.tracker
+            finally:
+                if self.tracker.data.get("revision") != revision:
+                    self._changed()
+                if self._pending or self._reloaded:
+                    self._publish()
+                # Our own writes must not trigger a reload next time
+                self._signature = disk_signature(self.tracker.storage.paths())
+
+# Distinguishes ETags issued by different server runs
+BOOT_ID = format(int(time.time() * 1000), 'x')
+GZIP_MIN_BYTES = 1024
+EVENT_HEARTBEAT = 15  # seconds between keep-alive comments on idle event streams
+
+_syllabus_bodies = {}
+_syllabus_lock = threading.Lock()
+
+def syllabus_body(syllabus):
+    """JSON for a syllabus, serialized at most once per process"""
+    key = id(syllabus)
+    with _syllabus_lock:
+        if key not in _syllabus_bodies:
+            # Keep the syllabus alive so its id can never be reused
+            _syllabus_bodies[key] = (syllabus, json.dumps(syllabus, default=dict).encode())
+        return _syllabus_bodies[key][1]
+
+STUDENT_ID = re.compile(r'[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}')
+
+class TrackerPool:
+    """Bounded LRU cache of per-student shared trackers"""
+
+    def __init__(self, default_file="jee_progress.json", data_dir=None, capacity=64,
+                 extension=".json", journal=False, syllabus=None):
+        self.class_channel = EventChannel(history=256)
+        self.default = SharedTracker(default_file, journal=journal, syllabus=syllabus,
+                                     class_channel=self.class_channel)
+        self._channels = {}  # student -> EventChannel, kept after eviction while a stream is attached
+        self.data_dir = data_dir
+        self.capacity = capacity
+        self.extension = extension
+        self.journal = journal
+        self.syllabus = syllabus
+        self._students = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, student=None):
+        """Return the SharedTracker for a student, or the default one"""
+        if student is None:
+            return self.default
+        if self.data_dir is None:
+            raise KeyError("Server was started without a student data directory")
+        if not STUDENT_ID.fullmatch(student):
+            raise KeyError(f"Invalid student id: {student}")
+        
+        with self._lock:
+            shared = self._students.get(student)
+            if shared is not None:
+                self._students.move_to_end(student)
+                return shared
+            
+            # The data file itself is read lazily, outside this lock
+            data_file = os.path.join(self.data_dir, student + self.extension)
+            channel = self._channels.setdefault(student, EventChannel())
+            shared = self._students[student] = SharedTracker(data_file, journal=self.journal, syllabus=self.syllabus,
+                                                             student=student, channel=channel,
+                                                             class_channel=self.class_channel)
+            
+            # Requests already holding an evicted tracker finish with it normally
+            evicted = False
+            while len(self._students) > self.capacity:
+                self._students.popitem(last=False)
+                evicted = True
+            if evicted:
+                self._drop_idle_channels()
+            return shared
+
+    def _drop_idle_channels(self):
+        """Forget channels of evicted students that no event stream is attached to"""
+        for student in [student for student, channel in self._channels.items()
+                        if not channel.streams and student not in self._students]:
+            del self._channels[student]
+
+    def __len__(self):
+        return len(self._students)
+
+class JEEWebServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the per-student tracker pool"""
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, trackers):
+        self.trackers = trackers
+        super().__init__(server_address, handler_class)
+
+# Routes reported by name in /metrics; anything else is counted as "other"
+METRIC_ROUTES = frozenset(['/', '/api/progress', '/api/subjects', '/api/analytics', '/api/syllabus/search',
+                           '/api/revisions/due', '/api/history', '/api/log-study', '/api/update-topic', '/api/add-test',
+                           '/api/batch', '/metrics', '/charts', '/report.html'])
+
 class JEEWebHandler(BaseHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        self.tracker = JEEProgressTracker()
-        super().__init__(*args, **kwargs)
+    route = None  # metrics label for the current request; None leaves it untimed
+    status = None
 
-    def do_GET(self):
+    def handle_one_request(self):
+        if not METRICS.enabled:
+            return super().handle_one_request()
+        self.route = self.status = None
+        start = time.perf_counter()
+        super().handle_one_request()
+        if self.route is not None:
+            METRICS.observe("jee_http_request_seconds", time.perf_counter() - start,
+                            route=self.route, method=self.command, status=self.status)
+
+    def send_response(self, code, message=None):
+        self.status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if METRICS.enabled and keyword.lower() == 'content-length' and self.route is not None:
+            METRICS.inc("jee_http_response_bytes_total", int(value), route=self.route)
+        super().send_header(keyword, value)
+
+    def resolve_student(self):
+        """Pick the student from a /students/<id>/ prefix or the X-Student-Id header"""
         path = urlparse(self.path).path
+        student = self.headers.get('X-Student-Id')
+        self.route = "other"
+        
+        if path.startswith('/students/'):
+            student, _, rest = path[len('/students/'):].partition('/')
+            if not rest and not path.endswith('/'):
+                # Relative API URLs on the dashboard need the trailing slash
+                self.send_response(301)
+                self.send_header('Location', path + '/')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return None
+            path = '/' + rest
+        
+        if path in METRIC_ROUTES:
+            self.route = path
+        try:
+            self.shared_tracker = self.server.trackers.get(student)
+        except KeyError as e:
+            self.send_error(400, str(e))
+            return None
+        return path
+
+    def do_GET(self):
+        path = self.resolve_student()
+        if path is None:
+            return
         
         if path == '/':
             self.serve_dashboard()
@@ -29,15 +353,37 @@ class JEEWebHandler(BaseHTTPRequestHandler):
             self.serve_progress_api()
         elif path == '/api/subjects':
             self.serve_subjects_api()
+        elif path == '/api/analytics':
+            self.serve_analytics_api()
+        elif path == '/api/syllabus/search':
+            self.serve_syllabus_search()
+        elif path == '/api/revisions/due':
+            self.serve_revisions_api()
+        elif path == '/api/history':
+            self.serve_history_api()
+        elif path == '/api/events':
+            self.serve_events(self.shared_tracker.channel, self.shared_tracker)
+        elif path == '/api/class/events':
+            self.serve_events(self.server.trackers.class_channel)
+        elif path == '/metrics' and METRICS.enabled:
+            self.serve_metrics()
+        elif path.startswith('/charts/'):
+            self.route = '/charts'
+            self.serve_report_file(path[len('/charts/'):])
+        elif path == '/report.html':
+            self.serve_report_file(REPORT_HTML)
         elif path.startswith('/static/'):
             self.serve_static_file(path)
         else:
             self.send_error(404)
 
     def do_POST(self):
-        path = urlparse(self.path).path
+        path = self.resolve_student()
+        if path is None:
+            return
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length).decode('utf-8')
+        METRICS.inc("jee_http_request_bytes_total", content_length, route=self.route)
         
         if path == '/api/log-study':
             self.handle_log_study(post_data)
@@ -45,41 +391,246 @@ class JEEWebHandler(BaseHTTPRequestHandler):
             self.handle_update_topic(post_data)
         elif path == '/api/add-test':
             self.handle_add_test(post_data)
+        elif path == '/api/batch':
+            self.handle_batch(post_data)
         else:
             self.send_error(404)
 
     def serve_dashboard(self):
-        html_content = self.generate_dashboard_html()
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html_content.encode())
+        self.send_versioned('dashboard', 'text/html; charset=utf-8',
+                            lambda tracker: self.generate_dashboard_html(self.get_progress_data(tracker)).encode())
 
     def serve_progress_api(self):
-        progress_data = {}
-        for subject in ["Physics", "Chemistry", "Mathematics"]:
-            progress_data[subject] = self.tracker.get_subject_progress(subject)
+        self.send_versioned('progress', 'application/json',
+                            lambda tracker: json.dumps(self.get_progress_data(tracker)).encode())
+
+    def serve_subjects_api(self):
+        with self.shared_tracker.use() as tracker:
+            syllabus = tracker.syllabus
+        # The syllabus never changes while the server runs
+        etag = f'"{BOOT_ID}-syllabus-{id(syllabus):x}"'
+        body = None if self.is_not_modified(etag) else syllabus_body(syllabus)
+        self.send_body(body, 'application/json', etag=etag)
+
+    def serve_analytics_api(self):
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            days = int(query.get('days', ['90'])[0])
+        except ValueError:
+            self.send_error(400, "days must be an integer")
+            return
+        
+        # Streaks depend on today's date, so the day is part of the cache key
+        today = date.today().isoformat()
+        self.send_versioned(('analytics', days, today), 'application/json',
+                            lambda tracker: json.dumps(tracker.get_study_analytics(days)).encode(),
+                            variant='-' + today)
+
+    def serve_revisions_api(self):
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            days = max(0, int(query.get('days', ['0'])[0]))
+            limit = max(1, min(1000, int(query.get('limit', ['50'])[0])))
+            upcoming = int(query['next'][0]) if 'next' in query else None
+        except ValueError:
+            self.send_error(400, "days, limit and next must be integers")
+            return
+        
+        # "Due today" moves with the date, so the day is part of the cache key
+        today = date.today().isoformat()
+        if upcoming:
+            build = lambda tracker: json.dumps({"revisions": tracker.get_next_revisions(min(upcoming, 1000))}).encode()
+        else:
+            build = lambda tracker: json.dumps({"date": today, "days": days,
+                                                "revisions": tracker.get_due_revisions(days, limit)}).encode()
+        self.send_versioned(('revisions', days, limit, upcoming, today), 'application/json', build,
+                            variant='-' + today)
+
+    def serve_history_api(self):
+        query = parse_qs(urlparse(self.path).query)
+        subject, chapter, topic = (query.get(key, [None])[0] for key in ('subject', 'chapter', 'topic'))
+        if subject and chapter and topic:
+            # One entry per topic and moment asked for, so history is revalidated but not cached
+            self.send_versioned(None, 'application/json',
+                                lambda tracker: json.dumps({"changes": tracker.get_topic_history(
+                                    subject, chapter, topic)}).encode())
+            return
+        
+        try:
+            as_of = history_key(query['as_of'][0])
+        except (KeyError, ValueError):
+            self.send_error(400, "as_of must be an ISO date or timestamp (or give subject, chapter and topic)")
+            return
+        
+        def build(tracker):
+            subjects = [subject] if subject else list(tracker.data["subjects"])
+            return json.dumps({"as_of": as_of, "progress": {
+                name: tracker.get_subject_progress_at(name, as_of) for name in subjects}}).encode()
+        self.send_versioned(None, 'application/json', build)
+
+    def serve_syllabus_search(self):
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            limit = max(1, min(100, int(query.get('limit', ['20'])[0])))
+        except ValueError:
+            self.send_error(400, "limit must be an integer")
+            return
         
+        with self.shared_tracker.use() as tracker:
+            index = tracker.index
+        # The index is read-only, so searching needs no lock
+        self.send_json_response({"results": index.search(query.get('q', [''])[0], limit)})
+
+    def serve_report_file(self, name):
+        chart, _, fmt = name.rpartition('.')
+        if name != REPORT_HTML and (chart not in CHARTS or fmt not in FORMATS):
+            self.send_error(404)
+            return
+        
+        shared = self.shared_tracker
+        with shared.use() as tracker:
+            data = shared.cache.get('chart-data')
+            if data is None:
+                data = shared.cache['chart-data'] = chart_data(tracker)
+        # Content-addressed, so the ETag holds across restarts and for every student with the same data
+        digest = data_hash(data)
+        etag = f'"{digest}"'
+        if self.is_not_modified(etag):
+            self.send_body(None, CONTENT_TYPES[fmt], etag=etag)
+            return
+        
+        with shared.lock:
+            body = shared.cache.get(('report', digest, name))
+        if body is None:
+            try:
+                # Rendered outside the tracker lock; `jee-tracker report` may have done it already
+                body = report_file(data, report_dir(shared.data_file), name,
+                                   [fmt] if fmt in FORMATS else ["svg"], shared.data_file)
+            except ImportError as e:
+                self.send_error(501, str(e))
+                return
+            with shared.lock:
+                shared.cache[('report', digest, name)] = body
+        self.send_body(body, CONTENT_TYPES[fmt], etag=etag)
+
+    def serve_metrics(self):
+        body = METRICS.render().encode()
         self.send_response(200)
-        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(progress_data).encode())
+        self.wfile.write(body)
 
-    def serve_subjects_api(self):
+    def serve_events(self, channel, shared=None):
+        """Stream progress deltas as server-sent events until the client disconnects"""
+        self.route = None  # open for as long as the client stays, so not timed
+        try:
+            last_id = int(self.headers.get('Last-Event-ID', ''))
+        except ValueError:
+            last_id = channel.last_id  # new clients only get events from now on
+        
         self.send_response(200)
-        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            with channel.attach():
+                self.wfile.write(b"retry: 3000\n\n")
+                self.wfile.flush()
+                while True:
+                    frames, last_id = channel.wait(last_id, EVENT_HEARTBEAT)
+                    if not frames:
+                        if shared is not None:
+                            # Picks up writes by other processes, which publish through the reload
+                            with shared.use():
+                                pass
+                        frames = [b": keepalive\n\n"]
+                    self.wfile.write(b"".join(frames))
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def send_versioned(self, key, content_type, build, variant=""):
+        """Serve a body derived from tracker state, cached (unless key is None) and revalidated per data version"""
+        shared = self.shared_tracker
+        with shared.use() as tracker:
+            etag = f'"{BOOT_ID}-{shared.version}{variant}"'
+            modified = shared.modified
+            body = None
+            if not self.is_not_modified(etag, modified):
+                # Built under the lock, at most once per data version
+                body = shared.cache.get(key) if key is not None else None
+                if body is None:
+                    body = build(tracker)
+                    if key is not None:
+                        shared.cache[key] = body
+        self.send_body(body, content_type, etag=etag, modified=modified)
+
+    def is_not_modified(self, etag, modified=None):
+        if 'If-None-Match' in self.headers:
+            tags = [tag.strip() for tag in self.headers['If-None-Match'].split(',')]
+            return '*' in tags or etag in tags or etag[:-1] + '-gzip"' in tags
+        if modified is not None and 'If-Modified-Since' in self.headers:
+            try:
+                since = parsedate_to_datetime(self.headers['If-Modified-Since']).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(modified) <= since
+        return False
+
+    def send_body(self, body, content_type, etag=None, modified=None):
+        """Send a 200 (or 304 when body is None) with caching and gzip headers"""
+        gzipped = (body is not None and len(body) >= GZIP_MIN_BYTES and content_type != 'image/png'
+                   and 'gzip' in self.headers.get('Accept-Encoding', ''))
+        if gzipped:
+            # Compressed bodies are cached alongside the plain ones
+            body = self.gzip_body(body)
+            if etag:
+                etag = etag[:-1] + '-gzip"'
+
+        self.send_response(200 if body is not None else 304)
+        if etag:
+            self.send_header('ETag', etag)
+        if modified is not None:
+            self.send_header('Last-Modified', formatdate(modified, usegmt=True))
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding, X-Student-Id')
+        if body is None:
+            self.end_headers()
+            return
+        self.send_header('Content-type', content_type)
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(self.tracker.syllabus).encode())
+        self.wfile.write(body)
+
+    def gzip_body(self, body):
+        shared = self.shared_tracker
+        with shared.lock:
+            key = ('gzip', id(body))
+            cached = shared.cache.get(key)
+            if cached is None or cached[0] is not body:
+                cached = shared.cache[key] = (body, gzip.compress(body, compresslevel=6))
+        return cached[1]
+
+    def get_progress_data(self, tracker):
+        progress_data = {}
+        for subject in tracker.syllabus:
+            progress_data[subject] = tracker.get_subject_progress(subject)
+        return progress_data
 
     def handle_log_study(self, post_data):
         try:
             data = json.loads(post_data)
-            self.tracker.log_daily_study(
-                data['subject'], 
-                float(data['hours']), 
-                data.get('topics', []), 
-                data.get('notes', '')
-            )
+            with self.shared_tracker.use() as tracker:
+                tracker.log_daily_study(
+                    data['subject'], 
+                    float(data['hours']), 
+                    data.get('topics', []), 
+                    data.get('notes', '')
+                )
             self.send_json_response({"status": "success"})
         except Exception as e:
             self.send_json_response({"status": "error", "message": str(e)})
@@ -87,15 +638,16 @@ class JEEWebHandler(BaseHTTPRequestHandler):
     def handle_update_topic(self, post_data):
         try:
             data = json.loads(post_data)
-            self.tracker.update_topic_progress(
-                data['subject'],
-                data['chapter'],
-                data['topic'],
-                status=data.get('status'),
-                confidence=data.get('confidence'),
-                time_spent=data.get('time_spent'),
-                notes=data.get('notes')
-            )
+            with self.shared_tracker.use() as tracker:
+                tracker.update_topic_progress(
+                    data['subject'],
+                    data['chapter'],
+                    data['topic'],
+                    status=data.get('status'),
+                    confidence=data.get('confidence'),
+                    time_spent=data.get('time_spent'),
+                    notes=data.get('notes')
+                )
             self.send_json_response({"status": "success"})
         except Exception as e:
             self.send_json_response({"status": "error", "message": str(e)})
@@ -103,30 +655,101 @@ class JEEWebHandler(BaseHTTPRequestHandler):
     def handle_add_test(self, post_data):
         try:
             data = json.loads(post_data)
-            self.tracker.add_test_score(
-                data['test_name'],
-                data['subject'],
-                float(data['score']),
-                float(data['max_score']),
-                data.get('date')
-            )
+            with self.shared_tracker.use() as tracker:
+                tracker.add_test_score(
+                    data['test_name'],
+                    data['subject'],
+                    float(data['score']),
+                    float(data['max_score']),
+                    data.get('date')
+                )
             self.send_json_response({"status": "success"})
         except Exception as e:
             self.send_json_response({"status": "error", "message": str(e)})
 
+    def handle_batch(self, post_data):
+        """Apply a list of log, topic and test operations with one write"""
+        try:
+            data = json.loads(post_data)
+            operations = data.get('operations') if isinstance(data, dict) else data
+            if not isinstance(operations, list) or not all(isinstance(op, dict) for op in operations):
+                raise ValueError("expected a list of operation objects")
+            if len(operations) > MAX_BATCH_OPERATIONS:
+                raise ValueError(f"at most {MAX_BATCH_OPERATIONS} operations per batch")
+            # The single-operation endpoint names work as types too; anything else fails in its own result
+            operations = [dict(op, type=BATCH_TYPES.get(op.get('type'), op.get('type')))
+                          if isinstance(op.get('type'), str) else op for op in operations]
+            
+            with self.shared_tracker.use() as tracker:
+                results = tracker.apply_batch(operations)
+                revision = tracker.data.get("revision")
+            failed = sum(result["status"] == "error" for result in results)
+            self.send_json_response({"status": "success", "applied": len(results) - failed, "failed": failed,
+                                     "revision": revision, "results": results})
+        except Exception as e:
+            self.send_json_response({"status": "error", "message": str(e)})
+
     def send_json_response(self, data):
+        body = json.dumps(data).encode()
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
 
-    def generate_dashboard_html(self):
-        # Get current progress
-        progress_data = {}
-        for subject in ["Physics", "Chemistry", "Mathematics"]:
-            progress_data[subject] = self.tracker.get_subject_progress(subject)
+    def generate_dashboard_html(self, progress_data):
+        # Only the subject cards change; the page around them is pre-rendered
+        html = DASHBOARD_HEAD
+        
+        # Generate subject cards; untouched subjects get an empty card for live updates to fill in
+        for subject, progress in progress_data.items():
+            color = SUBJECT_COLORS.get(subject, DEFAULT_SUBJECT_COLOR)
+            if "error" in progress:
+                progress = {}
+            completion = progress.get('completion_rate', 0)
+            confidence = progress.get('avg_confidence', 0)
+            study_time = progress.get('total_study_time', 0)
+            total_topics = progress.get('total_topics', 0)
+            
+            html += f'''
+            <div class="card" data-subject="{escape(subject)}">
+                <h2 style="color: {color}">📚 {subject}</h2>
+                <div class="progress-bar">
+                    <div class="progress-fill" data-field="completion_bar" style="width: {completion}%; background: {color};"></div>
+                </div>
+                <div class="stats">
+                    <div class="stat">
+                        <div class="stat-value" data-field="completion_rate">{completion:.1f}%</div>
+                        <div class="stat-label">Completed</div>
+                    </div>
+                    <div class="stat">
+                        <div class="stat-value" data-field="avg_confidence">{confidence:.1f}/10</div>
+                        <div class="stat-label">Confidence</div>
+                    </div>
+                    <div class="stat">
+                        <div class="stat-value" data-field="total_study_time">{study_time:.1f}h</div>
+                        <div class="stat-label">Study Time</div>
+                    </div>
+                    <div class="stat">
+                        <div class="stat-value" data-field="total_topics">{total_topics}</div>
+                        <div class="stat-label">Total Topics</div>
+                    </div>
+                </div>
+            </div>
+                '''
+        
+        options = "".join(f'<option value="{escape(subject)}">{escape(subject)}</option>' for subject in progress_data)
+        html += DASHBOARD_TAIL.replace(SUBJECT_OPTIONS, options)
+        
+        return html
+
+MAX_BATCH_OPERATIONS = 10000
+BATCH_TYPES = {"log-study": "log", "update-topic": "topic", "add-test": "test"}
+
+SUBJECT_OPTIONS = "<!-- subject options -->"
 
-        html = f'''
+# Static parts of the dashboard page, rendered once at import time
+DASHBOARD_HEAD = '''
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -134,105 +757,105 @@ class JEEWebHandler(BaseHTTPRequestHandler):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>JEE Progress Tracker</title>
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ 
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { 
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             color: #333;
-        }}
-        .container {{ 
+        }
+        .container { 
             max-width: 1200px; 
             margin: 0 auto; 
             padding: 20px;
-        }}
-        .header {{ 
+        }
+        .header { 
             text-align: center; 
             color: white; 
             margin-bottom: 30px;
-        }}
-        .header h1 {{ 
+        }
+        .header h1 { 
             font-size: 2.5em; 
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        .dashboard {{ 
+        }
+        .dashboard { 
             display: grid; 
             grid-template-columns: repeat(auto-fit, minmax(350px, 1fr)); 
             gap: 20px; 
             margin-bottom: 30px;
-        }}
-        .card {{ 
+        }
+        .card { 
             background: white; 
             border-radius: 15px; 
             padding: 25px; 
             box-shadow: 0 8px 25px rgba(0,0,0,0.15);
             transition: transform 0.3s ease;
-        }}
-        .card:hover {{ transform: translateY(-5px); }}
-        .card h2 {{ 
+        }
+        .card:hover { transform: translateY(-5px); }
+        .card h2 { 
             color: #4a5568; 
             margin-bottom: 15px; 
             border-bottom: 2px solid #e2e8f0; 
             padding-bottom: 10px;
-        }}
-        .progress-bar {{ 
+        }
+        .progress-bar { 
             width: 100%; 
             height: 8px; 
             background: #e2e8f0; 
             border-radius: 4px; 
             overflow: hidden;
             margin: 10px 0;
-        }}
-        .progress-fill {{ 
+        }
+        .progress-fill { 
             height: 100%; 
             background: linear-gradient(90deg, #48bb78, #38a169); 
             transition: width 0.3s ease;
-        }}
-        .stats {{ 
+        }
+        .stats { 
             display: grid; 
             grid-template-columns: repeat(2, 1fr); 
             gap: 15px; 
             margin-top: 15px;
-        }}
-        .stat {{ 
+        }
+        .stat { 
             text-align: center; 
             padding: 10px; 
             background: #f7fafc; 
             border-radius: 8px;
-        }}
-        .stat-value {{ 
+        }
+        .stat-value { 
             font-size: 1.5em; 
             font-weight: bold; 
             color: #2d3748;
-        }}
-        .stat-label {{ 
+        }
+        .stat-label { 
             font-size: 0.9em; 
             color: #718096; 
             margin-top: 5px;
-        }}
-        .actions {{ 
+        }
+        .actions { 
             display: grid; 
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); 
             gap: 20px;
-        }}
-        .form-group {{ 
+        }
+        .form-group { 
             margin-bottom: 15px;
-        }}
-        .form-group label {{ 
+        }
+        .form-group label { 
             display: block; 
             margin-bottom: 5px; 
             font-weight: 600; 
             color: #4a5568;
-        }}
-        .form-group input, .form-group select, .form-group textarea {{ 
+        }
+        .form-group input, .form-group select, .form-group textarea { 
             width: 100%; 
             padding: 10px; 
             border: 1px solid #e2e8f0; 
             border-radius: 8px; 
             font-size: 14px;
-        }}
-        .btn {{ 
+        }
+        .btn { 
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
             color: white; 
             padding: 12px 24px; 
@@ -241,10 +864,13 @@ class JEEWebHandler(BaseHTTPRequestHandler):
             cursor: pointer; 
             font-size: 16px;
             transition: transform 0.2s ease;
-        }}
-        .btn:hover {{ transform: scale(1.02); }}
-        .success {{ color: #38a169; font-weight: bold; }}
-        .error {{ color: #e53e3e; font-weight: bold; }}
+        }
+        .btn:hover { transform: scale(1.02); }
+        .charts { margin-bottom: 30px; }
+        .charts img { width: 100%; margin: 10px 0; }
+        .charts a { float: right; font-size: 0.6em; font-weight: normal; color: #667eea; }
+        .success { color: #38a169; font-weight: bold; }
+        .error { color: #e53e3e; font-weight: bold; }
     </style>
 </head>
 <body>
@@ -255,47 +881,16 @@ class JEEWebHandler(BaseHTTPRequestHandler):
         </div>
         
         <div class="dashboard">
-        '''
-        
-        # Generate subject cards
-        colors = {"Physics": "#4299e1", "Chemistry": "#38b2ac", "Mathematics": "#ed8936"}
-        
-        for subject in ["Physics", "Chemistry", "Mathematics"]:
-            progress = progress_data[subject]
-            if "error" not in progress:
-                completion = progress.get('completion_rate', 0)
-                confidence = progress.get('avg_confidence', 0)
-                study_time = progress.get('total_study_time', 0)
-                total_topics = progress.get('total_topics', 0)
-                
-                html += f'''
-            <div class="card">
-                <h2 style="color: {colors[subject]}">📚 {subject}</h2>
-                <div class="progress-bar">
-                    <div class="progress-fill" style="width: {completion}%; background: {colors[subject]};"></div>
-                </div>
-                <div class="stats">
-                    <div class="stat">
-                        <div class="stat-value">{completion:.1f}%</div>
-                        <div class="stat-label">Completed</div>
-                    </div>
-                    <div class="stat">
-                        <div class="stat-value">{confidence:.1f}/10</div>
-                        <div class="stat-label">Confidence</div>
-                    </div>
-                    <div class="stat">
-                        <div class="stat-value">{study_time:.1f}h</div>
-                        <div class="stat-label">Study Time</div>
-                    </div>
-                    <div class="stat">
-                        <div class="stat-value">{total_topics}</div>
-                        <div class="stat-label">Total Topics</div>
-                    </div>
-                </div>
-            </div>
-                '''
+'''
+
+DASHBOARD_TAIL = '''
+        </div>
         
-        html += '''
+        <div class="card charts">
+            <h2>📈 Charts <a href="report.html" target="_blank">Full report</a></h2>
+            <img data-chart src="charts/completion.svg" alt="Completion by subject">
+            <img data-chart src="charts/study_hours.svg" alt="Daily study hours" loading="lazy">
+            <img data-chart src="charts/tests.svg" alt="Test scores" loading="lazy">
         </div>
         
         <div class="actions">
@@ -306,9 +901,7 @@ class JEEWebHandler(BaseHTTPRequestHandler):
                         <label>Subject:</label>
                         <select name="subject" required>
                             <option value="">Select Subject</option>
-                            <option value="Physics">Physics</option>
-                            <option value="Chemistry">Chemistry</option>
-                            <option value="Mathematics">Mathematics</option>
+                            <!-- subject options -->
                         </select>
                     </div>
                     <div class="form-group">
@@ -335,9 +928,7 @@ class JEEWebHandler(BaseHTTPRequestHandler):
                         <label>Subject:</label>
                         <select name="subject" required>
                             <option value="">Select Subject</option>
-                            <option value="Physics">Physics</option>
-                            <option value="Chemistry">Chemistry</option>
-                            <option value="Mathematics">Mathematics</option>
+                            <!-- subject options -->
                         </select>
                     </div>
                     <div class="form-group">
@@ -346,7 +937,8 @@ class JEEWebHandler(BaseHTTPRequestHandler):
                     </div>
                     <div class="form-group">
                         <label>Topic:</label>
-                        <input type="text" name="topic" required placeholder="e.g., Kinematics">
+                        <input type="text" name="topic" required placeholder="e.g., Kinematics" list="topicSuggestions" autocomplete="off">
+                        <datalist id="topicSuggestions"></datalist>
                     </div>
                     <div class="form-group">
                         <label>Status:</label>
@@ -370,6 +962,54 @@ class JEEWebHandler(BaseHTTPRequestHandler):
     </div>
 
     <script>
+        // Follow progress pushed by the server instead of polling; form submissions update the page this way too
+        const events = new EventSource('api/events');
+        events.addEventListener('progress', function(e) {
+            const { progress, version } = JSON.parse(e.data);
+            // The server redraws charts only when the data they show has changed
+            for (const img of document.querySelectorAll('img[data-chart]')) {
+                img.src = img.src.split('?')[0] + '?v=' + version;
+            }
+            for (const [subject, stats] of Object.entries(progress)) {
+                const card = document.querySelector(`.card[data-subject="${CSS.escape(subject)}"]`);
+                if (!card || stats.error) continue;
+                const field = name => card.querySelector(`[data-field="${name}"]`);
+                field('completion_bar').style.width = stats.completion_rate + '%';
+                field('completion_rate').textContent = stats.completion_rate.toFixed(1) + '%';
+                field('avg_confidence').textContent = stats.avg_confidence.toFixed(1) + '/10';
+                field('total_study_time').textContent = stats.total_study_time.toFixed(1) + 'h';
+                field('total_topics').textContent = stats.total_topics;
+            }
+        });
+        
+        // Suggest syllabus topics while typing and fill in their subject and chapter
+        const topicForm = document.getElementById('topicForm');
+        const suggestions = new Map();
+        let searchTimer = null;
+        topicForm.topic.addEventListener('input', function(e) {
+            const match = suggestions.get(e.target.value);
+            if (match) {
+                topicForm.subject.value = match.path[0];
+                topicForm.chapter.value = match.path[1];
+                return;
+            }
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(async function() {
+                const response = await fetch('api/syllabus/search?limit=10&q=' + encodeURIComponent(e.target.value));
+                const { results } = await response.json();
+                const list = document.getElementById('topicSuggestions');
+                list.innerHTML = '';
+                suggestions.clear();
+                for (const result of results.filter(r => r.type === 'topic')) {
+                    const option = document.createElement('option');
+                    option.value = result.name;
+                    option.label = result.path.join(' › ');
+                    list.appendChild(option);
+                    suggestions.set(result.name, result);
+                }
+            }, 150);
+        });
+        
         // Handle study form submission
         document.getElementById('studyForm').addEventListener('submit', async function(e) {
             e.preventDefault();
@@ -382,7 +1022,7 @@ class JEEWebHandler(BaseHTTPRequestHandler):
             };
             
             try {
-                const response = await fetch('/api/log-study', {
+                const response = await fetch('api/log-study', {
                     method: 'POST',
                     body: JSON.stringify(data)
                 });
@@ -392,7 +1032,6 @@ class JEEWebHandler(BaseHTTPRequestHandler):
                 if (result.status === 'success') {
                     resultDiv.innerHTML = '<p class="success">✅ Study session logged successfully!</p>';
                     e.target.reset();
-                    setTimeout(() => location.reload(), 1500);
                 } else {
                     resultDiv.innerHTML = `<p class="error">❌ Error: ${result.message}</p>`;
                 }
@@ -414,7 +1053,7 @@ class JEEWebHandler(BaseHTTPRequestHandler):
             };
             
             try {
-                const response = await fetch('/api/update-topic', {
+                const response = await fetch('api/update-topic', {
                     method: 'POST',
                     body: JSON.stringify(data)
                 });
@@ -424,7 +1063,6 @@ class JEEWebHandler(BaseHTTPRequestHandler):
                 if (result.status === 'success') {
                     resultDiv.innerHTML = '<p class="success">✅ Topic updated successfully!</p>';
                     e.target.reset();
-                    setTimeout(() => location.reload(), 1500);
                 } else {
                     resultDiv.innerHTML = `<p class="error">❌ Error: ${result.message}</p>`;
                 }
@@ -435,16 +1073,226 @@ class JEEWebHandler(BaseHTTPRequestHandler):
     </script>
 </body>
 </html>
-        '''
-        
-        return html
+'''
+
+KEEPALIVE_TIMEOUT = 120  # seconds an idle keep-alive connection is held open by the asyncio server
+MAX_HEADER_BYTES = 65536
+
+class BufferedRequest(JEEWebHandler):
+    """Runs one request through the normal handler routes against in-memory files"""
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, raw_request, server, client_address):
+        # BaseHTTPRequestHandler.__init__ expects a socket, so only set what the routes use
+        self.rfile = io.BytesIO(raw_request)
+        self.wfile = io.BytesIO()
+        self.server = server
+        self.client_address = client_address
+        self.close_connection = True
+        self.handle_one_request()
+
+    def handle_expect_100(self):
+        # The event loop already answered 100-continue before reading the body
+        return True
+
+class ChannelWaker:
+    """Wakes event-stream coroutines when any thread publishes to an EventChannel"""
+
+    def __init__(self, loop, channel):
+        self.loop = loop
+        self.channel = channel
+        self.event = asyncio.Event()
+        channel.add_listener(self._notify)
+
+    def _notify(self):
+        try:
+            self.loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            pass  # the loop has already been closed
+
+    def _wake(self):
+        # Waiters hold the old event; new waiters get a fresh one
+        self.event.set()
+        self.event = asyncio.Event()
+
+    def close(self):
+        self.channel.remove_listener(self._notify)
+
+class AsyncJEEWebServer:
+    """Single-threaded asyncio HTTP/1.1 server with the same routes as JEEWebServer
 
-def start_web_server(port=8080):
-    """Start the web server"""
-    server = HTTPServer(('localhost', port), JEEWebHandler)
+    Connections and event streams live on the event loop, so idle clients cost no
+    threads. Every request that touches a tracker runs on the default executor.
+    """
+
+    def __init__(self, server_address, trackers):
+        self.server_address = server_address
+        self.trackers = trackers
+        self.loop = None
+        self._wakers = {}  # EventChannel -> ChannelWaker
+        self._writers = set()  # open connections, closed on shutdown
+        self._stopped = None
+
+    def serve_forever(self):
+        asyncio.run(self._serve())
+
+    def shutdown(self):
+        if self.loop is not None and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                pass
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        host, port = self.server_address
+        server = await asyncio.start_server(self.handle_connection, host, port,
+                                            limit=MAX_HEADER_BYTES, backlog=1024)
+        try:
+            async with server:
+                await self._stopped.wait()
+                for writer in list(self._writers):
+                    writer.close()
+        finally:
+            for waker in self._wakers.values():
+                waker.close()
+            self._wakers.clear()
+
+    async def handle_connection(self, reader, writer):
+        client_address = writer.get_extra_info('peername') or ('', 0)
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except asyncio.LimitOverrunError:
+                    writer.write(b"HTTP/1.1 431 Request Header Fields Too Large\r\n"
+                                 b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+
+                request_line, _, header_block = head.partition(b"\r\n")
+                headers = http.client.parse_headers(io.BytesIO(header_block))
+                try:
+                    length = int(headers.get('Content-Length', 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                    break
+                if length and headers.get('Expect', '').lower() == '100-continue':
+                    writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                body = await reader.readexactly(length) if length else b""
+
+                stream = self.event_stream(request_line, headers)
+                if stream is not None:
+                    await self.stream_events(writer, headers, *stream)
+                    break
+
+                response, keep_alive = await self.loop.run_in_executor(
+                    None, self.respond, head + body, client_address)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # client went away, or the server is shutting down
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def respond(self, raw_request, client_address):
+        """Run a request through the handler on an executor thread; returns (response, keep-alive)"""
+        try:
+            request = BufferedRequest(raw_request, self, client_address)
+        except Exception:
+            traceback.print_exc()
+            return (b"HTTP/1.1 500 Internal Server Error\r\n"
+                    b"Content-Length: 0\r\nConnection: close\r\n\r\n"), False
+        return request.wfile.getvalue(), not request.close_connection
+
+    def event_stream(self, request_line, headers):
+        """(channel, shared tracker) if this request is for an event stream, else None"""
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3 or parts[0] != 'GET':
+            return None
+        path = urlparse(parts[1]).path
+        student = headers.get('X-Student-Id')
+        if path.startswith('/students/'):
+            student, _, rest = path[len('/students/'):].partition('/')
+            path = '/' + rest
+
+        if path == '/api/class/events':
+            return self.trackers.class_channel, None
+        if path == '/api/events':
+            try:
+                shared = self.trackers.get(student)
+            except KeyError:
+                return None  # the handler sends the 400
+            return shared.channel, shared
+        return None
+
+    async def stream_events(self, writer, headers, channel, shared):
+        """Async counterpart of JEEWebHandler.serve_events"""
+        try:
+            last_id = int(headers.get('Last-Event-ID', ''))
+        except ValueError:
+            last_id = channel.last_id
+
+        waker = self._wakers.get(channel)
+        if waker is None:
+            waker = self._wakers[channel] = ChannelWaker(self.loop, channel)
+
+        with channel.attach():
+            try:
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                             b"Cache-Control: no-cache\r\nConnection: close\r\n\r\nretry: 3000\n\n")
+                await writer.drain()
+                while True:
+                    # Take the event before checking, so a publish in between still wakes us
+                    event = waker.event
+                    frames, last_id = channel.since(last_id)
+                    if not frames:
+                        try:
+                            await asyncio.wait_for(event.wait(), EVENT_HEARTBEAT)
+                            continue
+                        except asyncio.TimeoutError:
+                            pass
+                        if shared is not None:
+                            # Picks up writes by other processes, which publish through the reload
+                            await self.loop.run_in_executor(None, self._refresh, shared)
+                        frames, last_id = channel.since(last_id)
+                        frames = frames or [b": keepalive\n\n"]
+                    writer.write(b"".join(frames))
+                    await writer.drain()
+            finally:
+                # The last stream on a channel takes its waker along, so dropped channels are freed
+                if channel.streams == 1 and self._wakers.get(channel) is waker:
+                    del self._wakers[channel]
+                    waker.close()
+
+    @staticmethod
+    def _refresh(shared):
+        with shared.use():
+            pass
+
+def start_web_server(port=8080, data_file="jee_progress.json", journal=False, data_dir=None, max_students=64,
+                     syllabus=None, use_async=False):
+    """Start the web server, threaded or (with use_async) on a single asyncio event loop"""
+    trackers = TrackerPool(data_file, data_dir=data_dir, capacity=max_students, journal=journal, syllabus=syllabus)
+    if use_async:
+        server = AsyncJEEWebServer(('localhost', port), trackers)
+    else:
+        server = JEEWebServer(('localhost', port), JEEWebHandler, trackers)
     print(f"🚀 JEE Progress Tracker Web Interface")
     print(f"🌐 Server starting at http://localhost:{port}")
     print(f"📱 Open your browser and visit the above URL")
+    if METRICS.enabled:
+        print(f"📈 Metrics at http://localhost:{port}/metrics")
+    if data_dir:
+        print(f"👥 Student dashboards at http://localhost:{port}/students/<id>/ (data in {data_dir})")
     print(f"⏹️  Press Ctrl+C to stop the server")
     
     # Open browser automatically after a short delay
@@ -463,13 +1311,23 @@ def start_web_server(port=8080):
         server.shutdown()
 
 if __name__ == "__main__":
-    import sys
-    port = 8080
+    import argparse
     
-    if len(sys.argv) > 1:
-        try:
-            port = int(sys.argv[1])
-        except ValueError:
-            print("Invalid port number. Using default port 8080.")
+    parser = argparse.ArgumentParser(description="JEE Progress Tracker web interface")
+    parser.add_argument("port", nargs="?", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("data_file", nargs="?", default="jee_progress.json", help="Default progress file")
+    parser.add_argument("--journal", action="store_true", help="Append changes to a journal instead of rewriting data files")
+    parser.add_argument("--data-dir", help="Directory of per-student progress files, served under /students/<id>/")
+    parser.add_argument("--max-students", type=int, default=64, help="Number of student trackers kept in memory")
+    parser.add_argument("--syllabus", help="JSON syllabus file to use instead of the built-in JEE syllabus")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Serve from one asyncio event loop instead of a thread per connection")
+    parser.add_argument("--metrics", action="store_true", help="Record timings and serve them at /metrics")
+    args = parser.parse_args()
     
-    start_web_server(port)
+    if args.metrics:
+        enable_metrics()
+
+    start_web_server(args.port, args.data_file, journal=args.journal,
+                     data_dir=args.data_dir, max_students=args.max_students, syllabus=args.syllabus,
+                     use_async=args.use_async)